@@ -0,0 +1,323 @@
+"""Методы DAL для сводной аналитики по заказам."""
+
+# STDLIB
+from datetime import date
+from typing import Any, Iterable, Mapping, Optional, Sequence, Type, Union
+
+# THIRDPARTY
+from sqlalchemy import Select, case, delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# FIRSTPARTY
+from app.DAL.OrderArchiveDAL import (
+    order_services_with_archive,
+    orders_with_archive,
+)
+from app.models.models import (
+    DailyServiceStatsModel,
+    OrderModel,
+    ServiceModel,
+    UserOrderStatsModel,
+)
+
+
+def _order_day(order: OrderModel) -> date:
+    """День, к которому относится заказ в сводках."""
+    return (order.begin_at or order.created_at).date()
+
+
+class AnalyticsDAL(object):
+    """Сводные таблицы по заказам.
+
+    Дашборды читают только сводки, поэтому время ответа не зависит
+    от размера истории заказов. Сводки обновляются в той же транзакции,
+    что и сам заказ; коммит остается за вызывающим кодом.
+    """
+
+    @classmethod
+    async def _upsert(
+        cls: Type['AnalyticsDAL'],
+        model: Type[Union[DailyServiceStatsModel, UserOrderStatsModel]],
+        key: Sequence[str],
+        rows: list[dict[str, Any]],
+        session: AsyncSession,
+    ) -> None:
+        """Прибавить значения к строкам сводки, создавая недостающие."""
+        if not rows:
+            return
+        # Модули диалектов тяжелые, импортируется только используемый
+        if session.bind.dialect.name == 'postgresql':
+            # THIRDPARTY
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            # THIRDPARTY
+            from sqlalchemy.dialects.sqlite import insert
+        stmt = insert(model).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(key),
+            set_={
+                column: getattr(model, column) + stmt.excluded[column]
+                for column in rows[0]
+                if column not in key
+            },
+        )
+        await session.execute(stmt)
+
+    @classmethod
+    async def order_created(
+        cls: Type['AnalyticsDAL'],
+        order: OrderModel,
+        service_costs: Mapping[int, int],
+        session: AsyncSession,
+    ) -> None:
+        """Учесть новый заказ в сводках.
+
+        Параметры:
+            order (OrderModel): Заказ, уже записанный в сессию (flush).
+            service_costs (Mapping[int, int]): Стоимость услуг заказа
+                по их ID.
+            session (AsyncSession): Сессия транзакции заказа.
+        """
+        day = _order_day(order)
+        active = 1 if order.is_active else 0
+        await cls._upsert(
+            DailyServiceStatsModel,
+            ('day', 'service_id'),
+            [
+                {
+                    'day': day,
+                    'service_id': service_id,
+                    'orders_count': 1,
+                    'active_count': active,
+                    'revenue': cost,
+                }
+                for service_id, cost in service_costs.items()
+            ],
+            session,
+        )
+        await cls._upsert(
+            UserOrderStatsModel,
+            ('user_id',),
+            [
+                {
+                    'user_id': order.user_id,
+                    'orders_count': 1,
+                    'revenue': sum(service_costs.values()),
+                }
+            ],
+            session,
+        )
+
+    @classmethod
+    async def order_activity_changed(
+        cls: Type['AnalyticsDAL'],
+        order: OrderModel,
+        service_ids: Iterable[int],
+        session: AsyncSession,
+    ) -> None:
+        """Учесть смену `is_active` у заказа (новое значение уже в order)."""
+        delta = 1 if order.is_active else -1
+        await cls._upsert(
+            DailyServiceStatsModel,
+            ('day', 'service_id'),
+            [
+                {
+                    'day': _order_day(order),
+                    'service_id': service_id,
+                    'active_count': delta,
+                }
+                for service_id in service_ids
+            ],
+            session,
+        )
+
+    @classmethod
+    async def rebuild(
+        cls: Type['AnalyticsDAL'], session: AsyncSession
+    ) -> None:
+        """Полностью пересчитать сводки по рабочим и архивным заказам.
+
+        Цена заказа отдельно не хранится, поэтому выручка пересчитывается
+        по текущей `service_cost` услуг: после смены цены пересчет
+        переоценивает всю историю, а выручка заказов удаленных услуг
+        обнуляется. Инкрементальные сводки, напротив, фиксируют цену на
+        момент заказа, так что после пересчета они могут разойтись
+        с прежними значениями.
+        """
+        orders = orders_with_archive()
+        links = order_services_with_archive()
+        day = func.date(func.coalesce(orders.c.begin_at, orders.c.created_at))
+        daily_query = (
+            select(
+                day,
+                links.c.service_id,
+                func.count(),
+                func.sum(case((orders.c.is_active, 1), else_=0)),
+                func.coalesce(func.sum(ServiceModel.service_cost), 0),
+            )
+            .select_from(orders)
+            .join(links, links.c.order_id == orders.c.id)
+            .outerjoin(ServiceModel, ServiceModel.id == links.c.service_id)
+            .group_by(day, links.c.service_id)
+        )
+        users_query = (
+            select(
+                orders.c.user_id,
+                func.count(func.distinct(orders.c.id)),
+                func.coalesce(func.sum(ServiceModel.service_cost), 0),
+            )
+            .select_from(orders)
+            .outerjoin(links, links.c.order_id == orders.c.id)
+            .outerjoin(ServiceModel, ServiceModel.id == links.c.service_id)
+            .group_by(orders.c.user_id)
+        )
+        await session.execute(delete(DailyServiceStatsModel))
+        await session.execute(delete(UserOrderStatsModel))
+        await session.execute(
+            DailyServiceStatsModel.__table__.insert().from_select(
+                [
+                    'day',
+                    'service_id',
+                    'orders_count',
+                    'active_count',
+                    'revenue',
+                ],
+                daily_query,
+            )
+        )
+        await session.execute(
+            UserOrderStatsModel.__table__.insert().from_select(
+                ['user_id', 'orders_count', 'revenue'], users_query
+            )
+        )
+        await session.commit()
+
+    @classmethod
+    def _filter_days(
+        cls: Type['AnalyticsDAL'],
+        query: Select,
+        date_from: Optional[date],
+        date_to: Optional[date],
+    ) -> Select:
+        """Ограничить запрос к дневной сводке периодом."""
+        if date_from is not None:
+            query = query.where(DailyServiceStatsModel.day >= date_from)
+        if date_to is not None:
+            query = query.where(DailyServiceStatsModel.day <= date_to)
+        return query
+
+    @classmethod
+    async def get_totals(
+        cls: Type['AnalyticsDAL'],
+        session: AsyncSession,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+    ) -> dict[str, int]:
+        """Общая выручка и количество заказанных услуг за период."""
+        query = cls._filter_days(
+            select(
+                func.coalesce(
+                    func.sum(DailyServiceStatsModel.orders_count), 0
+                ),
+                func.coalesce(
+                    func.sum(DailyServiceStatsModel.active_count), 0
+                ),
+                func.coalesce(func.sum(DailyServiceStatsModel.revenue), 0),
+            ),
+            date_from,
+            date_to,
+        )
+        result = await session.execute(query)
+        orders_count, active_count, revenue = result.one()
+        return {
+            'orders_count': orders_count,
+            'active_count': active_count,
+            'revenue': revenue,
+        }
+
+    @classmethod
+    async def get_by_service(
+        cls: Type['AnalyticsDAL'],
+        session: AsyncSession,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+    ) -> list[dict[str, Any]]:
+        """Заказы и выручка по каждой услуге за период.
+
+        Сводка сначала агрегируется по ID услуги, а название услуги
+        присоединяется к уже готовым строкам.
+        """
+        totals = cls._filter_days(
+            select(
+                DailyServiceStatsModel.service_id,
+                func.sum(DailyServiceStatsModel.orders_count).label(
+                    'orders_count'
+                ),
+                func.sum(DailyServiceStatsModel.active_count).label(
+                    'active_count'
+                ),
+                func.sum(DailyServiceStatsModel.revenue).label('revenue'),
+            ).group_by(DailyServiceStatsModel.service_id),
+            date_from,
+            date_to,
+        ).subquery()
+        query = (
+            select(
+                totals.c.service_id,
+                ServiceModel.service_name,
+                totals.c.orders_count,
+                totals.c.active_count,
+                totals.c.revenue,
+            )
+            .outerjoin(ServiceModel, ServiceModel.id == totals.c.service_id)
+            .order_by(totals.c.revenue.desc())
+        )
+        result = await session.execute(query)
+        return [dict(row) for row in result.mappings()]
+
+    @classmethod
+    async def get_by_day(
+        cls: Type['AnalyticsDAL'],
+        session: AsyncSession,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+    ) -> list[dict[str, Any]]:
+        """Нагрузка и выручка по дням за период."""
+        query = cls._filter_days(
+            select(
+                DailyServiceStatsModel.day,
+                func.sum(DailyServiceStatsModel.orders_count).label(
+                    'orders_count'
+                ),
+                func.sum(DailyServiceStatsModel.active_count).label(
+                    'active_count'
+                ),
+                func.sum(DailyServiceStatsModel.revenue).label('revenue'),
+            )
+            .group_by(DailyServiceStatsModel.day)
+            .order_by(DailyServiceStatsModel.day),
+            date_from,
+            date_to,
+        )
+        result = await session.execute(query)
+        return [dict(row) for row in result.mappings()]
+
+    @classmethod
+    async def get_top_customers(
+        cls: Type['AnalyticsDAL'], limit: int, session: AsyncSession
+    ) -> list[dict[str, Any]]:
+        """Пользователи с наибольшей суммой заказов."""
+        query = (
+            select(UserOrderStatsModel)
+            .order_by(UserOrderStatsModel.revenue.desc())
+            .limit(limit)
+        )
+        result = await session.execute(query)
+        return [
+            {
+                'user_id': stats.user_id,
+                'orders_count': stats.orders_count,
+                'revenue': stats.revenue,
+            }
+            for stats in result.scalars()
+        ]
@@ -1,48 +1,139 @@
 """Классы доступа к базовым CRUD операциям."""
 
 # STDLIB
-from typing import List, Optional, Type
+from dataclasses import fields
+from typing import Any, List, Optional, Sequence, Type
 
 # THIRDPARTY
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 # FIRSTPARTY
-from app.models.models import UserModel
+from app.database import new_read_session
+from app.events import OP_DELETE, OP_INSERT, OP_UPDATE, broker
+from app.models.models import Base, UserModel
+from app.models.read_models import UserRow
+from app.schemas.schemas import UserCreateSchema
 
 
 class BaseDAL(object):
-    """Базовый класс доступа к операциям CRUD."""
+    """Базовый класс доступа к операциям CRUD.
 
-    model = None
+    Атрибуты:
+        model (Type[Base]): ORM-модель таблицы, задается в подклассе.
+        row_model (Optional[Type]): Легкая модель строк для
+            `get_all_rows`, dataclass из `app.models.read_models`.
+        private_columns (tuple[str, ...]): Колонки, которые не попадают
+            в события для админ-панелей.
+    """
+
+    model: Type[Base]
+    row_model: Optional[Type[Any]] = None
+    private_columns: tuple[str, ...] = ()
 
     @classmethod
     async def get_by_id(
-        cls: Type['BaseDAL'], id_: int, session: AsyncSession
-    ) -> Optional[Type['model']]:
-        """Найти запись в БД по ID."""
+        cls: Type['BaseDAL'],
+        id_: int,
+        session: Optional[AsyncSession] = None,
+    ) -> Optional[Base]:
+        """Найти запись в БД по ID.
+
+        Без явной сессии запрос идет через движок только для чтения.
+        Если запись будет изменяться, нужно передать сессию записи.
+        """
+        if session is None:
+            async with new_read_session() as read_session:
+                return await cls.get_by_id(id_, read_session)
         sql_query = select(cls.model).filter_by(id=id_)
         user = await session.execute(sql_query)
         return user.scalars().one_or_none()
 
     @classmethod
     async def get_all(
-        cls: Type['BaseDAL'], session: AsyncSession
-    ) -> List[Type['model']]:
-        """Найти все записи в БД."""
+        cls: Type['BaseDAL'], session: Optional[AsyncSession] = None
+    ) -> Sequence[Base]:
+        """Найти все записи в БД.
+
+        Без явной сессии запрос идет через движок только для чтения.
+        """
+        if session is None:
+            async with new_read_session() as read_session:
+                return await cls.get_all(read_session)
         sql_query = select(cls.model)
         result = await session.execute(sql_query)
         return result.scalars().all()
 
+    @classmethod
+    async def get_all_rows(
+        cls: Type['BaseDAL'], session: Optional[AsyncSession] = None
+    ) -> List[object]:
+        """Найти все записи в виде легких моделей `row_model`.
+
+        Выбираются только колонки, перечисленные в полях `row_model`,
+        без создания ORM-объектов. Подходит для страниц и выгрузок,
+        где записи только читаются.
+        """
+        if session is None:
+            async with new_read_session() as read_session:
+                return await cls.get_all_rows(read_session)
+        row_model = cls.row_model
+        if row_model is None:
+            raise TypeError(f'{cls.__name__}: не задана row_model')
+        columns = [
+            getattr(cls.model, field.name) for field in fields(row_model)
+        ]
+        result = await session.execute(select(*columns))
+        return [row_model(*row) for row in result.tuples()]
+
+    @classmethod
+    def to_dict(cls: Type['BaseDAL'], obj: Base) -> dict[str, Any]:
+        """Значения колонок записи, кроме `private_columns`."""
+        return {
+            column.key: getattr(obj, column.key)
+            for column in cls.model.__table__.columns
+            if column.key not in cls.private_columns
+        }
+
+    @classmethod
+    def publish(cls: Type['BaseDAL'], op: str, obj: Base) -> None:
+        """Сообщить открытым админ-панелям об изменении записи."""
+        row = None if op == OP_DELETE else cls.to_dict(obj)
+        broker.publish(cls.model.__tablename__, op, obj.id, row)
+
+    @classmethod
+    async def update_one(
+        cls: Type['BaseDAL'],
+        obj: Base,
+        values: dict[str, Any],
+        session: AsyncSession,
+    ) -> Base:
+        """Обновить поля записи и сохранить изменения."""
+        for key, value in values.items():
+            setattr(obj, key, value)
+        await session.commit()
+        cls.publish(OP_UPDATE, obj)
+        return obj
+
+    @classmethod
+    async def delete_one(
+        cls: Type['BaseDAL'], obj: Base, session: AsyncSession
+    ) -> None:
+        """Удалить запись."""
+        await session.delete(obj)
+        await session.commit()
+        cls.publish(OP_DELETE, obj)
+
 
 class UserDAL(BaseDAL):
     """Класс для управление юзерами."""
 
     model = UserModel
+    row_model = UserRow
 
     @classmethod
     async def add_one_user(
-        cls: Type['UserDAL'], data: UserModel, session: AsyncSession
+        cls: Type['UserDAL'], data: UserCreateSchema, session: AsyncSession
     ) -> UserModel:
         """Метод для добавления нового юзера."""
         new_user = cls.model(
@@ -53,4 +144,33 @@ class UserDAL(BaseDAL):
         )
         session.add(new_user)
         await session.commit()
+        cls.publish(OP_INSERT, new_user)
         return new_user
+
+    @classmethod
+    async def get_ids_after(
+        cls: Type['UserDAL'], last_id: int, limit: int, session: AsyncSession
+    ) -> Sequence[int]:
+        """Получить пачку ID юзеров, следующих за `last_id`.
+
+        Постраничная выборка по ключу (keyset): каждая пачка читается
+        по индексу первичного ключа без OFFSET, поэтому стоимость
+        запроса не растет по мере продвижения по таблице.
+        """
+        sql_query = (
+            select(cls.model.id)
+            .where(cls.model.id > last_id)
+            .order_by(cls.model.id)
+            .limit(limit)
+        )
+        result = await session.execute(sql_query)
+        return result.scalars().all()
+
+    @classmethod
+    async def get_admin_ids(
+        cls: Type['UserDAL'], session: AsyncSession
+    ) -> Sequence[int]:
+        """Получить ID всех администраторов."""
+        sql_query = select(cls.model.id).where(cls.model.is_admin.is_(True))
+        result = await session.execute(sql_query)
+        return result.scalars().all()
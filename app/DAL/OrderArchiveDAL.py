@@ -0,0 +1,196 @@
+"""Методы DAL для архива заказов."""
+
+# STDLIB
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Iterable, Optional, Type
+
+# THIRDPARTY
+from sqlalchemy import Subquery, delete, func, literal, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# FIRSTPARTY
+from app.models.models import (
+    OrderArchiveModel,
+    OrderModel,
+    order_services,
+    order_services_archive,
+)
+
+ORDER_COLUMNS = (
+    'id',
+    'user_id',
+    'created_at',
+    'begin_at',
+    'ends_at',
+    'updated_at',
+    'is_active',
+    'idempotency_key',
+)
+
+
+def orders_with_archive(user_id: Optional[int] = None) -> Subquery:
+    """Рабочие и архивные заказы одной выборкой через UNION ALL.
+
+    Параметры:
+        user_id (Optional[int]): Ограничить выборку заказами юзера;
+            условие ставится в обе части, чтобы работали индексы.
+
+    Возвращаемое значение:
+        Subquery: Колонки `ORDER_COLUMNS` и признак `archived`.
+    """
+    parts = []
+    for model, archived in ((OrderModel, False), (OrderArchiveModel, True)):
+        part = select(
+            *(getattr(model, column) for column in ORDER_COLUMNS),
+            literal(archived).label('archived'),
+        )
+        if user_id is not None:
+            part = part.where(model.user_id == user_id)
+        parts.append(part)
+    return union_all(*parts).subquery('orders_all')
+
+
+def order_services_with_archive(
+    order_ids: Optional[Iterable[int]] = None,
+) -> Subquery:
+    """Связи заказов с услугами из рабочей и архивной таблиц."""
+    parts = []
+    for table in (order_services, order_services_archive):
+        part = select(table.c.order_id, table.c.service_id)
+        if order_ids is not None:
+            part = part.where(table.c.order_id.in_(order_ids))
+        parts.append(part)
+    return union_all(*parts).subquery('order_services_all')
+
+
+class OrderArchiveDAL(object):
+    """Перенос завершенных заказов в архив и чтение истории.
+
+    Каждая пачка переносится отдельной короткой транзакцией, поэтому
+    блокировка записи не удерживается дольше, чем нужно на одну пачку.
+    """
+
+    @classmethod
+    async def archive_batch(
+        cls: Type['OrderArchiveDAL'],
+        cutoff: datetime,
+        batch_size: int,
+        session: AsyncSession,
+    ) -> tuple[int, int]:
+        """Перенести в архив одну пачку неактивных заказов.
+
+        Параметры:
+            cutoff (datetime): Переносятся заказы, закончившиеся
+                (или начатые, или созданные) раньше этого момента.
+            batch_size (int): Максимальное число заказов в пачке.
+            session (AsyncSession): Сессия базы данных.
+
+        Возвращаемое значение:
+            tuple[int, int]: Сколько перенесено заказов и строк
+            `order_services`.
+        """
+        age = func.coalesce(
+            OrderModel.ends_at, OrderModel.begin_at, OrderModel.created_at
+        )
+        # Заказ с максимальным ID остается в рабочей таблице: SQLite
+        # выдает новым строкам max(id) + 1 и иначе повторил бы ID,
+        # который уже лежит в архиве
+        max_id = select(func.max(OrderModel.id)).scalar_subquery()
+        ids_query = (
+            select(OrderModel.id)
+            .where(
+                OrderModel.is_active.is_(False),
+                age < cutoff,
+                OrderModel.id < max_id,
+            )
+            .order_by(OrderModel.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        ids = list((await session.execute(ids_query)).scalars())
+        if not ids:
+            return 0, 0
+
+        await session.execute(
+            OrderArchiveModel.__table__.insert().from_select(
+                [*ORDER_COLUMNS, 'archived_at'],
+                select(
+                    *(getattr(OrderModel, column) for column in ORDER_COLUMNS),
+                    literal(datetime.now()),
+                ).where(OrderModel.id.in_(ids)),
+            )
+        )
+        result = await session.execute(
+            order_services_archive.insert().from_select(
+                ['order_id', 'service_id'],
+                select(
+                    order_services.c.order_id, order_services.c.service_id
+                ).where(order_services.c.order_id.in_(ids)),
+            )
+        )
+        await session.execute(
+            delete(order_services).where(order_services.c.order_id.in_(ids))
+        )
+        await session.execute(
+            delete(OrderModel)
+            .where(OrderModel.id.in_(ids))
+            .execution_options(synchronize_session=False)
+        )
+        await session.commit()
+        return len(ids), result.rowcount
+
+    @classmethod
+    async def get_by_idempotency_key(
+        cls: Type['OrderArchiveDAL'], key: str, session: AsyncSession
+    ) -> Optional[OrderArchiveModel]:
+        """Найти архивный заказ, созданный запросом с ключом."""
+        sql_query = select(OrderArchiveModel).filter_by(idempotency_key=key)
+        result = await session.execute(sql_query)
+        return result.scalars().first()
+
+    @classmethod
+    async def get_service_ids(
+        cls: Type['OrderArchiveDAL'], order_id: int, session: AsyncSession
+    ) -> list[int]:
+        """ID услуг заказа из рабочей таблицы или архива."""
+        links = order_services_with_archive([order_id])
+        result = await session.execute(select(links.c.service_id))
+        return list(result.scalars())
+
+    @classmethod
+    async def get_user_orders(
+        cls: Type['OrderArchiveDAL'],
+        user_id: int,
+        limit: int,
+        session: AsyncSession,
+        before_id: Optional[int] = None,
+    ) -> list[dict[str, Any]]:
+        """История заказов юзера из рабочей таблицы и архива.
+
+        Параметры:
+            user_id (int): ID юзера.
+            limit (int): Количество заказов, новые первыми.
+            session (AsyncSession): Сессия базы данных.
+            before_id (Optional[int]): Вернуть заказы с ID меньше этого,
+                для постраничного просмотра.
+
+        Возвращаемое значение:
+            list[dict]: Заказы с ID услуг и признаком `archived`.
+        """
+        orders = orders_with_archive(user_id)
+        query = select(orders).order_by(orders.c.id.desc()).limit(limit)
+        if before_id is not None:
+            query = query.where(orders.c.id < before_id)
+        rows = [dict(row) for row in (await session.execute(query)).mappings()]
+        if not rows:
+            return []
+
+        links = order_services_with_archive([row['id'] for row in rows])
+        service_ids = defaultdict(list)
+        for order_id, service_id in await session.execute(select(links)):
+            service_ids[order_id].append(service_id)
+        for row in rows:
+            del row['idempotency_key']
+            row['service_ids'] = sorted(service_ids[row['id']])
+        return rows
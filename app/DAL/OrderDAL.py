@@ -0,0 +1,132 @@
+"""Методы DAL для управления заказами."""
+
+# STDLIB
+from typing import Iterable, Optional, Sequence, Type
+
+# THIRDPARTY
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# FIRSTPARTY
+from app.DAL.AnalyticsDAL import AnalyticsDAL
+from app.DAL.BaseDAL import BaseDAL
+from app.events import OP_INSERT, OP_UPDATE
+from app.models.models import OrderModel, ServiceModel, order_services
+from app.schemas.schemas import OrderCreateSchema
+
+
+class OrderDAL(BaseDAL):
+    """Методы DAL для управления заказами."""
+
+    model = OrderModel
+    private_columns = ('idempotency_key',)
+
+    @classmethod
+    async def get_service_ids(
+        cls: Type['OrderDAL'], order_id: int, session: AsyncSession
+    ) -> Sequence[int]:
+        """Получить ID услуг заказа."""
+        sql_query = select(order_services.c.service_id).where(
+            order_services.c.order_id == order_id
+        )
+        result = await session.execute(sql_query)
+        return result.scalars().all()
+
+    @classmethod
+    async def set_active(
+        cls: Type['OrderDAL'],
+        order_id: int,
+        is_active: bool,
+        session: AsyncSession,
+    ) -> Optional[OrderModel]:
+        """Сменить статус заказа и обновить сводки в одной транзакции."""
+        order = await session.get(OrderModel, order_id)
+        if order is None or order.is_active == is_active:
+            return order
+        order.is_active = is_active
+        service_ids = await cls.get_service_ids(order_id, session)
+        await AnalyticsDAL.order_activity_changed(order, service_ids, session)
+        await session.commit()
+        cls.publish(OP_UPDATE, order)
+        return order
+
+    @classmethod
+    async def get_by_idempotency_key(
+        cls: Type['OrderDAL'], key: str, session: AsyncSession
+    ) -> Optional[OrderModel]:
+        """Найти заказ, созданный запросом с ключом идемпотентности."""
+        sql_query = select(cls.model).filter_by(idempotency_key=key)
+        result = await session.execute(sql_query)
+        return result.scalars().one_or_none()
+
+    @classmethod
+    async def get_service_costs(
+        cls: Type['OrderDAL'],
+        service_ids: Iterable[int],
+        session: AsyncSession,
+    ) -> dict[int, int]:
+        """Получить стоимость существующих услуг одним запросом `IN`."""
+        sql_query = select(ServiceModel.id, ServiceModel.service_cost).where(
+            ServiceModel.id.in_(set(service_ids))
+        )
+        result = await session.execute(sql_query)
+        return {service_id: cost for service_id, cost in result}
+
+    @classmethod
+    async def add_one_order(
+        cls: Type['OrderDAL'],
+        data: OrderCreateSchema,
+        service_costs: dict[int, int],
+        session: AsyncSession,
+        idempotency_key: Optional[str] = None,
+    ) -> tuple[OrderModel, bool]:
+        """Создать заказ с услугами и обновить сводки в одной транзакции.
+
+        Заказ записывается через flush, чтобы получить ID, затем строки
+        `order_services` вставляются одним executemany. Если заказ
+        с тем же ключом идемпотентности параллельно создал другой
+        запрос, транзакция откатывается и возвращается его заказ.
+
+        Параметры:
+            data (OrderCreateSchema): Данные заказа.
+            service_costs (dict[int, int]): Стоимость услуг заказа по ID,
+                см. `get_service_costs`.
+            session (AsyncSession): Сессия базы данных.
+            idempotency_key (Optional[str]): Ключ идемпотентности.
+
+        Возвращаемое значение:
+            tuple[OrderModel, bool]: Заказ и признак того, что он создан
+            этим вызовом.
+        """
+        order = cls.model(
+            user_id=data.user_id,
+            begin_at=data.begin_at,
+            ends_at=data.ends_at,
+            is_active=True,
+            idempotency_key=idempotency_key,
+        )
+        session.add(order)
+        try:
+            await session.flush()
+            await session.execute(
+                order_services.insert(),
+                [
+                    {'order_id': order.id, 'service_id': service_id}
+                    for service_id in service_costs
+                ],
+            )
+            await AnalyticsDAL.order_created(order, service_costs, session)
+            await session.commit()
+        except IntegrityError:
+            await session.rollback()
+            if idempotency_key is None:
+                raise
+            existing = await cls.get_by_idempotency_key(
+                idempotency_key, session
+            )
+            if existing is None:
+                raise
+            return existing, False
+        cls.publish(OP_INSERT, order)
+        return order, True
@@ -8,13 +8,16 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 # FIRSTPARTY
 from app.DAL.BaseDAL import BaseDAL
+from app.events import OP_INSERT
 from app.models.models import ServiceModel
+from app.models.read_models import ServiceRow
 
 
 class ServiceDAL(BaseDAL):
     """Методы DAL для управления услугами."""
 
     model = ServiceModel
+    row_model = ServiceRow
 
     @classmethod
     async def add_one_service(
@@ -28,4 +31,5 @@ class ServiceDAL(BaseDAL):
         )
         session.add(new_service)
         await session.commit()
+        cls.publish(OP_INSERT, new_service)
         return new_service
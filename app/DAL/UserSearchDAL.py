@@ -0,0 +1,249 @@
+"""Методы DAL для поиска пользователей."""
+
+# STDLIB
+import importlib.util
+import os
+import re
+from typing import Sequence, Type
+
+# THIRDPARTY
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# FIRSTPARTY
+from app.DAL.BaseDAL import UserDAL
+from app.models.models import UserModel
+from app.trigrams import SQL_SIMILARITY, trigrams
+
+# Индекс FTS5 `users_fts` (токенизатор trigram) и триггеры его
+# синхронизации с таблицей users создает миграция 8b2e4a7c9d10
+MIN_TRIGRAM_TERM = 3
+FUZZY_CANDIDATES = 500
+FUZZY_THRESHOLD = 0.3
+SEARCH_INDEX_MIGRATION = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'migrations',
+    'versions',
+    '8b2e4a7c9d10_users_search_index.py',
+)
+
+
+def load_search_ddl() -> tuple[str, ...]:
+    """Команды SQLite из миграции, создающей индекс поиска.
+
+    Нужны базам, схема которых создана через `Base.metadata.create_all`
+    без alembic: тестам и замерам поиска.
+
+    Возвращаемое значение:
+        tuple[str, ...]: Команды создания индекса FTS5 и его триггеров.
+    """
+    spec = importlib.util.spec_from_file_location(
+        'users_search_index', SEARCH_INDEX_MIGRATION
+    )
+    if spec is None or spec.loader is None:
+        raise ImportError(f'Миграция не найдена: {SEARCH_INDEX_MIGRATION}')
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    return migration.SQLITE_UPGRADE
+
+
+def _terms(query: str) -> list[str]:
+    """Разбить поисковую строку на слова в нижнем регистре."""
+    return [term for term in re.split(r'[\s"]+', query.lower()) if term]
+
+
+def _quote(term: str) -> str:
+    """Экранировать слово как фразу запроса FTS5."""
+    return '"{}"'.format(term.replace('"', '""'))
+
+
+def _escape_like(term: str) -> str:
+    """Экранировать спецсимволы LIKE в слове запроса."""
+    return term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+class UserSearchDAL(UserDAL):
+    """Поиск пользователей по нику, имени и фамилии.
+
+    На SQLite используется индекс FTS5 `users_fts`, на PostgreSQL -
+    индексы pg_trgm. Режим выбирается один раз для всего запроса:
+    если есть точные вхождения всех слов запроса (подстрокой в любом
+    из полей), все страницы строятся по ним, иначе - нечеткий поиск
+    по триграммам, который прощает опечатки.
+    """
+
+    @classmethod
+    async def search(
+        cls: Type['UserSearchDAL'],
+        query: str,
+        page: int,
+        per_page: int,
+        session: AsyncSession,
+    ) -> tuple[list[UserModel], bool]:
+        """Найти пользователей постранично.
+
+        Параметры:
+            query (str): Строка поиска.
+            page (int): Номер страницы, начиная с 1.
+            per_page (int): Количество записей на странице.
+            session (AsyncSession): Сессия базы данных.
+
+        Возвращаемое значение:
+            tuple[list[UserModel], bool]: Пользователи страницы и признак
+            наличия следующей страницы.
+        """
+        terms = _terms(query)
+        if not terms:
+            return [], False
+        offset = (page - 1) * per_page
+        if session.bind.dialect.name == 'postgresql':
+            return await cls._search_postgresql(
+                terms, offset, per_page, session
+            )
+
+        # Пустая дальняя страница точного поиска не значит, что запрос
+        # нечеткий: режим определяется по наличию точных совпадений вообще
+        ids = await cls._match_sqlite(terms, offset, per_page + 1, session)
+        if not ids and (
+            not offset or not await cls._match_sqlite(terms, 0, 1, session)
+        ):
+            ids = await cls._fuzzy_sqlite(terms, offset, per_page + 1, session)
+        users = await cls._get_by_ids(ids[:per_page], session)
+        return users, len(ids) > per_page
+
+    @classmethod
+    async def _get_by_ids(
+        cls: Type['UserSearchDAL'], ids: Sequence[int], session: AsyncSession
+    ) -> list[UserModel]:
+        """Загрузить пользователей, сохранив порядок ID."""
+        if not ids:
+            return []
+        result = await session.execute(
+            select(cls.model).where(cls.model.id.in_(ids))
+        )
+        users = {user.id: user for user in result.scalars()}
+        return [users[id_] for id_ in ids if id_ in users]
+
+    @classmethod
+    async def _match_sqlite(
+        cls: Type['UserSearchDAL'],
+        terms: list[str],
+        offset: int,
+        limit: int,
+        session: AsyncSession,
+    ) -> list[int]:
+        """ID пользователей, содержащих все слова запроса."""
+        long_terms = [t for t in terms if len(t) >= MIN_TRIGRAM_TERM]
+        short_terms = [t for t in terms if len(t) < MIN_TRIGRAM_TERM]
+        params: dict[str, object] = {'limit': limit, 'offset': offset}
+        conditions = []
+        if long_terms:
+            conditions.append('users_fts MATCH :match')
+            params['match'] = ' AND '.join(_quote(t) for t in long_terms)
+        # Слова короче триграммы индекс не покрывает: они ищутся той же
+        # подстрокой через LIKE по строкам, уже отобранным остальными словами
+        for i, term in enumerate(short_terms):
+            params[f'like_{i}'] = f'%{_escape_like(term)}%'
+            likes = ' OR '.join(
+                f"{column} LIKE :like_{i} ESCAPE '\\'"
+                for column in ('username', 'first_name', 'last_name')
+            )
+            conditions.append(f'({likes})')
+        where = ' AND '.join(conditions)
+        sql_query = text(
+            f'SELECT rowid FROM users_fts WHERE {where} '
+            'ORDER BY rowid LIMIT :limit OFFSET :offset'
+        )
+        result = await session.execute(sql_query, params)
+        return list(result.scalars())
+
+    @classmethod
+    async def _fuzzy_sqlite(
+        cls: Type['UserSearchDAL'],
+        terms: list[str],
+        offset: int,
+        limit: int,
+        session: AsyncSession,
+    ) -> list[int]:
+        """Нечеткий поиск: кандидаты по любой триграмме, затем ранжирование.
+
+        Индекс отбирает ограниченное число кандидатов с наибольшим
+        числом совпавших триграмм (bm25), а порог, порядок и страницу
+        задает сам запрос через функцию триграммной близости, как
+        `similarity()` в pg_trgm. Функцию регистрирует в соединении
+        `app.database.configure_sqlite`.
+        """
+        query_trigrams = set().union(*(trigrams(term) for term in terms))
+        if not query_trigrams:
+            return []
+        sql_query = text(
+            'SELECT id FROM ('
+            f'SELECT id, {SQL_SIMILARITY}(:query, username, first_name, '
+            'last_name) AS score FROM users WHERE id IN ('
+            'SELECT rowid FROM users_fts WHERE users_fts MATCH :match '
+            'ORDER BY rank LIMIT :candidates)'
+            ') WHERE score >= :threshold ORDER BY score DESC, id '
+            'LIMIT :limit OFFSET :offset'
+        )
+        result = await session.execute(
+            sql_query,
+            {
+                'query': ' '.join(terms),
+                'match': ' OR '.join(
+                    _quote(t) for t in sorted(query_trigrams)
+                ),
+                'candidates': FUZZY_CANDIDATES,
+                'threshold': FUZZY_THRESHOLD,
+                'limit': limit,
+                'offset': offset,
+            },
+        )
+        return list(result.scalars())
+
+    @classmethod
+    async def _search_postgresql(
+        cls: Type['UserSearchDAL'],
+        terms: list[str],
+        offset: int,
+        limit: int,
+        session: AsyncSession,
+    ) -> tuple[list[UserModel], bool]:
+        """Поиск через индекс pg_trgm по склейке полей пользователя."""
+        haystack = func.lower(
+            func.concat_ws(
+                ' ',
+                cls.model.username,
+                cls.model.first_name,
+                cls.model.last_name,
+            )
+        )
+        exact = [haystack.like(f'%{_escape_like(t)}%') for t in terms]
+        sql_query = (
+            select(cls.model)
+            .where(*exact)
+            .order_by(cls.model.id)
+            .offset(offset)
+            .limit(limit + 1)
+        )
+        users = list((await session.execute(sql_query)).scalars())
+        # Как и на SQLite, режим определяется по наличию точных
+        # совпадений вообще, а не на запрошенной странице
+        if not users and offset:
+            users_exist = await session.scalar(
+                select(cls.model.id).where(*exact).limit(1)
+            )
+        else:
+            users_exist = bool(users)
+        if users_exist:
+            return users[:limit], len(users) > limit
+
+        phrase = ' '.join(terms)
+        sql_query = (
+            select(cls.model)
+            .where(haystack.op('%')(phrase))
+            .order_by(func.similarity(haystack, phrase).desc(), cls.model.id)
+            .offset(offset)
+            .limit(limit + 1)
+        )
+        users = list((await session.execute(sql_query)).scalars())
+        return users[:limit], len(users) > limit
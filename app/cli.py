@@ -0,0 +1,136 @@
+"""Служебные команды приложения.
+
+Запуск:
+    python -m app.cli rebuild-analytics
+    python -m app.cli archive-orders --older-than-days 90
+    python -m app.cli data-migrate --list
+    python -m app.cli data-migrate strip-user-names --dry-run
+"""
+
+# STDLIB
+import argparse
+import asyncio
+import logging
+from typing import Any, Optional
+
+# FIRSTPARTY
+from app.DAL.AnalyticsDAL import AnalyticsDAL
+from app.data_migrations.migrations import MIGRATIONS
+from app.data_migrations.runner import DataMigrationRunner, get_statuses
+from app.database import new_session
+from app.jobs.archive import OrderArchiver
+from tg_bot.settings.settings import get_database_settings
+
+logger = logging.getLogger(__name__)
+
+
+async def rebuild_analytics(options: argparse.Namespace) -> None:
+    """Пересчитать сводные таблицы аналитики с нуля."""
+    async with new_session() as session:
+        await AnalyticsDAL.rebuild(session)
+    logger.info('Сводки аналитики пересчитаны')
+
+
+async def archive_orders(options: argparse.Namespace) -> None:
+    """Перенести в архив неактивные заказы старше заданного возраста."""
+    archiver = OrderArchiver(
+        new_session,
+        options.older_than_days,
+        batch_size=options.batch_size,
+        pause=options.pause,
+    )
+    await archiver.run_once()
+    logger.info(f'Метрики архивации: {archiver.stats}')
+
+
+async def data_migrate(options: argparse.Namespace) -> None:
+    """Выполнить миграцию данных или показать состояние миграций."""
+    if options.list or options.name is None:
+        for status in await get_statuses(new_session, MIGRATIONS):
+            print(
+                f"{status['name']}: {status['status']}, обработано "
+                f"{status['processed']}, изменено {status['changed']} - "
+                f"{status['description']}"
+            )
+        return
+    if options.name not in MIGRATIONS:
+        raise SystemExit(f'Неизвестная миграция данных: {options.name}')
+
+    runner = DataMigrationRunner(
+        new_session,
+        MIGRATIONS[options.name](),
+        batch_size=options.batch_size,
+        pause=options.pause,
+        dry_run=options.dry_run,
+        on_progress=lambda progress: logger.info(progress.report()),
+    )
+    if options.restart and not options.dry_run:
+        await runner.reset()
+    progress = await runner.run(
+        max_batches=options.max_batches, from_start=options.restart
+    )
+    if options.dry_run:
+        mode = 'dry-run, изменения не записаны'
+    elif progress.finished:
+        mode = 'готово'
+    else:
+        mode = 'остановлена, повторный запуск продолжит с этого места'
+    logger.info(f'{progress.report()} ({mode})')
+
+
+def main(args: Optional[Any] = None) -> None:
+    """Разобрать аргументы и выполнить команду."""
+    parser = argparse.ArgumentParser(description='Служебные команды')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    rebuild = commands.add_parser(
+        'rebuild-analytics',
+        help='Пересчитать сводки аналитики по текущим ценам услуг',
+    )
+    rebuild.set_defaults(handler=rebuild_analytics)
+
+    settings = get_database_settings()
+    archive = commands.add_parser(
+        'archive-orders', help='Перенести старые заказы в архив'
+    )
+    archive.add_argument(
+        '--older-than-days', type=int, default=settings.ARCHIVE_AFTER_DAYS
+    )
+    archive.add_argument(
+        '--batch-size', type=int, default=settings.ARCHIVE_BATCH_SIZE
+    )
+    archive.add_argument('--pause', type=float, default=settings.ARCHIVE_PAUSE)
+    archive.set_defaults(handler=archive_orders)
+
+    migrate = commands.add_parser(
+        'data-migrate', help='Выполнить миграцию данных пачками'
+    )
+    migrate.add_argument('name', nargs='?', help='Имя миграции')
+    migrate.add_argument(
+        '--list', action='store_true', help='Показать состояние миграций'
+    )
+    migrate.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='Посчитать изменения, ничего не записывая',
+    )
+    migrate.add_argument(
+        '--restart',
+        action='store_true',
+        help='Начать заново, сбросив контрольную точку',
+    )
+    migrate.add_argument('--batch-size', type=int, default=1000)
+    migrate.add_argument('--pause', type=float, default=0.1)
+    migrate.add_argument('--max-batches', type=int, default=None)
+    migrate.set_defaults(handler=data_migrate)
+
+    options = parser.parse_args(args)
+    asyncio.run(options.handler(options))
+
+
+if __name__ == '__main__':
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    )
+    main()
@@ -0,0 +1,45 @@
+"""Зарегистрированные миграции данных."""
+
+# STDLIB
+from typing import Any, Optional, Type
+
+# THIRDPARTY
+from sqlalchemy import Row
+
+# FIRSTPARTY
+from app.data_migrations.runner import DataMigration
+from app.DAL.BaseDAL import UserDAL
+
+MIGRATIONS: dict[str, Type[DataMigration]] = {}
+
+
+def data_migration(migration: Type[DataMigration]) -> Type[DataMigration]:
+    """Зарегистрировать миграцию данных по ее имени."""
+    MIGRATIONS[migration.name] = migration
+    return migration
+
+
+@data_migration
+class StripUserNames(DataMigration):
+    """Убрать пробелы по краям ника, имени и фамилии юзеров.
+
+    Пустые после очистки значения заменяются на `NULL`, как у юзеров
+    Telegram без фамилии или ника.
+    """
+
+    name = 'strip-user-names'
+    description = 'Убрать пробелы по краям ника, имени и фамилии'
+    dal = UserDAL
+    columns = ('username', 'first_name', 'last_name')
+
+    def transform(self, row: Row) -> Optional[dict[str, Any]]:
+        """Очищенные значения полей, если они отличаются от текущих."""
+        values = {}
+        for column in self.columns:
+            value = getattr(row, column)
+            if value is None:
+                continue
+            stripped = value.strip() or None
+            if stripped != value:
+                values[column] = stripped
+        return values or None
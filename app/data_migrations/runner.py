@@ -0,0 +1,311 @@
+"""Онлайн-миграции данных пачками по первичному ключу.
+
+Alembic выполняет каждую миграцию одной транзакцией, и переписывание
+большой таблицы SQLite блокирует запись на минуты. Миграции данных
+(заполнение новых колонок, чистка значений) поэтому выполняются
+отдельно от схемы: строки читаются пачками по ключу (keyset),
+каждая пачка изменяется и сохраняется вместе с контрольной точкой
+в своей короткой транзакции, а между пачками делается пауза.
+Миграцию можно прервать в любой момент и продолжить позже, пока
+приложение работает.
+
+Измененные строки каждой пачки публикуются через `publish` DAL
+миграции, как и остальные изменения. Брокер событий живет внутри
+процесса, поэтому открытые админ-панели получают их, только если
+миграция запущена в процессе приложения; после запуска из `app.cli`
+панели покажут новые значения при следующей загрузке страницы.
+"""
+
+# STDLIB
+import abc
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime
+import logging
+import time
+from typing import Any, Callable, Optional, Sequence, Type
+
+# THIRDPARTY
+from sqlalchemy import Row, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# FIRSTPARTY
+from app.DAL.BaseDAL import BaseDAL
+from app.events import OP_UPDATE
+from app.models.models import DataMigrationModel
+
+logger = logging.getLogger(__name__)
+
+
+class DataMigration(abc.ABC):
+    """Базовый класс миграции данных.
+
+    Подкласс задает DAL таблицы, читаемые колонки и метод `transform`,
+    который для каждой строки возвращает новые значения полей или
+    `None`, если строку менять не нужно. Повторный прогон по уже
+    измененным строкам не должен ничего менять.
+
+    Атрибуты:
+        name (str): Уникальное имя миграции для контрольной точки.
+        description (str): Описание для списка миграций.
+        dal (Type[BaseDAL]): DAL изменяемой таблицы, ее модель должна
+            иметь целочисленный `id`.
+        columns (Sequence[str]): Колонки, нужные `transform`.
+    """
+
+    name: str = ''
+    description: str = ''
+    dal: Type[BaseDAL] = BaseDAL
+    columns: Sequence[str] = ()
+
+    @property
+    def model(self) -> Type[Any]:
+        """ORM-модель изменяемой таблицы из `dal`."""
+        model = getattr(self.dal, 'model', None)
+        if model is None:
+            raise TypeError(f'{type(self).__name__}: у DAL не задана модель')
+        return model
+
+    @abc.abstractmethod
+    def transform(self, row: Row) -> Optional[dict[str, Any]]:
+        """Новые значения полей строки или `None`."""
+
+
+@dataclass
+class Progress(object):
+    """Прогресс миграции данных.
+
+    Атрибуты:
+        name (str): Имя миграции.
+        last_id (int): ID последней обработанной строки.
+        total (int): Оценка общего числа строк на момент запуска.
+        processed (int): Обработано строк за все запуски.
+        changed (int): Изменено строк (в dry-run - было бы изменено).
+        elapsed (float): Время текущего запуска в секундах.
+        run_processed (int): Обработано строк в текущем запуске.
+        finished (bool): Таблица пройдена до конца.
+    """
+
+    name: str
+    last_id: int = 0
+    total: int = 0
+    processed: int = 0
+    changed: int = 0
+    elapsed: float = 0.0
+    run_processed: int = 0
+    finished: bool = False
+
+    @property
+    def percent(self) -> float:
+        """Доля обработанных строк в процентах."""
+        if self.finished or not self.total:
+            return 100.0
+        return min(100.0, self.processed * 100 / self.total)
+
+    @property
+    def rate(self) -> float:
+        """Строк в секунду в текущем запуске."""
+        return self.run_processed / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def eta(self) -> float:
+        """Оценка оставшегося времени в секундах."""
+        if not self.rate:
+            return 0.0
+        return max(0, self.total - self.processed) / self.rate
+
+    def report(self) -> str:
+        """Строка отчета для лога."""
+        return (
+            f'{self.name}: {self.percent:.1f}%, обработано {self.processed} '
+            f'из {self.total}, изменено {self.changed}, последний ID '
+            f'{self.last_id}, {self.rate:.0f} строк/с, '
+            f'осталось ~{self.eta:.0f}с'
+        )
+
+
+class DataMigrationRunner(object):
+    """Выполнение миграции данных пачками с контрольными точками.
+
+    Атрибуты:
+        session_factory (Callable): Фабрика асинхронных сессий БД.
+        migration (DataMigration): Выполняемая миграция.
+        batch_size (int): Строк в одной транзакции.
+        pause (float): Пауза между пачками в секундах, чтобы запись
+            приложения не ждала миграцию.
+        dry_run (bool): Только посчитать изменения, ничего не записывая.
+        on_progress (Optional[Callable]): Вызывается после каждой пачки.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        migration: DataMigration,
+        batch_size: int = 1000,
+        pause: float = 0.1,
+        dry_run: bool = False,
+        on_progress: Optional[Callable[[Progress], None]] = None,
+    ) -> None:
+        """Подготовить запуск; миграцию выполняет `run`."""
+        self.session_factory = session_factory
+        self.migration = migration
+        self.batch_size = batch_size
+        self.pause = pause
+        self.dry_run = dry_run
+        self.on_progress = on_progress
+
+    async def _load_checkpoint(self) -> Optional[DataMigrationModel]:
+        async with self.session_factory() as session:
+            return await session.get(DataMigrationModel, self.migration.name)
+
+    async def reset(self) -> None:
+        """Удалить контрольную точку, чтобы начать миграцию заново."""
+        async with self.session_factory() as session:
+            checkpoint = await session.get(
+                DataMigrationModel, self.migration.name
+            )
+            if checkpoint is not None:
+                await session.delete(checkpoint)
+                await session.commit()
+
+    async def _process_batch(
+        self, progress: Progress, session: AsyncSession
+    ) -> int:
+        """Обработать следующую пачку, вернуть число прочитанных строк."""
+        model = self.migration.model
+        sql_query = (
+            select(
+                model.id,
+                *(getattr(model, column) for column in self.migration.columns),
+            )
+            .where(model.id > progress.last_id)
+            .order_by(model.id)
+            .limit(self.batch_size)
+        )
+        rows = (await session.execute(sql_query)).all()
+        if not rows:
+            return 0
+        changes = []
+        for row in rows:
+            values = self.migration.transform(row)
+            if values:
+                changes.append({'id': row.id, **values})
+        progress.last_id = rows[-1].id
+        progress.processed += len(rows)
+        progress.changed += len(changes)
+        if self.dry_run:
+            return len(rows)
+
+        if changes:
+            # ORM bulk UPDATE по первичному ключу: один executemany
+            await session.execute(update(model), changes)
+        checkpoint = await session.get(DataMigrationModel, self.migration.name)
+        if checkpoint is None:
+            checkpoint = DataMigrationModel(name=self.migration.name)
+            session.add(checkpoint)
+        checkpoint.last_id = progress.last_id
+        checkpoint.processed = progress.processed
+        checkpoint.changed = progress.changed
+        await session.commit()
+        if changes:
+            await self._publish([change['id'] for change in changes], session)
+        return len(rows)
+
+    async def _publish(self, ids: list[int], session: AsyncSession) -> None:
+        """Сообщить админ-панелям об измененных строках пачки."""
+        model = self.migration.model
+        result = await session.execute(select(model).where(model.id.in_(ids)))
+        for obj in result.scalars():
+            self.migration.dal.publish(OP_UPDATE, obj)
+
+    async def _finish(self) -> None:
+        async with self.session_factory() as session:
+            checkpoint = await session.get(
+                DataMigrationModel, self.migration.name
+            )
+            if checkpoint is None:
+                checkpoint = DataMigrationModel(name=self.migration.name)
+                session.add(checkpoint)
+            checkpoint.finished_at = datetime.now()
+            await session.commit()
+
+    async def run(
+        self, max_batches: Optional[int] = None, from_start: bool = False
+    ) -> Progress:
+        """Выполнить миграцию с последней контрольной точки.
+
+        Параметры:
+            max_batches (Optional[int]): Остановиться после стольких
+                пачек, например чтобы растянуть миграцию на несколько
+                запусков.
+            from_start (bool): Не учитывать контрольную точку, например
+                для dry-run уже выполненной миграции.
+
+        Возвращаемое значение:
+            Progress: Итоговый прогресс.
+        """
+        checkpoint = None if from_start else await self._load_checkpoint()
+        progress = Progress(name=self.migration.name)
+        if checkpoint is not None:
+            if checkpoint.finished_at is not None:
+                progress.finished = True
+                logger.info(f'{self.migration.name}: уже выполнена')
+                return progress
+            progress.last_id = checkpoint.last_id
+            progress.processed = checkpoint.processed
+            progress.changed = checkpoint.changed
+        model = self.migration.model
+        async with self.session_factory() as session:
+            remaining = await session.scalar(
+                select(func.count()).where(model.id > progress.last_id)
+            )
+        progress.total = progress.processed + (remaining or 0)
+
+        started_at = time.monotonic()
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            async with self.session_factory() as session:
+                read = await self._process_batch(progress, session)
+            batches += 1
+            progress.run_processed += read
+            progress.elapsed = time.monotonic() - started_at
+            if read < self.batch_size:
+                progress.finished = True
+            if self.on_progress is not None:
+                self.on_progress(progress)
+            if progress.finished:
+                break
+            await asyncio.sleep(self.pause)
+
+        if progress.finished and not self.dry_run:
+            await self._finish()
+        return progress
+
+
+async def get_statuses(
+    session_factory: Callable[[], AsyncSession],
+    migrations: dict[str, Type[DataMigration]],
+) -> list[dict[str, Any]]:
+    """Состояние всех зарегистрированных миграций."""
+    async with session_factory() as session:
+        result = await session.execute(select(DataMigrationModel))
+        checkpoints = {row.name: row for row in result.scalars()}
+    statuses = []
+    for name, migration in migrations.items():
+        checkpoint = checkpoints.get(name)
+        if checkpoint is None:
+            status = 'не запускалась'
+        elif checkpoint.finished_at is not None:
+            status = f'выполнена {checkpoint.finished_at:%Y-%m-%d %H:%M}'
+        else:
+            status = f'прервана на ID {checkpoint.last_id}'
+        statuses.append(
+            {
+                'name': name,
+                'description': migration.description,
+                'status': status,
+                'processed': checkpoint.processed if checkpoint else 0,
+                'changed': checkpoint.changed if checkpoint else 0,
+            }
+        )
+    return statuses
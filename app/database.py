@@ -1,22 +1,82 @@
 """Управление доступа к БД."""
 
 # STDLIB
+import os
 from typing import Annotated
 
 # THIRDPARTY
 from fastapi import Depends
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.engine.interfaces import DBAPIConnection
+from sqlalchemy.pool import ConnectionPoolEntry
+
+# FIRSTPARTY
+from app.trigrams import SQL_SIMILARITY, sql_similarity
+
+# База SQLite по умолчанию лежит рядом с пакетом приложения, чтобы
+# приложение, alembic и служебные команды открывали один и тот же файл
+# независимо от рабочей директории
+DATABASE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'db.sqlite3'
+)
+database_url = os.getenv(
+    'DATABASE_URL', f'sqlite+aiosqlite:///{DATABASE_PATH}'
+)
+# Чтение идет через отдельный движок: на SQLite это та же база,
+# открытая в режиме только для чтения, на PostgreSQL - адрес реплики
+read_database_url = os.getenv(
+    'DATABASE_READ_URL',
+    f'sqlite+aiosqlite:///file:{DATABASE_PATH}?mode=ro&uri=true',
+)
+
+
+def configure_sqlite(engine: AsyncEngine, *pragmas: str) -> None:
+    """Настраивать каждое новое соединение SQLite.
+
+    Выполняет PRAGMA и регистрирует функцию триграммной близости,
+    которой нечеткий поиск пользователей ранжирует кандидатов.
+    Для других СУБД ничего не делает.
+
+    Параметры:
+        engine (AsyncEngine): Движок базы данных.
+        *pragmas (str): Команды PRAGMA для каждого соединения.
+    """
+    if engine.dialect.name != 'sqlite':
+        return
+
+    @event.listens_for(engine.sync_engine, 'connect')
+    def on_connect(
+        dbapi_connection: DBAPIConnection,
+        connection_record: ConnectionPoolEntry,
+    ) -> None:
+        dbapi_connection.create_function(
+            SQL_SIMILARITY, 4, sql_similarity, deterministic=True
+        )
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
 
-database_url = 'sqlite+aiosqlite:///db.sqlite3'
 engine = create_async_engine(url=database_url)
+# WAL позволяет читателям работать параллельно с записью
+configure_sqlite(engine, 'PRAGMA journal_mode=WAL', 'PRAGMA busy_timeout=5000')
 new_session = async_sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
 )
 
+read_engine = create_async_engine(url=read_database_url)
+configure_sqlite(read_engine, 'PRAGMA busy_timeout=5000')
+new_read_session = async_sessionmaker(
+    read_engine, class_=AsyncSession, expire_on_commit=False
+)
+
 
 async def get_session() -> AsyncSession:
     """Создает и возвращает асинхронную сессию базы данных.
@@ -33,4 +93,19 @@ async def get_session() -> AsyncSession:
         yield session
 
 
+async def get_read_session() -> AsyncSession:
+    """Создает и возвращает сессию базы данных только для чтения.
+
+    Сессия работает через отдельный движок и пул соединений, поэтому
+    чтение списков не конкурирует с записью за соединения основной БД.
+    Изменения через эту сессию сохранить нельзя.
+
+    Возвращаемое значение:
+        AsyncSession: Асинхронная сессия базы данных для чтения.
+    """
+    async with new_read_session() as session:
+        yield session
+
+
 SessionDep = Annotated[AsyncSession, Depends(get_session)]
+ReadSessionDep = Annotated[AsyncSession, Depends(get_read_session)]
@@ -0,0 +1,143 @@
+"""Канал событий об изменении строк для живого обновления админ-панели.
+
+Брокер живет в памяти процесса: подписчик получает только изменения,
+сделанные тем же процессом. При запуске нескольких воркеров uvicorn или
+реплик приложения админ-панель, подключенная к одной из них, не увидит
+изменений, прошедших через другие, а `Last-Event-ID` другого процесса
+(другой `epoch`) приводит к событию `reset`. Для нескольких процессов
+брокер нужно заменить рассылкой через общее хранилище, например
+Redis Pub/Sub.
+"""
+
+# STDLIB
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+import itertools
+import json
+import logging
+import secrets
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+OP_INSERT = 'insert'
+OP_UPDATE = 'update'
+OP_DELETE = 'delete'
+
+
+@dataclass(frozen=True)
+class ChangeEvent(object):
+    """Изменение одной строки таблицы.
+
+    Атрибуты:
+        epoch (str): Метка запуска процесса, выпустившего событие.
+        id (int): Порядковый номер события.
+        table (str): Имя таблицы.
+        op (str): Операция: `insert`, `update` или `delete`.
+        row_id (int): ID измененной строки.
+        row (Optional[dict]): Новые значения полей строки.
+    """
+
+    epoch: str
+    id: int
+    table: str
+    op: str
+    row_id: int
+    row: Optional[dict[str, Any]] = None
+
+    def to_sse(self) -> str:
+        """Сообщение в формате Server-Sent Events."""
+        data = json.dumps(
+            {
+                'table': self.table,
+                'op': self.op,
+                'id': self.row_id,
+                'row': self.row,
+            },
+            ensure_ascii=False,
+            default=str,
+        )
+        return f'id: {self.epoch}-{self.id}\nevent: change\ndata: {data}\n\n'
+
+
+class ChangeBroker(object):
+    """Рассылка событий изменений подписчикам внутри процесса.
+
+    Последние события хранятся в кольцевом буфере, поэтому клиент,
+    переподключившийся с `Last-Event-ID`, получает пропущенные
+    изменения. Если пропущено больше, чем помещается в буфер,
+    процесс перезапускался или подписчик не успевает читать,
+    он получает событие `reset` и перезагружает страницу целиком.
+
+    Атрибуты:
+        history_size (int): Размер буфера последних событий.
+        queue_size (int): Размер очереди одного подписчика.
+    """
+
+    def __init__(
+        self, history_size: int = 1000, queue_size: int = 100
+    ) -> None:
+        """Создать брокер с новой меткой запуска `epoch`."""
+        self.history: deque[ChangeEvent] = deque(maxlen=history_size)
+        self.queue_size = queue_size
+        self.subscribers: set[asyncio.Queue] = set()
+        self.counter = itertools.count(1)
+        self.epoch = secrets.token_hex(4)
+
+    def publish(
+        self,
+        table: str,
+        op: str,
+        row_id: int,
+        row: Optional[dict[str, Any]] = None,
+    ) -> None:
+        """Опубликовать изменение строки."""
+        event = ChangeEvent(
+            self.epoch, next(self.counter), table, op, row_id, row
+        )
+        self.history.append(event)
+        for queue in list(self.subscribers):
+            if queue.qsize() >= self.queue_size:
+                logger.warning('Подписчик не успевает читать события')
+                self.subscribers.discard(queue)
+                queue.put_nowait(None)
+            else:
+                queue.put_nowait(event)
+
+    def subscribe(self, last_event_id: Optional[str] = None) -> asyncio.Queue:
+        """Подписаться на события.
+
+        Параметры:
+            last_event_id (Optional[str]): ID последнего полученного
+                клиентом события; более новые события из буфера
+                сразу попадут в очередь.
+
+        Возвращаемое значение:
+            asyncio.Queue: Очередь событий. `None` в очереди означает,
+            что клиент отстал и должен перезагрузить данные.
+        """
+        # Одно место всегда остается под маркер сброса
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size + 1)
+        if last_event_id:
+            epoch, _, number = last_event_id.partition('-')
+            last_id = int(number) if number.isdigit() else -1
+            missed = [e for e in self.history if e.id > last_id]
+            oldest_id = self.history[0].id if self.history else 1
+            # Другой процесс, вытесненные из буфера или не помещающиеся
+            # в очередь события: догнать можно только перезагрузкой
+            replayable = epoch == self.epoch and oldest_id <= last_id + 1
+            if not replayable or len(missed) > self.queue_size:
+                queue.put_nowait(None)
+                return queue
+            for event in missed:
+                queue.put_nowait(event)
+        self.subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        """Отписаться от событий."""
+        self.subscribers.discard(queue)
+
+
+broker = ChangeBroker()
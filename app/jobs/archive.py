@@ -0,0 +1,133 @@
+"""Фоновая архивация завершенных заказов."""
+
+# STDLIB
+import asyncio
+from collections import deque
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+import logging
+import time
+from typing import Any, Callable, Optional
+
+# THIRDPARTY
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# FIRSTPARTY
+from app.DAL.OrderArchiveDAL import OrderArchiveDAL
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ArchiveRun(object):
+    """Итоги одного запуска архивации.
+
+    Атрибуты:
+        started_at (datetime): Время запуска.
+        duration (float): Длительность в секундах.
+        batches (int): Количество транзакций переноса.
+        orders_moved (int): Перенесено заказов.
+        services_moved (int): Перенесено строк `order_services`.
+    """
+
+    started_at: datetime
+    duration: float = 0.0
+    batches: int = 0
+    orders_moved: int = 0
+    services_moved: int = 0
+
+
+class OrderArchiver(object):
+    """Перенос неактивных заказов старше заданного возраста в архив.
+
+    Заказы переносятся пачками, каждая в своей короткой транзакции,
+    с паузой между пачками, чтобы бот и админ-панель успевали писать
+    в БД, пока идет архивация.
+
+    Атрибуты:
+        session_factory (Callable): Фабрика асинхронных сессий БД.
+        after_days (int): Возраст заказа для переноса в днях.
+        batch_size (int): Заказов в одной транзакции.
+        pause (float): Пауза между пачками в секундах.
+        runs (deque[ArchiveRun]): Итоги последних запусков.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        after_days: int,
+        batch_size: int = 500,
+        pause: float = 0.5,
+        history_size: int = 20,
+    ) -> None:
+        """Подготовить архиватор; периодический запуск - `start`."""
+        self.session_factory = session_factory
+        self.after_days = after_days
+        self.batch_size = batch_size
+        self.pause = pause
+        self.runs: deque[ArchiveRun] = deque(maxlen=history_size)
+        self.orders_moved = 0
+        self.services_moved = 0
+        self.task: Optional[asyncio.Task] = None
+
+    async def run_once(self) -> ArchiveRun:
+        """Перенести в архив все подходящие заказы."""
+        cutoff = datetime.now() - timedelta(days=self.after_days)
+        run = ArchiveRun(started_at=datetime.now())
+        started_at = time.monotonic()
+        while True:
+            async with self.session_factory() as session:
+                try:
+                    orders, services = await OrderArchiveDAL.archive_batch(
+                        cutoff, self.batch_size, session
+                    )
+                except IntegrityError:
+                    # Ту же пачку уже переносит другой процесс
+                    logger.warning('Архивация заказов идет параллельно')
+                    break
+            if not orders:
+                break
+            run.batches += 1
+            run.orders_moved += orders
+            run.services_moved += services
+            if orders < self.batch_size:
+                break
+            await asyncio.sleep(self.pause)
+        run.duration = time.monotonic() - started_at
+        self.runs.append(run)
+        self.orders_moved += run.orders_moved
+        self.services_moved += run.services_moved
+        logger.info(
+            f'Архивация заказов: перенесено {run.orders_moved} заказов '
+            f'и {run.services_moved} связей за {run.duration:.1f}с'
+        )
+        return run
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Метрики архивации с момента запуска процесса."""
+        return {
+            'orders_moved': self.orders_moved,
+            'services_moved': self.services_moved,
+            'runs': [asdict(run) for run in reversed(self.runs)],
+        }
+
+    async def _loop(self, interval: float) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f'Ошибка архивации заказов: {e}', exc_info=True)
+            await asyncio.sleep(interval)
+
+    def start(self, interval: float) -> None:
+        """Запускать архивацию каждые `interval` секунд."""
+        self.task = asyncio.create_task(self._loop(interval))
+
+    async def stop(self) -> None:
+        """Остановить периодическую архивацию."""
+        if self.task is not None:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+            self.task = None
@@ -0,0 +1,44 @@
+"""Обработчики фоновых задач."""
+
+# STDLIB
+from typing import Callable
+
+# FIRSTPARTY
+from app.DAL.BaseDAL import UserDAL
+from app.database import new_session
+from app.jobs.runtime import enqueue
+from app.jobs.worker import Handler
+from app.resources import resources
+
+HANDLERS: dict[str, Handler] = {}
+
+
+def job_handler(name: str) -> Callable[[Handler], Handler]:
+    """Зарегистрировать обработчик задачи с именем `name`."""
+
+    def decorator(handler: Handler) -> Handler:
+        HANDLERS[name] = handler
+        return handler
+
+    return decorator
+
+
+@job_handler('notify_admins')
+async def notify_admins(text: str) -> None:
+    """Разослать уведомление всем администраторам.
+
+    Каждому администратору отправка ставится отдельной задачей,
+    чтобы повтор после ошибки не дублировал уже доставленные сообщения.
+    Все задачи ставятся одной транзакцией.
+    """
+    async with new_session() as session:
+        admin_ids = await UserDAL.get_admin_ids(session)
+        for admin_id in admin_ids:
+            await enqueue('send_message', session, chat_id=admin_id, text=text)
+        await session.commit()
+
+
+@job_handler('send_message')
+async def send_message(chat_id: int, text: str) -> None:
+    """Отправить сообщение в Telegram."""
+    await resources.bot.send_message(chat_id, text)
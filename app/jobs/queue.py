@@ -0,0 +1,276 @@
+"""Очереди фоновых задач: в памяти процесса и в БД."""
+
+# STDLIB
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+import json
+from typing import Any, Callable, Optional, Protocol
+
+# THIRDPARTY
+from sqlalchemy import and_, delete, event, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, SessionTransaction
+
+# FIRSTPARTY
+from app.models.models import JobModel
+
+STATUS_PENDING = 'pending'
+STATUS_RUNNING = 'running'
+STATUS_FAILED = 'failed'
+
+
+@dataclass
+class Job(object):
+    """Фоновая задача.
+
+    Атрибуты:
+        name (str): Имя обработчика.
+        payload (dict): Аргументы обработчика.
+        max_attempts (int): Сколько раз пробовать выполнить задачу.
+        attempts (int): Сколько попыток уже сделано.
+        id (Optional[int]): ID задачи в БД для долговременной очереди.
+    """
+
+    name: str
+    payload: dict[str, Any] = field(default_factory=dict)
+    max_attempts: int = 5
+    attempts: int = 0
+    id: Optional[int] = None
+
+
+def on_commit(session: AsyncSession, callback: Callable[[], object]) -> None:
+    """Вызвать `callback` после коммита текущей транзакции сессии.
+
+    Если транзакция завершится откатом или сессия закроется без коммита,
+    `callback` снимается и не сработает на следующем коммите той же сессии.
+    """
+    sync_session = session.sync_session
+    if not sync_session.in_transaction():
+        # Как при autobegin: callback привязывается к этой транзакции,
+        # а не к той, что начнется после закрытия сессии
+        sync_session.begin()
+    pending = True
+
+    def committed(_: Session) -> None:
+        callback()
+
+    def ended(_: Session, transaction: SessionTransaction) -> None:
+        nonlocal pending
+        # Точки сохранения (begin_nested) транзакцию не завершают
+        if pending and transaction.parent is None:
+            pending = False
+            event.remove(sync_session, 'after_commit', committed)
+
+    event.listen(sync_session, 'after_commit', committed)
+    event.listen(sync_session, 'after_transaction_end', ended)
+
+
+class JobQueue(Protocol):
+    """Интерфейс очереди задач."""
+
+    async def put(
+        self, job: Job, session: Optional[AsyncSession] = None
+    ) -> None:
+        """Поставить задачу в очередь.
+
+        Если передана сессия, задача ставится только вместе с коммитом
+        ее транзакции, а коммит остается за вызывающим кодом.
+        """
+
+    async def get(self) -> Job:
+        """Дождаться и забрать следующую задачу."""
+
+    async def ack(self, job: Job) -> None:
+        """Отметить задачу выполненной."""
+
+    async def retry(self, job: Job, delay: float, error: str) -> None:
+        """Вернуть задачу в очередь через `delay` секунд."""
+
+    async def fail(self, job: Job, error: str) -> None:
+        """Отметить задачу окончательно упавшей."""
+
+
+class MemoryJobQueue(object):
+    """Очередь в памяти процесса: быстрая, но теряет задачи при рестарте."""
+
+    def __init__(self) -> None:
+        """Создать пустую очередь."""
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.failed: list[tuple[Job, str]] = []
+
+    async def put(
+        self, job: Job, session: Optional[AsyncSession] = None
+    ) -> None:
+        """Поставить задачу в очередь сразу или после коммита `session`."""
+        if session is None:
+            self.queue.put_nowait(job)
+        else:
+            on_commit(session, lambda: self.queue.put_nowait(job))
+
+    async def get(self) -> Job:
+        """Дождаться и забрать следующую задачу."""
+        return await self.queue.get()
+
+    async def ack(self, job: Job) -> None:
+        """Отметить задачу выполненной."""
+
+    async def retry(self, job: Job, delay: float, error: str) -> None:
+        """Вернуть задачу в очередь через `delay` секунд."""
+        asyncio.get_running_loop().call_later(
+            delay, self.queue.put_nowait, job
+        )
+
+    async def fail(self, job: Job, error: str) -> None:
+        """Отметить задачу окончательно упавшей."""
+        self.failed.append((job, error))
+
+
+class DatabaseJobQueue(object):
+    """Долговременная очередь в таблице `jobs`.
+
+    Задача забирается атомарным `UPDATE ... RETURNING`, поэтому
+    несколько воркеров не получат одну и ту же задачу: условие выбора
+    повторяется в самом `UPDATE`, а на PostgreSQL строки, которые
+    уже забирает другой воркер, пропускаются (`SKIP LOCKED`). Задачи,
+    зависшие в статусе `running` дольше `visibility_timeout`
+    (например, после падения процесса), забираются повторно.
+
+    Атрибуты:
+        session_factory (Callable): Фабрика асинхронных сессий БД.
+        poll_interval (float): Пауза между опросами пустой очереди.
+        visibility_timeout (float): Через сколько секунд задача
+            в работе считается потерянной.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        poll_interval: float = 1.0,
+        visibility_timeout: float = 300.0,
+    ) -> None:
+        """Создать очередь поверх фабрики сессий приложения."""
+        self.session_factory = session_factory
+        self.poll_interval = poll_interval
+        self.visibility_timeout = visibility_timeout
+        self.wakeup = asyncio.Event()
+
+    async def put(
+        self, job: Job, session: Optional[AsyncSession] = None
+    ) -> None:
+        """Поставить задачу в очередь.
+
+        С переданной сессией строка задачи добавляется в транзакцию
+        вызывающего кода (outbox): задача появится в очереди только
+        вместе с изменениями, ради которых она ставится, и пропадет
+        при откате. Без сессии задача записывается отдельной транзакцией.
+        """
+        model = JobModel(
+            name=job.name,
+            payload=json.dumps(job.payload),
+            max_attempts=job.max_attempts,
+        )
+        if session is not None:
+            session.add(model)
+            on_commit(session, self.wakeup.set)
+            return
+        async with self.session_factory() as own_session:
+            own_session.add(model)
+            await own_session.commit()
+        self.wakeup.set()
+
+    async def _claim(self) -> Optional[Job]:
+        now = datetime.now()
+        stale_before = now - timedelta(seconds=self.visibility_timeout)
+        claimable = or_(
+            and_(JobModel.status == STATUS_PENDING, JobModel.run_at <= now),
+            and_(
+                JobModel.status == STATUS_RUNNING,
+                JobModel.locked_at < stale_before,
+            ),
+        )
+        next_id = (
+            select(JobModel.id)
+            .where(claimable)
+            .order_by(JobModel.run_at, JobModel.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        # Без повтора условия два воркера, выбравшие одну строку
+        # подзапросом, оба обновили бы ее: второй UPDATE должен
+        # увидеть, что задачу уже забрали
+        sql_query = (
+            update(JobModel)
+            .where(JobModel.id == next_id, claimable)
+            .values(
+                status=STATUS_RUNNING,
+                locked_at=now,
+                attempts=JobModel.attempts + 1,
+            )
+            .returning(
+                JobModel.id,
+                JobModel.name,
+                JobModel.payload,
+                JobModel.attempts,
+                JobModel.max_attempts,
+            )
+        )
+        async with self.session_factory() as session:
+            row = (await session.execute(sql_query)).one_or_none()
+            await session.commit()
+        if row is None:
+            return None
+        return Job(
+            id=row.id,
+            name=row.name,
+            payload=json.loads(row.payload),
+            # attempts в БД уже учитывает текущую попытку
+            attempts=row.attempts - 1,
+            max_attempts=row.max_attempts,
+        )
+
+    async def get(self) -> Job:
+        """Дождаться и забрать следующую задачу."""
+        while True:
+            job = await self._claim()
+            if job is not None:
+                return job
+            self.wakeup.clear()
+            try:
+                await asyncio.wait_for(
+                    self.wakeup.wait(), timeout=self.poll_interval
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    async def ack(self, job: Job) -> None:
+        """Удалить выполненную задачу."""
+        async with self.session_factory() as session:
+            await session.execute(delete(JobModel).filter_by(id=job.id))
+            await session.commit()
+
+    async def retry(self, job: Job, delay: float, error: str) -> None:
+        """Вернуть задачу в очередь через `delay` секунд."""
+        async with self.session_factory() as session:
+            await session.execute(
+                update(JobModel)
+                .filter_by(id=job.id)
+                .values(
+                    status=STATUS_PENDING,
+                    run_at=datetime.now() + timedelta(seconds=delay),
+                    locked_at=None,
+                    last_error=error,
+                )
+            )
+            await session.commit()
+
+    async def fail(self, job: Job, error: str) -> None:
+        """Оставить упавшую задачу в таблице для разбора."""
+        async with self.session_factory() as session:
+            await session.execute(
+                update(JobModel)
+                .filter_by(id=job.id)
+                .values(status=STATUS_FAILED, last_error=error)
+            )
+            await session.commit()
@@ -0,0 +1,62 @@
+"""Очередь задач приложения и постановка задач из маршрутов."""
+
+# STDLIB
+from functools import lru_cache
+from typing import Optional
+
+# THIRDPARTY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# FIRSTPARTY
+from app.database import new_session
+from app.jobs.archive import OrderArchiver
+from app.jobs.queue import DatabaseJobQueue, Job, JobQueue, MemoryJobQueue
+from tg_bot.settings.settings import Settings, get_settings
+
+QUEUE_MEMORY = 'memory'
+QUEUE_DATABASE = 'database'
+
+
+def build_queue(settings: Settings) -> JobQueue:
+    """Создать очередь согласно настройке `JOB_QUEUE`."""
+    if settings.JOB_QUEUE == QUEUE_MEMORY:
+        return MemoryJobQueue()
+    if settings.JOB_QUEUE == QUEUE_DATABASE:
+        return DatabaseJobQueue(new_session)
+    raise ValueError(f'Неизвестная очередь задач: {settings.JOB_QUEUE}')
+
+
+@lru_cache
+def get_job_queue() -> JobQueue:
+    """Очередь задач приложения, создается при первом обращении."""
+    return build_queue(get_settings())
+
+
+@lru_cache
+def get_order_archiver() -> OrderArchiver:
+    """Архиватор заказов приложения, создается при первом обращении."""
+    settings = get_settings()
+    return OrderArchiver(
+        new_session,
+        settings.ARCHIVE_AFTER_DAYS,
+        batch_size=settings.ARCHIVE_BATCH_SIZE,
+        pause=settings.ARCHIVE_PAUSE,
+    )
+
+
+async def enqueue(
+    name: str, session: Optional[AsyncSession] = None, **payload: object
+) -> None:
+    """Поставить задачу в очередь приложения.
+
+    Параметры:
+        name (str): Имя обработчика задачи.
+        session (Optional[AsyncSession]): Сессия вызывающего кода. Задача
+            ставится в ее транзакции и видна воркерам только после
+            коммита, который выполняет вызывающий код.
+        **payload: Аргументы обработчика, должны сериализоваться в JSON.
+    """
+    max_attempts = get_settings().JOB_MAX_ATTEMPTS
+    await get_job_queue().put(
+        Job(name=name, payload=payload, max_attempts=max_attempts), session
+    )
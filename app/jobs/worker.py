@@ -0,0 +1,94 @@
+"""Воркер, выполняющий фоновые задачи из очереди."""
+
+# STDLIB
+import asyncio
+import logging
+from typing import Awaitable, Callable, Mapping
+
+# FIRSTPARTY
+from app.jobs.queue import Job, JobQueue
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[..., Awaitable[None]]
+
+
+class JobWorker(object):
+    """Пул задач asyncio, разбирающий очередь с ограничением параллелизма.
+
+    Атрибуты:
+        queue (JobQueue): Очередь задач.
+        handlers (Mapping[str, Handler]): Обработчики по имени задачи.
+        concurrency (int): Сколько задач выполняется одновременно.
+        retry_delay (float): Пауза перед первым повтором, далее
+            удваивается с каждой попыткой.
+        max_retry_delay (float): Верхняя граница паузы перед повтором.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        handlers: Mapping[str, Handler],
+        concurrency: int = 4,
+        retry_delay: float = 1.0,
+        max_retry_delay: float = 300.0,
+    ) -> None:
+        """Подготовить воркер; задачи запускает `start`."""
+        self.queue = queue
+        self.handlers = handlers
+        self.concurrency = concurrency
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.tasks: list[asyncio.Task] = []
+
+    async def start(self) -> None:
+        """Запустить воркеры."""
+        self.tasks = [
+            asyncio.create_task(self._run()) for _ in range(self.concurrency)
+        ]
+
+    async def stop(self) -> None:
+        """Остановить воркеры.
+
+        Прерванные задачи долговременной очереди будут забраны
+        повторно после таймаута видимости.
+        """
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+
+    async def _run(self) -> None:
+        while True:
+            job = await self.queue.get()
+            await self.execute(job)
+
+    async def execute(self, job: Job) -> None:
+        """Выполнить задачу, повторив ее с задержкой при ошибке."""
+        handler = self.handlers.get(job.name)
+        if handler is None:
+            logger.error(f'Нет обработчика для задачи {job.name}')
+            await self.queue.fail(job, 'unknown job')
+            return
+        job.attempts += 1
+        try:
+            await handler(**job.payload)
+        except Exception as e:
+            error = f'{type(e).__name__}: {e}'
+            if job.attempts >= job.max_attempts:
+                logger.error(
+                    f'Задача {job.name} упала после {job.attempts} '
+                    f'попыток: {error}'
+                )
+                await self.queue.fail(job, error)
+                return
+            delay = min(
+                self.max_retry_delay,
+                self.retry_delay * 2 ** (job.attempts - 1),
+            )
+            logger.warning(
+                f'Задача {job.name} упала ({error}), повтор через {delay}с'
+            )
+            await self.queue.retry(job, delay, error)
+        else:
+            await self.queue.ack(job)
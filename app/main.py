@@ -1,19 +1,81 @@
 """Точка входа в приложение."""
 
+# STDLIB
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 # THIRDPARTY
 from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
+from routes.analytics_route import router as analytics_router
+from routes.events_route import router as events_router
+from routes.order_route import router as order_router
 from routes.service_route import router as service_router
 from routes.user_route import router as user_router
 import uvicorn
 
-app = FastAPI()
+# FIRSTPARTY
+from app.jobs.handlers import HANDLERS
+from app.jobs.runtime import get_job_queue, get_order_archiver
+from app.jobs.worker import JobWorker
+from app.middlewares.compression import CompressionMiddleware
+from app.resources import resources
+from app.static_assets import HashedStaticFiles, static_assets
+from tg_bot.settings.settings import get_settings
+
+# Набор маршрутов зависит от режима бота, поэтому эта настройка
+# читается при импорте; очередь, воркер и архиватор создает lifespan
+webhook_mode = get_settings().BOT_MODE == 'webhook'
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Запуск и остановка фоновых компонентов приложения."""
+    settings = get_settings()
+    static_assets.build()
+    job_worker = JobWorker(
+        get_job_queue(), HANDLERS, concurrency=settings.JOB_CONCURRENCY
+    )
+    order_archiver = get_order_archiver()
+    await job_worker.start()
+    if settings.ARCHIVE_INTERVAL:
+        order_archiver.start(settings.ARCHIVE_INTERVAL)
+    if webhook_mode:
+        await start_webhook()
+    yield
+    if webhook_mode:
+        await stop_webhook()
+    await order_archiver.stop()
+    await job_worker.stop()
+    await resources.close()
+
 
-app.mount('/static', StaticFiles(directory='static'), name='static')
+app = FastAPI(lifespan=lifespan)
+
+app.add_middleware(CompressionMiddleware, minimum_size=500)
+
+app.mount(
+    '/static',
+    HashedStaticFiles(static_assets, directory='static'),
+    name='static',
+)
 
 
 app.include_router(user_router)
 app.include_router(service_router)
+app.include_router(analytics_router)
+app.include_router(events_router)
+app.include_router(order_router)
+
+if webhook_mode:
+    # Бот подключается только в режиме webhook, иначе его запускает
+    # отдельный процесс polling из tg_bot.bot_main
+    from routes.webhook_route import (
+        router as webhook_router,
+        start_webhook,
+        stop_webhook,
+    )
+
+    app.include_router(webhook_router)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,136 @@
+"""Сжатие ответов HTML и JSON."""
+
+# STDLIB
+import gzip
+from typing import Optional
+
+# THIRDPARTY
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    # THIRDPARTY
+    import brotli
+except ImportError:  # pragma: no cover - brotli необязателен
+    brotli = None
+
+ENCODING_BROTLI = 'br'
+ENCODING_GZIP = 'gzip'
+COMPRESSIBLE_TYPES = ('text/html', 'application/json')
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Выбрать лучшее поддерживаемое клиентом сжатие.
+
+    Параметры:
+        accept_encoding (str): Значение заголовка `Accept-Encoding`.
+
+    Возвращаемое значение:
+        Optional[str]: `br`, `gzip` или None, если сжимать не нужно.
+    """
+    accepted = set()
+    for item in accept_encoding.lower().split(','):
+        coding, _, params = item.strip().partition(';')
+        if params.replace(' ', '') in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+            continue
+        accepted.add(coding.strip())
+    if brotli is not None and ENCODING_BROTLI in accepted:
+        return ENCODING_BROTLI
+    if ENCODING_GZIP in accepted or '*' in accepted:
+        return ENCODING_GZIP
+    return None
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """Сжать данные выбранным алгоритмом."""
+    if encoding == ENCODING_BROTLI:
+        return brotli.compress(data, quality=5)
+    return gzip.compress(data, compresslevel=6)
+
+
+class CompressionMiddleware(object):
+    """ASGI-middleware, сжимающая ответы HTML и JSON.
+
+    Ответы меньше `minimum_size` байт, ответы других типов (статика,
+    SSE) и уже сжатые ответы передаются без изменений.
+
+    Атрибуты:
+        app (ASGIApp): Оборачиваемое приложение.
+        minimum_size (int): Минимальный размер тела для сжатия.
+        media_types (tuple[str, ...]): Сжимаемые типы содержимого.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 500,
+        media_types: tuple[str, ...] = COMPRESSIBLE_TYPES,
+    ) -> None:
+        """Обернуть приложение `app`."""
+        self.app = app
+        self.minimum_size = minimum_size
+        self.media_types = media_types
+
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        """Обработать запрос, сжав подходящий ответ."""
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(
+            Headers(scope=scope).get('accept-encoding', '')
+        )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder(object):
+    """Состояние сжатия одного ответа."""
+
+    def __init__(
+        self, middleware: CompressionMiddleware, encoding: str, send: Send
+    ) -> None:
+        self.middleware = middleware
+        self.encoding = encoding
+        self.original_send = send
+        self.start_message: Optional[Message] = None
+        self.passthrough = False
+        self.chunks: list[bytes] = []
+
+    def _is_compressible(self, headers: Headers) -> bool:
+        if 'content-encoding' in headers:
+            return False
+        content_type = headers.get('content-type', '').split(';')[0].strip()
+        return content_type in self.middleware.media_types
+
+    async def send(self, message: Message) -> None:
+        if message['type'] == 'http.response.start':
+            if self._is_compressible(Headers(raw=message['headers'])):
+                self.start_message = message
+            else:
+                self.passthrough = True
+                await self.original_send(message)
+            return
+        if self.passthrough or message['type'] != 'http.response.body':
+            await self.original_send(message)
+            return
+
+        self.chunks.append(message.get('body', b''))
+        if message.get('more_body', False):
+            return
+        start_message = self.start_message
+        if start_message is None:
+            raise RuntimeError('Тело ответа отправлено раньше заголовков')
+        body = b''.join(self.chunks)
+        headers = MutableHeaders(raw=start_message['headers'])
+        if len(body) >= self.middleware.minimum_size:
+            body = compress(body, self.encoding)
+            headers['Content-Encoding'] = self.encoding
+            headers['Content-Length'] = str(len(body))
+            headers.add_vary_header('Accept-Encoding')
+        await self.original_send(start_message)
+        await self.original_send({'type': 'http.response.body', 'body': body})
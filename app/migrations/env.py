@@ -3,6 +3,8 @@ from os.path import abspath, dirname
 import sys
 
 sys.path.insert(0, dirname(dirname(abspath(__file__))))
+# Корень репозитория: модули приложения импортируют друг друга через `app.`
+sys.path.insert(1, dirname(dirname(dirname(abspath(__file__)))))
 
 # STDLIB
 import asyncio
@@ -24,6 +26,13 @@ if config.config_file_name is not None:
 target_metadata = Base.metadata
 
 
+def include_object(object, name, type_, reflected, compare_to):
+    """Skip the FTS5 search index and its shadow tables on autogenerate."""
+    if type_ == "table" and name.startswith("users_fts"):
+        return False
+    return True
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
 
@@ -42,6 +51,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -49,7 +59,11 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection: Connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_object=include_object,
+    )
 
     with context.begin_transaction():
         context.run_migrations()
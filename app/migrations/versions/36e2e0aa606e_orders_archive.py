@@ -0,0 +1,47 @@
+"""Orders archive
+
+Revision ID: 36e2e0aa606e
+Revises: 5d1d5c4695de
+Create Date: 2025-02-19 09:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '36e2e0aa606e'
+down_revision: Union[str, None] = '5d1d5c4695de'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('order_services_archive',
+    sa.Column('order_id', sa.Integer(), nullable=False),
+    sa.Column('service_id', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('order_id', 'service_id')
+    )
+    op.create_table('orders_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('begin_at', sa.DateTime(), nullable=True),
+    sa.Column('ends_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('idempotency_key', sa.String(), nullable=True),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_orders_archive_user_id'), 'orders_archive', ['user_id'], unique=False)
+    op.create_index('ix_orders_is_active_begin_at', 'orders', ['is_active', 'begin_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_orders_is_active_begin_at', table_name='orders')
+    op.drop_index(op.f('ix_orders_archive_user_id'), table_name='orders_archive')
+    op.drop_table('orders_archive')
+    op.drop_table('order_services_archive')
@@ -0,0 +1,74 @@
+"""Analytics summaries
+
+Revision ID: 3c9d1f6e2a41
+Revises: a75e7d84185b
+Create Date: 2025-02-03 12:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9d1f6e2a41'
+down_revision: Union[str, None] = 'a75e7d84185b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Заполнение сводок по уже существующим заказам, как в
+# AnalyticsDAL.rebuild: выручка считается по текущим ценам услуг
+BACKFILL = (
+    """
+    INSERT INTO daily_service_stats
+        (day, service_id, orders_count, active_count, revenue)
+    SELECT date(coalesce(orders.begin_at, orders.created_at)),
+           order_services.service_id,
+           count(*),
+           sum(CASE WHEN orders.is_active THEN 1 ELSE 0 END),
+           coalesce(sum(services.service_cost), 0)
+    FROM orders
+    JOIN order_services ON order_services.order_id = orders.id
+    LEFT JOIN services ON services.id = order_services.service_id
+    GROUP BY date(coalesce(orders.begin_at, orders.created_at)),
+             order_services.service_id
+    """,
+    """
+    INSERT INTO user_order_stats (user_id, orders_count, revenue)
+    SELECT orders.user_id,
+           count(DISTINCT orders.id),
+           coalesce(sum(services.service_cost), 0)
+    FROM orders
+    LEFT JOIN order_services ON order_services.order_id = orders.id
+    LEFT JOIN services ON services.id = order_services.service_id
+    GROUP BY orders.user_id
+    """,
+)
+
+
+def upgrade() -> None:
+    op.create_table('daily_service_stats',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('service_id', sa.Integer(), nullable=False),
+    sa.Column('orders_count', sa.Integer(), nullable=False),
+    sa.Column('active_count', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('day', 'service_id')
+    )
+    op.create_table('user_order_stats',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('orders_count', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    op.create_index(op.f('ix_user_order_stats_revenue'), 'user_order_stats', ['revenue'], unique=False)
+    for statement in BACKFILL:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_user_order_stats_revenue'), table_name='user_order_stats')
+    op.drop_table('user_order_stats')
+    op.drop_table('daily_service_stats')
@@ -0,0 +1,28 @@
+"""Orders idempotency key
+
+Revision ID: 5d1d5c4695de
+Revises: 5f1a9c3e7b22
+Create Date: 2025-02-18 10:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d1d5c4695de'
+down_revision: Union[str, None] = '5f1a9c3e7b22'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('orders', sa.Column('idempotency_key', sa.String(), nullable=True))
+    op.create_index(op.f('ix_orders_idempotency_key'), 'orders', ['idempotency_key'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_orders_idempotency_key'), table_name='orders')
+    op.drop_column('orders', 'idempotency_key')
@@ -0,0 +1,80 @@
+"""Users search index
+
+Revision ID: 8b2e4a7c9d10
+Revises: 3c9d1f6e2a41
+Create Date: 2025-02-10 18:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b2e4a7c9d10'
+down_revision: Union[str, None] = '3c9d1f6e2a41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SQLITE_UPGRADE = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS users_fts USING fts5(
+        username, first_name, last_name,
+        content='users', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS users_fts_ai AFTER INSERT ON users BEGIN
+        INSERT INTO users_fts(rowid, username, first_name, last_name)
+        VALUES (new.id, new.username, new.first_name, new.last_name);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS users_fts_ad AFTER DELETE ON users BEGIN
+        INSERT INTO users_fts(users_fts, rowid, username, first_name,
+                              last_name)
+        VALUES ('delete', old.id, old.username, old.first_name,
+                old.last_name);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS users_fts_au AFTER UPDATE ON users BEGIN
+        INSERT INTO users_fts(users_fts, rowid, username, first_name,
+                              last_name)
+        VALUES ('delete', old.id, old.username, old.first_name,
+                old.last_name);
+        INSERT INTO users_fts(rowid, username, first_name, last_name)
+        VALUES (new.id, new.username, new.first_name, new.last_name);
+    END
+    """,
+    "INSERT INTO users_fts(users_fts) VALUES ('rebuild')",
+)
+
+POSTGRESQL_UPGRADE = (
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    """
+    CREATE INDEX IF NOT EXISTS ix_users_search_trgm ON users
+    USING gin (lower(concat_ws(' ', username, first_name, last_name))
+               gin_trgm_ops)
+    """,
+)
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        statements = POSTGRESQL_UPGRADE
+    else:
+        statements = SQLITE_UPGRADE
+    for statement in statements:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('DROP INDEX IF EXISTS ix_users_search_trgm')
+        return
+    op.execute('DROP TRIGGER IF EXISTS users_fts_au')
+    op.execute('DROP TRIGGER IF EXISTS users_fts_ad')
+    op.execute('DROP TRIGGER IF EXISTS users_fts_ai')
+    op.execute('DROP TABLE IF EXISTS users_fts')
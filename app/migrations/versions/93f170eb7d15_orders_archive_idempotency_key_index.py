@@ -0,0 +1,26 @@
+"""Orders archive idempotency key index
+
+Revision ID: 93f170eb7d15
+Revises: 698c19a7bb0e
+Create Date: 2025-02-21 10:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '93f170eb7d15'
+down_revision: Union[str, None] = '698c19a7bb0e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f('ix_orders_archive_idempotency_key'), 'orders_archive', ['idempotency_key'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_orders_archive_idempotency_key'), table_name='orders_archive')
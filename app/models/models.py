@@ -1,10 +1,21 @@
 """Описание моделей базы данных."""
 
 # STDLIB
-from datetime import datetime
+from datetime import date, datetime
 
 # THIRDPARTY
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, Table
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Table,
+    Text,
+)
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
@@ -90,6 +101,10 @@ class OrderModel(Base):
         nullable=False,
     )
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
+    # Ключ идемпотентности клиента: повтор запроса не создает дубль
+    idempotency_key: Mapped[str] = mapped_column(
+        String, nullable=True, unique=True, index=True
+    )
 
     # Связь с пользователем
     user: Mapped[UserModel] = relationship(
@@ -100,3 +115,115 @@ class OrderModel(Base):
     services: Mapped[list[ServiceModel]] = relationship(
         'ServiceModel', secondary=order_services, back_populates='orders'
     )
+
+    __table_args__ = (
+        Index('ix_orders_is_active_begin_at', 'is_active', 'begin_at'),
+    )
+
+
+# Архив связей заказов с услугами. Внешних ключей нет: архив не должен
+# мешать удалению услуг и пользователей из рабочих таблиц
+order_services_archive = Table(
+    'order_services_archive',
+    Base.metadata,
+    Column('order_id', Integer, primary_key=True),
+    Column('service_id', Integer, primary_key=True),
+)
+
+
+class OrderArchiveModel(Base):
+    """Архив завершенных заказов.
+
+    Неактивные заказы старше `ARCHIVE_AFTER_DAYS` переносятся сюда из
+    `orders` фоновой задачей, ID заказов сохраняются. Рабочая таблица
+    остается маленькой, а история доступна через `OrderArchiveDAL`.
+    """
+
+    __tablename__ = 'orders_archive'
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    user_id: Mapped[int] = mapped_column(nullable=False, index=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    begin_at: Mapped[datetime] = mapped_column(DateTime, nullable=True)
+    ends_at: Mapped[datetime] = mapped_column(DateTime, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    is_active: Mapped[bool] = mapped_column(Boolean, default=False)
+    # Повтор запроса с ключом архивного заказа тоже не создает дубль
+    idempotency_key: Mapped[str] = mapped_column(
+        String, nullable=True, index=True
+    )
+    archived_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.now, nullable=False
+    )
+
+
+class DailyServiceStatsModel(Base):
+    """Сводка заказов по услугам за день.
+
+    Обновляется инкрементально при создании заказа и смене `is_active`,
+    полностью пересчитывается командой `rebuild-analytics`. ID услуги
+    хранится без внешнего ключа, чтобы история переживала удаление услуги.
+    """
+
+    __tablename__ = 'daily_service_stats'
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    service_id: Mapped[int] = mapped_column(primary_key=True)
+    orders_count: Mapped[int] = mapped_column(default=0)
+    active_count: Mapped[int] = mapped_column(default=0)
+    revenue: Mapped[int] = mapped_column(default=0)
+
+
+class UserOrderStatsModel(Base):
+    """Сводка заказов по пользователям."""
+
+    __tablename__ = 'user_order_stats'
+
+    user_id: Mapped[int] = mapped_column(primary_key=True)
+    orders_count: Mapped[int] = mapped_column(default=0)
+    revenue: Mapped[int] = mapped_column(default=0, index=True)
+
+
+class JobModel(Base):
+    """Модель отложенной задачи для очереди в БД."""
+
+    __tablename__ = 'jobs'
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str] = mapped_column(String, nullable=False)
+    payload: Mapped[str] = mapped_column(Text, nullable=False)
+    status: Mapped[str] = mapped_column(String, default='pending')
+    attempts: Mapped[int] = mapped_column(default=0)
+    max_attempts: Mapped[int] = mapped_column(nullable=False)
+    run_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.now, nullable=False
+    )
+    locked_at: Mapped[datetime] = mapped_column(DateTime, nullable=True)
+    last_error: Mapped[str] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.now, nullable=False
+    )
+
+    __table_args__ = (Index('ix_jobs_status_run_at', 'status', 'run_at'),)
+
+
+class DataMigrationModel(Base):
+    """Контрольная точка онлайн-миграции данных.
+
+    Обновляется в той же транзакции, что и пачка строк, поэтому
+    прерванная миграция продолжается ровно с места остановки.
+    """
+
+    __tablename__ = 'data_migrations'
+
+    name: Mapped[str] = mapped_column(String, primary_key=True)
+    last_id: Mapped[int] = mapped_column(default=0)
+    processed: Mapped[int] = mapped_column(default=0)
+    changed: Mapped[int] = mapped_column(default=0)
+    started_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.now, nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.now, onupdate=datetime.now, nullable=False
+    )
+    finished_at: Mapped[datetime] = mapped_column(DateTime, nullable=True)
@@ -0,0 +1,33 @@
+"""Легкие модели строк для отображения списков.
+
+ORM-объект несет состояние сессии, коллекции связей и запись в identity
+map, хотя странице списка нужны только несколько полей. Модели чтения -
+неизменяемые dataclass со `__slots__`, заполняемые из выборки только
+нужных колонок (см. `BaseDAL.get_all_rows`). Порядок полей задает
+порядок колонок в запросе.
+"""
+
+# STDLIB
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True, slots=True)
+class UserRow(object):
+    """Юзер в списке админ-панели."""
+
+    id: int
+    username: Optional[str]
+    first_name: Optional[str]
+    last_name: Optional[str]
+    is_admin: bool
+
+
+@dataclass(frozen=True, slots=True)
+class ServiceRow(object):
+    """Услуга в списке админ-панели."""
+
+    id: int
+    service_name: str
+    service_cost: int
+    service_time: int
@@ -0,0 +1,50 @@
+"""Общие ресурсы приложения, создаваемые при первом обращении."""
+
+# STDLIB
+from functools import cached_property
+from typing import TYPE_CHECKING
+
+# FIRSTPARTY
+from app.static_assets import static_assets
+from tg_bot.settings.settings import get_settings
+
+if TYPE_CHECKING:
+    # THIRDPARTY
+    from aiogram import Bot
+    from fastapi.templating import Jinja2Templates
+
+
+class Resources(object):
+    """Ленивый контейнер шаблонов и бота уведомлений.
+
+    При импорте ничего не создается: шаблоны Jinja собираются при первом
+    рендеринге страницы, а aiogram импортируется, только когда приложению
+    нужно отправить сообщение. Это сокращает время запуска процесса.
+    """
+
+    @cached_property
+    def templates(self) -> 'Jinja2Templates':
+        """Шаблоны страниц админ-панели."""
+        # THIRDPARTY
+        from fastapi.templating import Jinja2Templates
+
+        templates = Jinja2Templates(directory='templates')
+        templates.env.globals['static_url'] = static_assets.url
+        return templates
+
+    @cached_property
+    def bot(self) -> 'Bot':
+        """Бот для отправки уведомлений из приложения."""
+        # THIRDPARTY
+        from aiogram import Bot
+
+        return Bot(token=get_settings().TG_BOT_TOKEN)
+
+    async def close(self) -> None:
+        """Закрыть сессию бота, если он был создан."""
+        bot = self.__dict__.pop('bot', None)
+        if bot is not None:
+            await bot.session.close()
+
+
+resources = Resources()
@@ -0,0 +1,66 @@
+"""Маршруты дашбордов аналитики по заказам."""
+
+# STDLIB
+from datetime import date
+from typing import Optional
+
+# THIRDPARTY
+from fastapi import APIRouter, Query
+
+# FIRSTPARTY
+from app.DAL.AnalyticsDAL import AnalyticsDAL
+from app.database import ReadSessionDep
+from app.routes.base_route import access_denied, is_admin
+
+router = APIRouter()
+
+
+@router.get('/api/v1/analytics/revenue')
+async def get_revenue(
+    session: ReadSessionDep,
+    cur_user_id: int,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+):
+    """Общая выручка и количество заказанных услуг за период."""
+    if not await is_admin(cur_user_id, session):
+        return access_denied()
+    return await AnalyticsDAL.get_totals(session, date_from, date_to)
+
+
+@router.get('/api/v1/analytics/services')
+async def get_services_stats(
+    session: ReadSessionDep,
+    cur_user_id: int,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+):
+    """Заказы и выручка по услугам за период."""
+    if not await is_admin(cur_user_id, session):
+        return access_denied()
+    return await AnalyticsDAL.get_by_service(session, date_from, date_to)
+
+
+@router.get('/api/v1/analytics/daily')
+async def get_daily_stats(
+    session: ReadSessionDep,
+    cur_user_id: int,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+):
+    """Нагрузка и выручка по дням за период."""
+    if not await is_admin(cur_user_id, session):
+        return access_denied()
+    return await AnalyticsDAL.get_by_day(session, date_from, date_to)
+
+
+@router.get('/api/v1/analytics/top-customers')
+async def get_top_customers(
+    session: ReadSessionDep,
+    cur_user_id: int,
+    limit: int = Query(default=10, ge=1, le=100),
+):
+    """Пользователи с наибольшей суммой заказов."""
+    if not await is_admin(cur_user_id, session):
+        return access_denied()
+    return await AnalyticsDAL.get_top_customers(limit, session)
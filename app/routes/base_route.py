@@ -1,31 +1,42 @@
+"""Общие обработчики страниц админ-панели."""
+
 # STDLIB
 from http import HTTPStatus
+from typing import Type
 
 # THIRDPARTY
 from fastapi import Request
-from starlette.responses import JSONResponse
-from fastapi.templating import Jinja2Templates
+from starlette.responses import JSONResponse, RedirectResponse
 
 # FIRSTPARTY
-from app.DAL.BaseDAL import UserDAL
-from app.database import SessionDep
-
-templates = Jinja2Templates(directory='templates')
+from app.DAL.BaseDAL import BaseDAL, UserDAL
+from app.database import ReadSessionDep
+from app.resources import resources
 
 
 async def base_route(
-    request: Request ,
-    inst_dal,
-    cur_user_id,
-    html_temp,
-    session: SessionDep,
-    title
+    request: Request,
+    inst_dal: Type[BaseDAL],
+    cur_user_id: int,
+    html_temp: str,
+    session: ReadSessionDep,
+    title: str,
 ):
+    """Страница со списком записей `inst_dal` для администратора.
+
+    Параметры:
+        request (Request): Запрос к странице.
+        inst_dal (Type[BaseDAL]): DAL записей, которые выводит страница.
+        cur_user_id (int): ID текущего пользователя.
+        html_temp (str): Имя шаблона страницы.
+        session (ReadSessionDep): Сессия чтения базы данных.
+        title (str): Заголовок страницы.
+    """
     cur_user = await UserDAL.get_by_id(cur_user_id, session)
     if cur_user:
         if cur_user.is_admin:
-            insts = await inst_dal.get_all(session)
-            return templates.TemplateResponse(
+            insts = await inst_dal.get_all_rows(session)
+            return resources.templates.TemplateResponse(
                 html_temp,
                 {
                     'request': request,
@@ -39,3 +50,29 @@ async def base_route(
             content={'message': 'Access denied'},
             status_code=HTTPStatus.UNAUTHORIZED,
         )
+
+
+def done_response(request: Request, url: str):
+    """Ответ на успешное изменение из админ-панели.
+
+    Формы, отправленные скриптом с `Accept: application/json`, получают
+    короткий JSON: список на странице обновится по событию изменения без
+    повторной загрузки. Обычная отправка формы перенаправляется на `url`.
+    """
+    if 'application/json' in request.headers.get('accept', ''):
+        return JSONResponse(content={'message': 'ok'})
+    return RedirectResponse(url=url, status_code=HTTPStatus.MOVED_PERMANENTLY)
+
+
+async def is_admin(cur_user_id: int, session: ReadSessionDep) -> bool:
+    """Проверить, что текущий пользователь - администратор."""
+    cur_user = await UserDAL.get_by_id(cur_user_id, session)
+    return cur_user is not None and cur_user.is_admin
+
+
+def access_denied() -> JSONResponse:
+    """Ответ для пользователя без прав администратора."""
+    return JSONResponse(
+        content={'message': 'Access denied'},
+        status_code=HTTPStatus.UNAUTHORIZED,
+    )
@@ -0,0 +1,81 @@
+"""Поток событий изменений для живого обновления админ-панели."""
+
+# STDLIB
+import asyncio
+from http import HTTPStatus
+from typing import Annotated, AsyncIterator, Optional
+
+# THIRDPARTY
+from fastapi import APIRouter, Header, Request
+from starlette.responses import JSONResponse, StreamingResponse
+
+# FIRSTPARTY
+from app.DAL.BaseDAL import UserDAL
+from app.events import broker
+
+router = APIRouter()
+
+HEARTBEAT_INTERVAL = 15
+
+
+async def event_stream(
+    request: Request, queue: asyncio.Queue
+) -> AsyncIterator[str]:
+    """Отдавать события из очереди подписчика, пока клиент подключен."""
+    try:
+        yield 'retry: 3000\n\n'
+        while True:
+            try:
+                event = await asyncio.wait_for(
+                    queue.get(), timeout=HEARTBEAT_INTERVAL
+                )
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    break
+                yield ': ping\n\n'
+                continue
+            if event is None:
+                yield 'event: reset\ndata: {}\n\n'
+                break
+            yield event.to_sse()
+    finally:
+        broker.unsubscribe(queue)
+
+
+@router.get('/api/v1/events')
+async def stream_events(
+    request: Request,
+    cur_user_id: int,
+    last_event_id: Optional[str] = None,
+    last_event_id_header: Annotated[
+        Optional[str], Header(alias='Last-Event-ID')
+    ] = None,
+):
+    """Поток Server-Sent Events об изменениях пользователей и услуг.
+
+    Параметры:
+        request (Request): Объект запроса.
+        cur_user_id (int): ID текущего пользователя.
+        last_event_id (Optional[str]): ID последнего события, которое
+            видела страница; передается при первом подключении.
+        last_event_id_header (Optional[str]): То же значение из заголовка,
+            его отправляет браузер при переподключении.
+
+    Возвращаемое значение:
+        StreamingResponse: Поток событий `change` и `reset`.
+        JSONResponse: Ответ с сообщением об ошибке, если доступ запрещен.
+    """
+    # Сессия берется и закрывается внутри DAL, а не держится
+    # открытой на все время жизни потока
+    cur_user = await UserDAL.get_by_id(cur_user_id)
+    if cur_user is None or not cur_user.is_admin:
+        return JSONResponse(
+            content={'message': 'Access denied'},
+            status_code=HTTPStatus.UNAUTHORIZED,
+        )
+    queue = broker.subscribe(last_event_id_header or last_event_id)
+    return StreamingResponse(
+        event_stream(request, queue),
+        media_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
@@ -0,0 +1,200 @@
+"""Маршруты для создания заказов и просмотра их истории."""
+
+# STDLIB
+from collections import Counter
+from http import HTTPStatus
+from typing import Annotated, Optional, Union
+
+# THIRDPARTY
+from fastapi import APIRouter, Header, Query
+from fastapi.encoders import jsonable_encoder
+from starlette.responses import JSONResponse
+
+# FIRSTPARTY
+from app.DAL.BaseDAL import UserDAL
+from app.DAL.OrderArchiveDAL import OrderArchiveDAL
+from app.DAL.OrderDAL import OrderDAL
+from app.database import ReadSessionDep, SessionDep
+from app.jobs.runtime import get_order_archiver
+from app.models.models import OrderArchiveModel, OrderModel
+from app.routes.base_route import access_denied, is_admin
+from app.schemas.schemas import OrderCreateSchema
+
+router = APIRouter()
+
+HISTORY_PAGE_SIZE = 50
+
+
+def order_response(
+    order: Union[OrderModel, OrderArchiveModel],
+    service_ids: list[int],
+    status_code: int,
+) -> JSONResponse:
+    """Ответ с данными заказа."""
+    return JSONResponse(
+        content=jsonable_encoder(
+            {
+                'id': order.id,
+                'user_id': order.user_id,
+                'service_ids': sorted(service_ids),
+                'begin_at': order.begin_at,
+                'ends_at': order.ends_at,
+                'is_active': order.is_active,
+            }
+        ),
+        status_code=status_code,
+    )
+
+
+async def replay_response(
+    order: Union[OrderModel, OrderArchiveModel],
+    data: OrderCreateSchema,
+    session: SessionDep,
+) -> JSONResponse:
+    """Ответ на повтор запроса с уже использованным ключом."""
+    service_ids = await OrderArchiveDAL.get_service_ids(order.id, session)
+    if order.user_id != data.user_id or set(service_ids) != set(
+        data.service_ids
+    ):
+        return JSONResponse(
+            content={
+                'message': 'Ключ идемпотентности использован другим заказом'
+            },
+            status_code=HTTPStatus.CONFLICT,
+        )
+    return order_response(order, service_ids, HTTPStatus.OK)
+
+
+@router.post('/api/v1/orders')
+async def add_order(
+    order: OrderCreateSchema,
+    session: SessionDep,
+    idempotency_key: Annotated[Optional[str], Header(max_length=255)] = None,
+):
+    """Создает заказ пользователя на несколько услуг.
+
+    Услуги проверяются одним запросом, заказ и его строки в
+    `order_services` записываются в одной транзакции вместе со
+    сводками аналитики. Клиент может передать заголовок
+    `Idempotency-Key`: повтор запроса с тем же ключом не создает
+    новый заказ и ничего не пишет в БД, а возвращает уже созданный,
+    в том числе перенесенный в архив.
+
+    Параметры:
+        order (OrderCreateSchema): Данные заказа.
+        session (SessionDep): Сессия базы данных для выполнения операций.
+        idempotency_key (Optional[str]): Ключ идемпотентности запроса.
+
+    Возвращаемое значение:
+        JSONResponse: Данные заказа со статусом 201 для нового заказа
+        и 200 для повтора; 404, если пользователя нет; 422 со списком
+        повторяющихся или несуществующих услуг; 409, если ключ уже
+        использован для другого заказа.
+    """
+    duplicates = sorted(
+        service_id
+        for service_id, count in Counter(order.service_ids).items()
+        if count > 1
+    )
+    if duplicates:
+        return JSONResponse(
+            content={
+                'message': 'Услуги повторяются',
+                'service_ids': duplicates,
+            },
+            status_code=HTTPStatus.UNPROCESSABLE_ENTITY,
+        )
+    if idempotency_key is not None:
+        # Ключ мог остаться у заказа, который уже перенесен в архив
+        existing = await OrderDAL.get_by_idempotency_key(
+            idempotency_key, session
+        ) or await OrderArchiveDAL.get_by_idempotency_key(
+            idempotency_key, session
+        )
+        if existing is not None:
+            return await replay_response(existing, order, session)
+
+    if await UserDAL.get_by_id(order.user_id, session) is None:
+        return JSONResponse(
+            content={'message': 'Пользователь не найден'},
+            status_code=HTTPStatus.NOT_FOUND,
+        )
+    service_costs = await OrderDAL.get_service_costs(
+        order.service_ids, session
+    )
+    missing = sorted(set(order.service_ids) - service_costs.keys())
+    if missing:
+        return JSONResponse(
+            content={'message': 'Услуги не найдены', 'service_ids': missing},
+            status_code=HTTPStatus.UNPROCESSABLE_ENTITY,
+        )
+
+    new_order, created = await OrderDAL.add_one_order(
+        order, service_costs, session, idempotency_key
+    )
+    if not created:
+        return await replay_response(new_order, order, session)
+    return order_response(new_order, list(service_costs), HTTPStatus.CREATED)
+
+
+@router.post('/api/v1/orders/{order_id}/status')
+async def set_order_status(
+    order_id: int, is_active: bool, session: SessionDep, cur_user_id: int
+):
+    """Завершает или возобновляет заказ.
+
+    Доступно только администратору. Сводки аналитики обновляются
+    в той же транзакции; завершенные заказы со временем переносит
+    в архив фоновая задача.
+
+    Параметры:
+        order_id (int): ID заказа.
+        is_active (bool): Новый статус заказа.
+        session (SessionDep): Сессия базы данных для выполнения операций.
+        cur_user_id (int): ID текущего пользователя.
+
+    Возвращаемое значение:
+        JSONResponse: Данные заказа; 404, если заказа нет
+        в рабочей таблице.
+    """
+    if not await is_admin(cur_user_id, session):
+        return access_denied()
+    order = await OrderDAL.set_active(order_id, is_active, session)
+    if order is None:
+        return JSONResponse(
+            content={'message': 'Заказ не найден'},
+            status_code=HTTPStatus.NOT_FOUND,
+        )
+    service_ids = list(await OrderDAL.get_service_ids(order_id, session))
+    return order_response(order, service_ids, HTTPStatus.OK)
+
+
+@router.get('/api/v1/orders/history')
+async def get_order_history(
+    session: ReadSessionDep,
+    cur_user_id: int,
+    user_id: int,
+    before_id: Optional[int] = None,
+    limit: int = Query(HISTORY_PAGE_SIZE, ge=1, le=HISTORY_PAGE_SIZE),
+):
+    """История заказов юзера вместе с архивными.
+
+    Юзер видит свои заказы, администратор - заказы любого юзера.
+    Для следующей страницы передается `before_id` - ID последнего
+    полученного заказа.
+    """
+    if cur_user_id != user_id and not await is_admin(cur_user_id, session):
+        return access_denied()
+    return jsonable_encoder(
+        await OrderArchiveDAL.get_user_orders(
+            user_id, limit, session, before_id
+        )
+    )
+
+
+@router.get('/api/v1/orders/archive/stats')
+async def get_archive_stats(session: ReadSessionDep, cur_user_id: int):
+    """Метрики архивации заказов в этом процессе приложения."""
+    if not await is_admin(cur_user_id, session):
+        return access_denied()
+    return jsonable_encoder(get_order_archiver().stats)
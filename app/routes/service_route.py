@@ -5,35 +5,35 @@ from http import HTTPStatus
 
 # THIRDPARTY
 from fastapi import APIRouter, Form, Request
-from fastapi.templating import Jinja2Templates
-from starlette.responses import JSONResponse, RedirectResponse
+from starlette.responses import JSONResponse
 
 # FIRSTPARTY
 from app.DAL.BaseDAL import UserDAL
 from app.DAL.ServiceDAL import ServiceDAL
-from app.database import SessionDep
+from app.database import ReadSessionDep, SessionDep
+from app.jobs.runtime import enqueue
 from app.models.models import ServiceModel
-from tg_bot.settings.settings import BotSettings
-from app.routes.base_route import base_route
+from app.resources import resources
+from app.routes.base_route import base_route, done_response
 
 router = APIRouter()
 
-templates = Jinja2Templates(directory='templates')
-
-bot_settings = BotSettings()
-
 
 @router.get('/api/v1/services')
 async def get_services(
-    request: Request, session: SessionDep, cur_user_id: int
+    request: Request, session: ReadSessionDep, cur_user_id: int
 ):
     """Получает список сервисов для администратора."""
-    answer = await base_route(request, ServiceDAL, cur_user_id, 'services.html',session, 'Услуги')
+    answer = await base_route(
+        request, ServiceDAL, cur_user_id, 'services.html', session, 'Услуги'
+    )
     return answer
 
 
 @router.get('/api/v1/services/add')
-async def add_service(request: Request, session: SessionDep, cur_user_id: int):
+async def add_service(
+    request: Request, session: ReadSessionDep, cur_user_id: int
+):
     """Отправляет форму для добавления нового сервиса.
 
     Эта функция обрабатывает GET-запрос для отображения страницы с формой
@@ -42,14 +42,14 @@ async def add_service(request: Request, session: SessionDep, cur_user_id: int):
 
     Параметры:
         request (Request): Объект запроса для передачи в шаблон.
-        session (SessionDep): Сессия базы данных для выполнения запросов.
+        session (ReadSessionDep): Сессия базы данных для выполнения запросов.
         cur_user_id (int): ID текущего пользователя, выполняющего запрос.
 
     Возвращаемое значение:
         TemplateResponse: Возвращает HTML-страницу с формой для добавления
         нового сервиса.
     """
-    return templates.TemplateResponse(
+    return resources.templates.TemplateResponse(
         'service_add.html', {'request': request, 'cur_user_id': cur_user_id}
     )
 
@@ -70,6 +70,7 @@ async def add_one_service(
     администратора. Если текущий пользователь не является администратором,
     возвращается сообщение о запрете доступа. В случае успешного добавления
     нового сервиса происходит перенаправление на список сервисов.
+    Администраторы получают уведомление фоновой задачей после коммита.
 
     Параметры:
         request (Request): Объект запроса для передачи в шаблон.
@@ -93,11 +94,14 @@ async def add_one_service(
                 service_cost=service_cost,
                 service_time=service_time,
             )
+            await enqueue(
+                'notify_admins',
+                session,
+                text=f'Добавлена услуга «{service_name}»',
+            )
             await ServiceDAL.add_one_service(new_service, session)
             url = f'/api/v1/services?cur_user_id={cur_user_id}'
-            return RedirectResponse(
-                url=url, status_code=HTTPStatus.MOVED_PERMANENTLY
-            )
+            return done_response(request, url)
     else:
         return JSONResponse(
             content={'message': 'Access denied'},
@@ -107,7 +111,10 @@ async def add_one_service(
 
 @router.get('/api/v1/services/edit/{service_id}')
 async def edit_service(
-    request: Request, service_id: int, cur_user_id: int, session: SessionDep,
+    request: Request,
+    service_id: int,
+    cur_user_id: int,
+    session: ReadSessionDep,
 ):
     """Страничка для редактирования услуги.
 
@@ -115,16 +122,16 @@ async def edit_service(
         request (Request): Объект запроса для передачи в шаблон.
         service_id (int): ID услуги.
         cur_user_id (int): ID текущего пользователя, выполняющего запрос.
-        session (SessionDep): Сессия базы данных для выполнения операций.
+        session (ReadSessionDep): Сессия базы данных для выполнения операций.
 
     Возвращаемое значение:
-        templates.TemplateResponse() - html страница с формой редактирования.
+        TemplateResponse - html страница с формой редактирования.
         JSONResponse - Ответ с ошибкой для юзера без админ статуса.
     """
     service = await ServiceDAL.get_by_id(service_id, session)
     cur_user = await UserDAL.get_by_id(cur_user_id, session)
-    if service and cur_user.is_admin:
-        return templates.TemplateResponse(
+    if service and cur_user and cur_user.is_admin:
+        return resources.templates.TemplateResponse(
             'edit_service.html',
             {
                 'request': request,
@@ -150,16 +157,41 @@ async def update_service(
     servicecost: int = Form(...),
     servicetime: int = Form(...),
 ):
+    """Изменение услуги.
+
+    Параметры:
+        request (Request): Объект запроса.
+        session (SessionDep): Сессия базы данных для выполнения операций.
+        service_id (int): ID услуги.
+        cur_user_id (int): ID текущего пользователя, выполняющего запрос.
+        servicename (str): Новое наименование услуги.
+        servicecost (int): Новая стоимость услуги.
+        servicetime (int): Новая продолжительность услуги.
+
+    Возвращаемое значение:
+        Ответ `done_response` после успешного изменения.
+        JSONResponse - Ответ с ошибкой для юзера без админ статуса.
+    """
     service = await ServiceDAL.get_by_id(service_id, session)
     cur_user = await UserDAL.get_by_id(cur_user_id, session)
     if service and cur_user:
         if cur_user.is_admin:
-            service.service_name = servicename
-            service.service_cost = servicecost
-            service.service_time = servicetime
-            await session.commit()
+            await enqueue(
+                'notify_admins',
+                session,
+                text=f'Изменена услуга «{servicename}»',
+            )
+            await ServiceDAL.update_one(
+                service,
+                {
+                    'service_name': servicename,
+                    'service_cost': servicecost,
+                    'service_time': servicetime,
+                },
+                session,
+            )
             url = f'/api/v1/services?cur_user_id={cur_user_id}'
-            return RedirectResponse(url=url, status_code=HTTPStatus.MOVED_PERMANENTLY)
+            return done_response(request, url)
     else:
         return JSONResponse(
             content={'message': 'Access denied'},
@@ -169,18 +201,35 @@ async def update_service(
 
 @router.post('/api/v1/services/delete/{service_id}')
 async def delete_service(
+    request: Request,
     session: SessionDep,
     service_id: int,
     cur_user_id: int,
 ):
+    """Удаление услуги.
+
+    Параметры:
+        request (Request): Объект запроса.
+        session (SessionDep): Сессия базы данных для выполнения операций.
+        service_id (int): ID услуги.
+        cur_user_id (int): ID текущего пользователя, выполняющего запрос.
+
+    Возвращаемое значение:
+        Ответ `done_response` после успешного изменения.
+        JSONResponse - Ответ с ошибкой для юзера без админ статуса.
+    """
     service = await ServiceDAL.get_by_id(service_id, session)
     cur_user = await UserDAL.get_by_id(cur_user_id, session)
     if service and cur_user:
         if cur_user.is_admin:
-            await session.delete(service)
-            await session.commit()
+            await enqueue(
+                'notify_admins',
+                session,
+                text=f'Удалена услуга «{service.service_name}»',
+            )
+            await ServiceDAL.delete_one(service, session)
             url = f'/api/v1/services?cur_user_id={cur_user_id}'
-            return RedirectResponse(url=url, status_code=HTTPStatus.MOVED_PERMANENTLY)
+            return done_response(request, url)
     else:
         return JSONResponse(
             content={'message': 'Access denied'},
@@ -5,22 +5,21 @@ from http import HTTPStatus
 from typing import Optional, Union
 
 # THIRDPARTY
-from fastapi import APIRouter, Form, Request
-from fastapi.templating import Jinja2Templates
-from starlette.responses import JSONResponse, RedirectResponse
+from fastapi import APIRouter, Form, Query, Request
+from starlette.responses import JSONResponse
 
 # FIRSTPARTY
 from app.DAL.BaseDAL import UserDAL
-from app.database import SessionDep
+from app.DAL.UserSearchDAL import UserSearchDAL
+from app.database import ReadSessionDep, SessionDep
+from app.jobs.runtime import enqueue
 from app.schemas.schemas import UserCreateSchema
-from tg_bot.settings.settings import BotSettings
-from app.routes.base_route import base_route
+from app.resources import resources
+from app.routes.base_route import base_route, done_response
 
 router = APIRouter()
 
-templates = Jinja2Templates(directory='templates')
-
-bot_settings = BotSettings()
+SEARCH_PAGE_SIZE = 50
 
 
 @router.post('/api/v1/users')
@@ -34,6 +33,10 @@ async def add_user(
     о том, что пользователь уже зарегистрирован. В случае успешной регистрации
     возвращаются данные нового пользователя.
 
+    Приветствие пользователю и уведомление администраторам отправляют
+    фоновые задачи: они ставятся в транзакции регистрации и уходят только
+    после ее коммита, а ответ не ждет Telegram.
+
     Параметры:
         user (UserCreateSchema): Схема данных для создания нового пользователя.
         session (SessionDep): Сессия базы данных для выполнения операций.
@@ -46,7 +49,17 @@ async def add_user(
             400 и данные существующего пользователя.
     """
     cur_user = await UserDAL.get_by_id(user.id, session)
+    full_name = ' '.join(
+        name for name in (user.last_name, user.first_name) if name
+    )
+    welcome = f'Привет! {full_name} Добро пожаловать на мой бот.'
     if cur_user is None:
+        await enqueue('send_message', session, chat_id=user.id, text=welcome)
+        await enqueue(
+            'notify_admins',
+            session,
+            text=f'Новый пользователь: {user.username or user.id}',
+        )
         new_user = await UserDAL.add_one_user(user, session)
         return {
             'status': 200,
@@ -57,6 +70,7 @@ async def add_user(
             'last_name': new_user.last_name,
         }
     else:
+        await enqueue('send_message', chat_id=user.id, text=welcome)
         return {
             'status': 400,
             'message': 'Пользователь уже зарегистрирован',
@@ -68,14 +82,63 @@ async def add_user(
 
 
 @router.get('/api/v1/users')
-async def get_users(request: Request, session: SessionDep, cur_user_id: int):
+async def get_users(
+    request: Request, session: ReadSessionDep, cur_user_id: int
+):
     """Получает список пользователей для администраторов."""
-    answer = await base_route(request, UserDAL, cur_user_id, 'index.html', session, 'Пользователи')
+    answer = await base_route(
+        request, UserDAL, cur_user_id, 'index.html', session, 'Пользователи'
+    )
     return answer
 
+
+@router.get('/api/v1/users/search')
+async def search_users(
+    request: Request,
+    session: ReadSessionDep,
+    cur_user_id: int,
+    q: str = '',
+    page: int = Query(default=1, ge=1),
+):
+    """Ищет пользователей по нику, имени и фамилии.
+
+    Параметры:
+        request (Request): Объект запроса для передачи в шаблон.
+        session (ReadSessionDep): Сессия базы данных для выполнения запросов.
+        cur_user_id (int): ID текущего юзера, который выполняет операцию.
+        q (str): Строка поиска.
+        page (int): Номер страницы результатов.
+
+    Возвращаемое значение:
+        TemplateResponse: Страница пользователей с результатами поиска.
+        JSONResponse: Ответ с сообщением об ошибке, если доступ запрещен.
+    """
+    cur_user = await UserDAL.get_by_id(cur_user_id, session)
+    if cur_user is None or not cur_user.is_admin:
+        return JSONResponse(
+            content={'message': 'Access denied'},
+            status_code=HTTPStatus.UNAUTHORIZED,
+        )
+    users, has_next = await UserSearchDAL.search(
+        q, page, SEARCH_PAGE_SIZE, session
+    )
+    return resources.templates.TemplateResponse(
+        'index.html',
+        {
+            'request': request,
+            'title': 'Поиск пользователей',
+            'data': users,
+            'cur_user_id': cur_user_id,
+            'q': q,
+            'page': page,
+            'has_next': has_next,
+        },
+    )
+
+
 @router.get('/api/v1/users/edit/{user_id}')
 async def edit_user(
-    request: Request, user_id: int, session: SessionDep, cur_user_id: int
+    request: Request, user_id: int, session: ReadSessionDep, cur_user_id: int
 ):
     """Обрабатывает запрос для редактирования информации о пользователе.
 
@@ -86,7 +149,7 @@ async def edit_user(
     Параметры:
         request (Request): Объект запроса для передачи в шаблон.
         user_id (int): ID юзера, информацию которого нужно отредактировать.
-        session (SessionDep): Сессия базы данных для выполнения запросов.
+        session (ReadSessionDep): Сессия базы данных для выполнения запросов.
         cur_user_id (int): ID текущего юзера, который выполняет операцию.
 
     Возвращаемое значение:
@@ -95,8 +158,8 @@ async def edit_user(
     """
     user = await UserDAL.get_by_id(user_id, session)
     cur_user = await UserDAL.get_by_id(cur_user_id, session)
-    if user and cur_user.is_admin:
-        return templates.TemplateResponse(
+    if user and cur_user and cur_user.is_admin:
+        return resources.templates.TemplateResponse(
             'edit_user.html',
             {
                 'request': request,
@@ -143,13 +206,18 @@ async def update_user(
     cur_user = await UserDAL.get_by_id(cur_user_id, session)
     if user and cur_user:
         if cur_user.is_admin:
-            user.username = username
-            user.first_name = user_firstname
-            user.last_name = user_lastname
-            user.is_admin = is_admin
-            await session.commit()
+            await UserDAL.update_one(
+                user,
+                {
+                    'username': username,
+                    'first_name': user_firstname,
+                    'last_name': user_lastname,
+                    'is_admin': is_admin,
+                },
+                session,
+            )
             url = f'/api/v1/users?cur_user_id={cur_user_id}'
-            return RedirectResponse(url=url, status_code=301)
+            return done_response(request, url)
     else:
         return JSONResponse(
             content={'message': 'Access denied'},
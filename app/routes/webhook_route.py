@@ -0,0 +1,102 @@
+"""Маршрут webhook для приема апдейтов Telegram."""
+
+# STDLIB
+from http import HTTPStatus
+import logging
+import secrets
+from typing import Annotated, Optional
+
+# THIRDPARTY
+from aiogram.types import Update
+from fastapi import APIRouter, BackgroundTasks, Header, Request
+from starlette.responses import JSONResponse, Response
+
+# FIRSTPARTY
+from tg_bot.bot_main import (
+    get_bot,
+    get_dispatcher,
+    get_http_client,
+    get_storage,
+)
+from tg_bot.settings.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+async def process_update(update: Update) -> None:
+    """Передать апдейт в диспетчер бота и залогировать ошибки."""
+    try:
+        await get_dispatcher().feed_update(get_bot(), update)
+    except Exception as e:
+        logger.error(
+            f'Ошибка обработки апдейта {update.update_id}: {e}', exc_info=True
+        )
+
+
+# Модуль импортируется только в режиме webhook, когда настройки
+# приложения уже прочитаны
+@router.post(get_settings().WEBHOOK_PATH)
+async def telegram_webhook(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    x_telegram_bot_api_secret_token: Annotated[Optional[str], Header()] = None,
+):
+    """Принимает апдейт от Telegram.
+
+    Проверяет секретный токен из заголовка и ставит обработку апдейта
+    в фоновую задачу, чтобы ответить Telegram сразу, не дожидаясь
+    хендлеров.
+
+    Параметры:
+        request (Request): Запрос с JSON апдейта.
+        background_tasks (BackgroundTasks): Фоновые задачи FastAPI.
+        x_telegram_bot_api_secret_token (Optional[str]): Секрет webhook.
+
+    Возвращаемое значение:
+        Response: Пустой ответ 200, если апдейт принят.
+        JSONResponse: Ответ с ошибкой, если секрет не совпал
+            или не задан в настройках.
+    """
+    secret = x_telegram_bot_api_secret_token
+    expected = get_settings().WEBHOOK_SECRET
+    if not (expected and secret and secrets.compare_digest(secret, expected)):
+        return JSONResponse(
+            content={'message': 'Access denied'},
+            status_code=HTTPStatus.UNAUTHORIZED,
+        )
+    update = Update.model_validate(
+        await request.json(), context={'bot': get_bot()}
+    )
+    background_tasks.add_task(process_update, update)
+    return Response(status_code=HTTPStatus.OK)
+
+
+async def start_webhook() -> None:
+    """Зарегистрировать webhook в Telegram и запустить диспетчер."""
+    settings = get_settings()
+    if not settings.WEBHOOK_SECRET:
+        raise ValueError('Для режима webhook нужен WEBHOOK_SECRET')
+    bot = get_bot()
+    dp = get_dispatcher()
+    await dp.emit_startup(bot=bot)
+    await bot.set_webhook(
+        url=f'{settings.BASE_NGROK_URL}{settings.WEBHOOK_PATH}',
+        secret_token=settings.WEBHOOK_SECRET,
+        allowed_updates=dp.resolve_used_update_types(),
+    )
+    logger.info('Webhook бота зарегистрирован')
+
+
+async def stop_webhook() -> None:
+    """Остановить диспетчер и закрыть соединения бота.
+
+    Сам webhook не удаляется: его продолжают обслуживать
+    остальные реплики приложения.
+    """
+    bot = get_bot()
+    await get_dispatcher().emit_shutdown(bot=bot)
+    await get_storage().close()
+    await get_http_client().aclose()
+    await bot.session.close()
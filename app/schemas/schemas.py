@@ -1,5 +1,8 @@
 """Определение pydantic-схем."""
 
+# STDLIB
+from datetime import datetime
+
 # THIRDPARTY
 from pydantic import BaseModel, Field
 
@@ -19,3 +22,12 @@ class ServiceCreateSchema(BaseModel):
     service_name: str
     service_cost: int
     service_time: int
+
+
+class OrderCreateSchema(BaseModel):
+    """Схема для валидации данных заказа."""
+
+    user_id: int = Field(ge=0)
+    service_ids: list[int] = Field(min_length=1)
+    begin_at: datetime | None = None
+    ends_at: datetime | None = None
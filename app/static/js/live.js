@@ -0,0 +1,107 @@
+// Живое обновление списков админ-панели по событиям сервера.
+(function () {
+    'use strict';
+
+    var LAST_EVENT_KEY = 'live-last-event-id';
+
+    function formatValue(value, format) {
+        if (format === 'minutes') {
+            return Math.floor(value / 60) + ' минут';
+        }
+        if (value === null || value === undefined) {
+            return 'None';
+        }
+        if (typeof value === 'boolean') {
+            return value ? 'True' : 'False';
+        }
+        return String(value);
+    }
+
+    function fillRow(node, row) {
+        node.querySelectorAll('[data-field]').forEach(function (element) {
+            element.textContent = formatValue(
+                row[element.dataset.field], element.dataset.format
+            );
+        });
+    }
+
+    function createRow(list, id) {
+        var template = list.dataset.rowTemplate &&
+            document.getElementById(list.dataset.rowTemplate);
+        if (!template) {
+            return null;
+        }
+        var wrapper = document.createElement('div');
+        wrapper.innerHTML = template.innerHTML.split('__ID__').join(id).trim();
+        var node = wrapper.firstElementChild;
+        list.appendChild(node);
+        return node;
+    }
+
+    function applyChange(list, change) {
+        var node = list.querySelector('[data-row-id="' + change.id + '"]');
+        if (change.op === 'delete') {
+            if (node) {
+                node.remove();
+            }
+            return;
+        }
+        if (!node && change.op === 'insert') {
+            node = createRow(list, change.id);
+        }
+        if (node) {
+            fillRow(node, change.row);
+        }
+    }
+
+    function connect(list) {
+        var url = '/api/v1/events?cur_user_id=' +
+            encodeURIComponent(list.dataset.curUserId);
+        var lastEventId = sessionStorage.getItem(LAST_EVENT_KEY);
+        if (lastEventId) {
+            url += '&last_event_id=' + encodeURIComponent(lastEventId);
+        }
+        var source = new EventSource(url);
+        source.addEventListener('change', function (event) {
+            sessionStorage.setItem(LAST_EVENT_KEY, event.lastEventId);
+            var change = JSON.parse(event.data);
+            if (change.table === list.dataset.liveTable) {
+                applyChange(list, change);
+            }
+        });
+        source.addEventListener('reset', function () {
+            sessionStorage.removeItem(LAST_EVENT_KEY);
+            source.close();
+            window.location.reload();
+        });
+    }
+
+    // Обработчик висит на document, поэтому работает и для форм в строках,
+    // добавленных по событиям сервера после загрузки страницы
+    function submitForm(event) {
+        var form = event.target;
+        if (!(form instanceof HTMLFormElement) ||
+            !form.hasAttribute('data-live-form')) {
+            return;
+        }
+        event.preventDefault();
+        fetch(form.action, {
+            method: 'POST',
+            body: new FormData(form),
+            headers: {Accept: 'application/json'},
+        }).then(function (response) {
+            return response.json().then(function (body) {
+                if (!response.ok) {
+                    window.alert((body && body.message) || response.status);
+                } else if (form.dataset.liveForm === 'back') {
+                    window.history.back();
+                }
+            });
+        });
+    }
+
+    document.addEventListener('DOMContentLoaded', function () {
+        document.querySelectorAll('[data-live-table]').forEach(connect);
+    });
+    document.addEventListener('submit', submitForm);
+})();
@@ -0,0 +1,162 @@
+"""Статические файлы с хешем содержимого в имени.
+
+Шаблоны получают адрес файла через `static_url('css/styles.css')`,
+который возвращает `/static/css/styles.<hash>.css`. Такой адрес меняется
+при каждом изменении файла, поэтому отдается с
+`Cache-Control: immutable` и кешируется браузером на год. Сжатые
+варианты gzip и brotli готовятся один раз при запуске приложения.
+"""
+
+# STDLIB
+from dataclasses import dataclass, field
+import hashlib
+import mimetypes
+import os
+from typing import Optional
+
+# THIRDPARTY
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+
+# FIRSTPARTY
+from app.middlewares.compression import (
+    ENCODING_BROTLI,
+    ENCODING_GZIP,
+    brotli,
+    compress,
+    negotiate_encoding,
+)
+
+IMMUTABLE_CACHE = 'public, max-age=31536000, immutable'
+COMPRESSIBLE_PREFIXES = ('text/', 'application/javascript', 'image/svg')
+
+
+@dataclass
+class StaticAsset(object):
+    """Статический файл и его сжатые варианты.
+
+    Атрибуты:
+        path (str): Путь относительно каталога статики.
+        hashed_path (str): Путь с хешем содержимого.
+        media_type (str): MIME-тип файла.
+        content (bytes): Содержимое файла.
+        encoded (dict[str, bytes]): Сжатые варианты по алгоритму.
+    """
+
+    path: str
+    hashed_path: str
+    media_type: str
+    content: bytes
+    encoded: dict[str, bytes] = field(default_factory=dict)
+
+
+class StaticAssets(object):
+    """Реестр статических файлов с хешированными адресами.
+
+    Атрибуты:
+        directory (str): Каталог статики.
+        prefix (str): URL, по которому смонтирована статика.
+        min_compress_size (int): Файлы меньше этого размера не сжимаются.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        prefix: str = '/static',
+        min_compress_size: int = 256,
+    ) -> None:
+        """Создать пустой реестр; файлы читает `build`."""
+        self.directory = directory
+        self.prefix = prefix
+        self.min_compress_size = min_compress_size
+        self.by_path: dict[str, StaticAsset] = {}
+        self.by_hashed_path: dict[str, StaticAsset] = {}
+
+    def build(self) -> None:
+        """Просканировать каталог, посчитать хеши и сжать файлы."""
+        by_path = {}
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                full_path = os.path.join(root, name)
+                path = os.path.relpath(full_path, self.directory)
+                path = path.replace(os.sep, '/')
+                with open(full_path, 'rb') as file:
+                    content = file.read()
+                by_path[path] = self._make_asset(path, content)
+        self.by_path = by_path
+        self.by_hashed_path = {
+            asset.hashed_path: asset for asset in by_path.values()
+        }
+
+    def _make_asset(self, path: str, content: bytes) -> StaticAsset:
+        digest = hashlib.sha256(content).hexdigest()[:12]
+        stem, ext = os.path.splitext(path)
+        media_type = (
+            mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        )
+        asset = StaticAsset(
+            path=path,
+            hashed_path=f'{stem}.{digest}{ext}',
+            media_type=media_type,
+            content=content,
+        )
+        compressible = media_type.startswith(COMPRESSIBLE_PREFIXES)
+        if compressible and len(content) >= self.min_compress_size:
+            encodings = [ENCODING_GZIP]
+            if brotli is not None:
+                encodings.append(ENCODING_BROTLI)
+            for encoding in encodings:
+                encoded = compress(content, encoding)
+                if len(encoded) < len(content):
+                    asset.encoded[encoding] = encoded
+        return asset
+
+    def url(self, path: str) -> str:
+        """Адрес файла для шаблонов, с хешем, если файл известен."""
+        asset = self.by_path.get(path)
+        if asset is None:
+            return f'{self.prefix}/{path}'
+        return f'{self.prefix}/{asset.hashed_path}'
+
+
+class HashedStaticFiles(StaticFiles):
+    """Раздача статики с поддержкой хешированных адресов.
+
+    Хешированные адреса отдаются из памяти, с долгим кешем и сжатым
+    вариантом, если клиент его принимает. Обычные адреса
+    обрабатываются стандартным `StaticFiles`.
+    """
+
+    def __init__(self, assets: StaticAssets, **kwargs) -> None:
+        """Раздавать `assets`, остальные аргументы - как у `StaticFiles`."""
+        super().__init__(**kwargs)
+        self.assets = assets
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        """Отдать файл по пути относительно каталога статики."""
+        asset = self.assets.by_hashed_path.get(path.replace(os.sep, '/'))
+        if asset is None:
+            return await super().get_response(path, scope)
+
+        headers = {
+            'Cache-Control': IMMUTABLE_CACHE,
+            'ETag': f'"{asset.hashed_path}"',
+            'Vary': 'Accept-Encoding',
+        }
+        request_headers = Headers(scope=scope)
+        if request_headers.get('if-none-match') == headers['ETag']:
+            return Response(status_code=304, headers=headers)
+        encoding: Optional[str] = negotiate_encoding(
+            request_headers.get('accept-encoding', '')
+        )
+        if encoding in asset.encoded:
+            headers['Content-Encoding'] = encoding
+            content = asset.encoded[encoding]
+        else:
+            content = asset.content
+        return Response(content, media_type=asset.media_type, headers=headers)
+
+
+static_assets = StaticAssets(directory='static')
@@ -0,0 +1,51 @@
+"""Триграммная близость строк для нечеткого поиска на SQLite.
+
+Повторяет `similarity()` из pg_trgm: доля общих триграмм двух слов.
+Функция `sql_similarity` регистрируется в каждом соединении SQLite
+под именем `user_similarity` (см. `app.database.configure_sqlite`).
+"""
+
+# STDLIB
+import re
+from typing import Optional
+
+SQL_SIMILARITY = 'user_similarity'
+
+
+def trigrams(word: str) -> set[str]:
+    """Множество триграмм слова."""
+    return {''.join(chars) for chars in zip(word, word[1:], word[2:])}
+
+
+def similarity(terms: list[str], *values: Optional[str]) -> float:
+    """Средняя по словам запроса лучшая триграммная близость к полям."""
+    words = [
+        word
+        for value in values
+        if value
+        for word in re.split(r'[\W_]+', value.lower())
+        if word
+    ]
+    total = 0.0
+    for term in terms:
+        term_trigrams = trigrams(term)
+        best = 0.0
+        for word in words:
+            word_trigrams = trigrams(word)
+            union = term_trigrams | word_trigrams
+            if union:
+                best = max(
+                    best, len(term_trigrams & word_trigrams) / len(union)
+                )
+        total += best
+    return total / len(terms)
+
+
+def sql_similarity(
+    query: str,
+    username: Optional[str],
+    first_name: Optional[str],
+    last_name: Optional[str],
+) -> float:
+    """`similarity` в виде функции SQLite для ранжирования в запросе."""
+    return similarity(query.split(' '), username, first_name, last_name)
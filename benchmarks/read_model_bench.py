@@ -0,0 +1,134 @@
+"""Сравнение ORM-объектов и легких моделей чтения для списков.
+
+Создает временную базу SQLite с N пользователями (по умолчанию 100 000)
+и загружает их двумя способами: `UserDAL.get_all` (ORM-объекты
+`UserModel`) и `UserDAL.get_all_rows` (dataclass `UserRow` из выборки
+колонок). Для каждого способа выводятся медиана времени загрузки,
+а также память на строку по tracemalloc: удерживаемая, пока жив
+результат и сессия, и пиковая.
+
+Запуск:
+    python -m benchmarks.read_model_bench --rows 100000
+"""
+
+# STDLIB
+import argparse
+import asyncio
+import gc
+import os
+import sqlite3
+import statistics
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Awaitable, Callable, Optional
+
+# THIRDPARTY
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+# FIRSTPARTY
+from app.DAL.BaseDAL import UserDAL
+from app.models.models import Base
+
+Loader = Callable[[AsyncSession], Awaitable[list[Any]]]
+
+LOADERS: tuple[tuple[str, Loader], ...] = (
+    ('ORM UserModel', UserDAL.get_all),
+    ('UserRow', UserDAL.get_all_rows),
+)
+
+
+def build_database(path: str, rows: int) -> None:
+    """Наполнить базу пользователями."""
+    engine = create_engine(f'sqlite:///{path}')
+    Base.metadata.create_all(engine)
+    engine.dispose()
+
+    connection = sqlite3.connect(path)
+    connection.executemany(
+        'INSERT INTO users (id, username, first_name, last_name, '
+        "is_admin, created_at) VALUES (?, ?, ?, ?, ?, '2025-01-01')",
+        (
+            (id_, f'user_{id_}', f'Имя{id_}', f'Фамилия{id_}', id_ % 100 == 0)
+            for id_ in range(1, rows + 1)
+        ),
+    )
+    connection.commit()
+    connection.close()
+
+
+async def measure_time(
+    session_factory: Callable[[], AsyncSession], loader: Loader, repeats: int
+) -> float:
+    """Медиана времени загрузки в миллисекундах."""
+    timings = []
+    for _ in range(repeats):
+        async with session_factory() as session:
+            started_at = time.perf_counter()
+            await loader(session)
+            timings.append((time.perf_counter() - started_at) * 1000)
+    return statistics.median(timings)
+
+
+async def measure_memory(
+    session_factory: Callable[[], AsyncSession], loader: Loader
+) -> tuple[int, int, int]:
+    """Удерживаемая и пиковая память загрузки в байтах и число строк."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        async with session_factory() as session:
+            baseline, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            result = await loader(session)
+            gc.collect()
+            retained, peak = tracemalloc.get_traced_memory()
+            rows = len(result)
+            del result
+    finally:
+        tracemalloc.stop()
+    return retained - baseline, peak - baseline, rows
+
+
+async def measure(path: str, repeats: int) -> None:
+    """Замерить оба способа загрузки."""
+    engine = create_async_engine(f'sqlite+aiosqlite:///{path}')
+    session_factory = async_sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )
+    print(
+        f'{"модель":<16}{"время, мс":>11}{"байт/строку":>13}'
+        f'{"пик, байт/строку":>18}'
+    )
+    for title, loader in LOADERS:
+        # Прогрев: компиляция запроса и открытие соединения
+        await measure_time(session_factory, loader, 1)
+        elapsed = await measure_time(session_factory, loader, repeats)
+        retained, peak, rows = await measure_memory(session_factory, loader)
+        print(
+            f'{title:<16}{elapsed:>11.0f}{retained / rows:>13.0f}'
+            f'{peak / rows:>18.0f}'
+        )
+    await engine.dispose()
+
+
+def main(args: Optional[Any] = None) -> None:
+    """Разобрать аргументы и выполнить замер."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--repeats', type=int, default=5)
+    options = parser.parse_args(args)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'read_model_bench.sqlite3')
+        build_database(path, options.rows)
+        asyncio.run(measure(path, options.repeats))
+
+
+if __name__ == '__main__':
+    main()
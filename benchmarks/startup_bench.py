@@ -0,0 +1,188 @@
+"""Замер времени импорта приложения FastAPI и бота.
+
+Каждая точка входа импортируется в отдельном процессе с
+`python -X importtime`, из вывода берется суммарное время импортов
+верхнего уровня и самые медленные модули. С флагом `--check`
+медиана сравнивается с бюджетом, и при превышении скрипт завершается
+с ошибкой; так замер запускается в pre-push хуке.
+
+Бот замеряется дважды. Полный импорт с бюджетом на все время запуска
+ловит и регрессии зависимостей, например рост времени импорта aiogram
+после обновления. Замер без aiogram, который занимает около 2 с
+и от кода бота не зависит, с узким бюджетом ловит регрессии
+собственных импортов бота, теряющиеся на фоне aiogram.
+
+Запуск:
+    python -m benchmarks.startup_bench --repeats 5 --check
+"""
+
+# STDLIB
+import argparse
+from dataclasses import dataclass
+import os
+import statistics
+import subprocess
+import sys
+from typing import Any, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Обязательные настройки без значений по умолчанию: для импорта
+# достаточно заглушек, если окружение их не задает
+DUMMY_ENV = {
+    'TG_BOT_TOKEN': '1:bench',
+    'FASTAPI_URL': 'http://127.0.0.1:8000',
+    'BASE_NGROK_URL': 'http://127.0.0.1:8000',
+}
+
+
+@dataclass(frozen=True)
+class Target(object):
+    """Точка входа для замера.
+
+    Атрибуты:
+        name (str): Имя точки входа.
+        module (str): Импортируемый модуль.
+        cwd (str): Рабочая директория процесса.
+        budget_ms (float): Допустимое время импорта в миллисекундах.
+        exclude (tuple[str, ...]): Пакеты, время импорта которых
+            вместе с их зависимостями не входит в замер.
+    """
+
+    name: str
+    module: str
+    cwd: str
+    budget_ms: float
+    exclude: tuple[str, ...] = ()
+
+
+TARGETS = (
+    # app/main.py запускается из директории app
+    Target('app', 'main', os.path.join(ROOT, 'app'), 1200.0),
+    Target('bot', 'tg_bot.bot_main', ROOT, 3500.0),
+    Target('bot-own', 'tg_bot.bot_main', ROOT, 350.0, exclude=('aiogram',)),
+)
+
+
+def parse_importtime(output: str) -> list[tuple[int, str, int]]:
+    """Разобрать вывод `-X importtime`.
+
+    Параметры:
+        output (str): Поток stderr процесса.
+
+    Возвращаемое значение:
+        list[tuple[int, str, int]]: Глубина вложенности, имя модуля
+        и накопленное время импорта в микросекундах.
+    """
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line.removeprefix('import time:').split('|')
+        if not cumulative.strip().isdigit():
+            continue
+        # Вложенные импорты выводятся с отступом в два пробела на уровень
+        name = name[1:]
+        depth = (len(name) - len(name.lstrip(' '))) // 2
+        modules.append((depth, name.strip(), int(cumulative)))
+    return modules
+
+
+def total_ms(
+    modules: list[tuple[int, str, int]], exclude: tuple[str, ...]
+) -> float:
+    """Суммарное время импорта без поддеревьев исключенных пакетов.
+
+    Параметры:
+        modules (list[tuple[int, str, int]]): Замер из `parse_importtime`.
+        exclude (tuple[str, ...]): Исключаемые пакеты.
+
+    Возвращаемое значение:
+        float: Время импорта в миллисекундах.
+    """
+    total = 0
+    excluded_depth = None
+    # Модуль выводится после своих вложенных импортов, поэтому
+    # в обратном порядке поддерево идет сразу за своим корнем
+    for depth, name, cumulative in reversed(modules):
+        if excluded_depth is not None and depth > excluded_depth:
+            continue
+        excluded_depth = None
+        if depth == 0:
+            total += cumulative
+        if name.split('.')[0] in exclude:
+            total -= cumulative
+            excluded_depth = depth
+    return total / 1000
+
+
+def measure(target: Target) -> list[tuple[int, str, int]]:
+    """Импортировать модуль в чистом процессе и вернуть замер."""
+    env = {**DUMMY_ENV, **os.environ}
+    env['PYTHONPATH'] = os.pathsep.join(
+        filter(None, (ROOT, env.get('PYTHONPATH')))
+    )
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {target.module}'],
+        cwd=target.cwd,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode:
+        raise RuntimeError(
+            f'Не удалось импортировать {target.module}:\n{result.stderr}'
+        )
+    return parse_importtime(result.stderr)
+
+
+def run(target: Target, repeats: int, top: int) -> float:
+    """Замерить точку входа и вывести медленные модули.
+
+    Возвращаемое значение:
+        float: Медиана суммарного времени импорта в миллисекундах.
+    """
+    # Первый запуск прогревает __pycache__ и в замер не входит
+    measure(target)
+    runs = [measure(target) for _ in range(repeats)]
+    totals = [total_ms(modules, target.exclude) for modules in runs]
+    median = statistics.median(totals)
+    excluded = f' без {", ".join(target.exclude)}' if target.exclude else ''
+    print(
+        f'{target.name}: {median:.0f} мс{excluded} '
+        f'(мин. {min(totals):.0f}, бюджет {target.budget_ms:.0f})'
+    )
+    # Прямые импорты точки входа показывают, что стоит отложить
+    direct = [
+        (cumulative, name)
+        for depth, name, cumulative in runs[-1]
+        if depth == 1
+    ]
+    for cumulative, module in sorted(direct, reverse=True)[:top]:
+        print(f'    {cumulative / 1000:8.1f} мс  {module}')
+    return median
+
+
+def main(args: Optional[Any] = None) -> None:
+    """Разобрать аргументы и выполнить замер."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument(
+        '--check',
+        action='store_true',
+        help='Завершиться с ошибкой при превышении бюджета',
+    )
+    options = parser.parse_args(args)
+
+    over_budget = []
+    for target in TARGETS:
+        median = run(target, options.repeats, options.top)
+        if median > target.budget_ms:
+            over_budget.append(target.name)
+    if options.check and over_budget:
+        sys.exit(f'Превышен бюджет времени импорта: {", ".join(over_budget)}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+"""Замер задержки поиска пользователей на большом наборе данных.
+
+Создает временную базу SQLite с N пользователями (по умолчанию миллион),
+строит индекс FTS5 командами миграции 8b2e4a7c9d10 и замеряет
+`UserSearchDAL.search` на типичных запросах: префикс, подстрока,
+несколько слов, ник, опечатка.
+
+Запуск:
+    python -m benchmarks.user_search_bench --users 1000000
+"""
+
+# STDLIB
+import argparse
+import asyncio
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from typing import Any, Optional
+
+# THIRDPARTY
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+# FIRSTPARTY
+from app.DAL.UserSearchDAL import UserSearchDAL, load_search_ddl
+from app.database import configure_sqlite
+from app.models.models import Base
+
+SYLLABLES = tuple(
+    'ан ва ни ко ла ре ми ха ил се ор ев '
+    'ka ri to na le mo sa vi de lu ro an'.split()
+)
+QUERIES = (
+    ('префикс', 'kari'),
+    ('подстрока', 'rito'),
+    ('два слова', 'ka mo'),
+    ('ник', 'user_12345'),
+    ('опечатка', 'karitonq'),
+)
+
+
+def _word(rnd: random.Random) -> str:
+    """Случайное слово из слогов."""
+    return ''.join(rnd.choice(SYLLABLES) for _ in range(rnd.randint(2, 4)))
+
+
+def build_database(path: str, users: int, seed: int = 42) -> None:
+    """Наполнить базу пользователями и построить индекс поиска."""
+    engine = create_engine(f'sqlite:///{path}')
+    Base.metadata.create_all(engine)
+    engine.dispose()
+
+    rnd = random.Random(seed)
+    connection = sqlite3.connect(path)
+    connection.execute('PRAGMA journal_mode=WAL')
+    connection.execute('PRAGMA synchronous=OFF')
+    batch = 50000
+    for start in range(1, users + 1, batch):
+        connection.executemany(
+            'INSERT INTO users (id, username, first_name, last_name, '
+            "is_admin, created_at) VALUES (?, ?, ?, ?, 0, '2025-01-01')",
+            (
+                (
+                    id_,
+                    f'user_{id_}',
+                    _word(rnd).capitalize(),
+                    _word(rnd).capitalize(),
+                )
+                for id_ in range(start, min(start + batch, users + 1))
+            ),
+        )
+    started_at = time.perf_counter()
+    for statement in load_search_ddl():
+        connection.execute(statement)
+    connection.commit()
+    connection.close()
+    print(f'Индекс построен за {time.perf_counter() - started_at:.1f} с')
+
+
+async def measure(path: str, repeats: int) -> None:
+    """Замерить задержку поиска по набору запросов."""
+    engine = create_async_engine(f'sqlite+aiosqlite:///{path}')
+    configure_sqlite(engine)
+    session_factory = async_sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )
+    print(f'{"запрос":<12}{"найдено":>9}{"p50, мс":>10}{"p95, мс":>10}')
+    for title, query in QUERIES:
+        timings = []
+        for _ in range(repeats):
+            async with session_factory() as session:
+                started_at = time.perf_counter()
+                users, _ = await UserSearchDAL.search(query, 1, 50, session)
+                timings.append((time.perf_counter() - started_at) * 1000)
+        timings.sort()
+        p95 = timings[int(len(timings) * 0.95) - 1]
+        print(
+            f'{title:<12}{len(users):>9}'
+            f'{statistics.median(timings):>10.1f}{p95:>10.1f}'
+        )
+    await engine.dispose()
+
+
+def main(args: Optional[Any] = None) -> None:
+    """Разобрать аргументы и выполнить замер."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, default=1_000_000)
+    parser.add_argument('--repeats', type=int, default=20)
+    options = parser.parse_args(args)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'search_bench.sqlite3')
+        started_at = time.perf_counter()
+        build_database(path, options.users)
+        print(
+            f'{options.users} пользователей загружено за '
+            f'{time.perf_counter() - started_at:.1f} с'
+        )
+        asyncio.run(measure(path, options.repeats))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""Общие фикстуры тестов."""
+
+# STDLIB
+import os
+from typing import Any, AsyncIterator, Callable, Coroutine
+
+# THIRDPARTY
+from fastapi import APIRouter, FastAPI
+import pytest
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import StaticPool
+
+# Обязательные настройки без значений по умолчанию
+os.environ.setdefault('TG_BOT_TOKEN', '42:test')
+os.environ.setdefault('FASTAPI_URL', 'http://127.0.0.1:8000')
+os.environ.setdefault('BASE_NGROK_URL', 'http://127.0.0.1:8000')
+
+# FIRSTPARTY
+from app.database import (  # noqa: E402
+    configure_sqlite,
+    get_read_session,
+    get_session,
+)
+from app.models.models import Base  # noqa: E402
+
+Database = tuple[AsyncEngine, async_sessionmaker[AsyncSession]]
+DatabaseFactory = Callable[[], Coroutine[Any, Any, Database]]
+
+
+@pytest.fixture
+def database() -> DatabaseFactory:
+    """Создать базу SQLite в памяти со схемой приложения.
+
+    База создается внутри цикла событий теста, поэтому фикстура
+    возвращает корутину, а не готовый движок.
+    """
+
+    async def create() -> Database:
+        engine = create_async_engine(
+            'sqlite+aiosqlite://', poolclass=StaticPool
+        )
+        configure_sqlite(engine)
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        return engine, async_sessionmaker(
+            engine, class_=AsyncSession, expire_on_commit=False
+        )
+
+    return create
+
+
+def api_app(
+    session_factory: async_sessionmaker[AsyncSession], *routers: APIRouter
+) -> FastAPI:
+    """Приложение с маршрутами `routers` поверх тестовой базы.
+
+    Параметры:
+        session_factory (async_sessionmaker[AsyncSession]): Фабрика
+            сессий тестовой базы, ей подменяются сессии записи и чтения.
+        *routers (APIRouter): Подключаемые маршруты.
+
+    Возвращаемое значение:
+        FastAPI: Приложение для `TestClient`.
+    """
+
+    async def override_session() -> AsyncIterator[AsyncSession]:
+        async with session_factory() as session:
+            yield session
+
+    app = FastAPI()
+    for router in routers:
+        app.include_router(router)
+    app.dependency_overrides[get_session] = override_session
+    app.dependency_overrides[get_read_session] = override_session
+    return app
@@ -0,0 +1,121 @@
+"""Тесты инкрементального обновления сводок аналитики."""
+
+# STDLIB
+import asyncio
+from datetime import date, datetime
+
+# THIRDPARTY
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# FIRSTPARTY
+from app.DAL.AnalyticsDAL import AnalyticsDAL
+from app.DAL.OrderDAL import OrderDAL
+from app.models.models import (
+    DailyServiceStatsModel,
+    ServiceModel,
+    UserModel,
+    UserOrderStatsModel,
+)
+from app.schemas.schemas import OrderCreateSchema
+from tests.conftest import DatabaseFactory
+
+Summaries = tuple[list[tuple[object, ...]], list[tuple[object, ...]]]
+
+
+async def read_summaries(session: AsyncSession) -> Summaries:
+    """Прочитать обе сводные таблицы в стабильном порядке."""
+    daily = await session.execute(
+        select(
+            DailyServiceStatsModel.day,
+            DailyServiceStatsModel.service_id,
+            DailyServiceStatsModel.orders_count,
+            DailyServiceStatsModel.active_count,
+            DailyServiceStatsModel.revenue,
+        ).order_by(
+            DailyServiceStatsModel.day, DailyServiceStatsModel.service_id
+        )
+    )
+    users = await session.execute(
+        select(
+            UserOrderStatsModel.user_id,
+            UserOrderStatsModel.orders_count,
+            UserOrderStatsModel.revenue,
+        ).order_by(UserOrderStatsModel.user_id)
+    )
+    return (
+        [tuple(row) for row in daily],
+        [tuple(row) for row in users],
+    )
+
+
+async def add_order(
+    session: AsyncSession,
+    user_id: int,
+    service_ids: list[int],
+    begin_at: datetime | None = None,
+) -> int:
+    """Создать заказ через OrderDAL и вернуть его ID."""
+    service_costs = await OrderDAL.get_service_costs(service_ids, session)
+    order, _ = await OrderDAL.add_one_order(
+        OrderCreateSchema(
+            user_id=user_id, service_ids=service_ids, begin_at=begin_at
+        ),
+        service_costs,
+        session,
+    )
+    return order.id
+
+
+def test_incremental_summaries_match_rebuild(
+    database: DatabaseFactory,
+) -> None:
+    """Сводки после создания и смены статуса заказов равны пересчету."""
+
+    async def check() -> None:
+        engine, session_factory = await database()
+        async with session_factory() as session:
+            session.add_all(UserModel(id=id_) for id_ in (1, 2))
+            session.add_all(
+                [
+                    ServiceModel(
+                        id=1,
+                        service_name='a',
+                        service_cost=10,
+                        service_time=1,
+                    ),
+                    ServiceModel(
+                        id=2,
+                        service_name='b',
+                        service_cost=25,
+                        service_time=1,
+                    ),
+                ]
+            )
+            await session.commit()
+
+            first = await add_order(
+                session, 1, [1, 2], datetime(2024, 1, 5, 9)
+            )
+            second = await add_order(session, 1, [2], datetime(2024, 1, 5, 18))
+            third = await add_order(session, 2, [1], datetime(2024, 1, 6, 12))
+            await add_order(session, 2, [1, 2])
+
+            await OrderDAL.set_active(first, False, session)
+            await OrderDAL.set_active(second, False, session)
+            await OrderDAL.set_active(second, True, session)
+            await OrderDAL.set_active(third, False, session)
+            # Повторная установка того же статуса сводки не меняет
+            await OrderDAL.set_active(third, False, session)
+
+            incremental = await read_summaries(session)
+            await AnalyticsDAL.rebuild(session)
+            rebuilt = await read_summaries(session)
+        await engine.dispose()
+
+        assert incremental == rebuilt
+        daily, users = incremental
+        assert (date(2024, 1, 5), 2, 2, 1, 50) in daily
+        assert users == [(1, 2, 60), (2, 2, 45)]
+
+    asyncio.run(check())
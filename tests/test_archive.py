@@ -0,0 +1,225 @@
+"""Тесты переноса заказов в архив и чтения истории."""
+
+# STDLIB
+import asyncio
+from datetime import datetime
+from typing import Any, Callable, Coroutine, Type, Union
+
+# THIRDPARTY
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+# FIRSTPARTY
+from app.DAL.OrderArchiveDAL import OrderArchiveDAL
+from app.jobs.archive import OrderArchiver
+from app.models.models import (
+    OrderArchiveModel,
+    OrderModel,
+    ServiceModel,
+    UserModel,
+    order_services,
+    order_services_archive,
+)
+from tests.conftest import DatabaseFactory
+
+OLD = datetime(2020, 1, 1)
+CUTOFF = datetime(2021, 1, 1)
+
+Check = Callable[[async_sessionmaker[AsyncSession]], Coroutine[Any, Any, None]]
+
+
+async def seed(
+    session_factory: async_sessionmaker[AsyncSession],
+    orders: int,
+    active: tuple[int, ...] = (),
+    recent: tuple[int, ...] = (),
+) -> None:
+    """Добавить заказы 1..`orders` юзера 1, у каждого по две услуги.
+
+    Параметры:
+        session_factory (async_sessionmaker[AsyncSession]): Фабрика
+            сессий тестовой базы.
+        orders (int): Количество заказов, все неактивные и старые.
+        active (tuple[int, ...]): ID заказов, которые остаются активными.
+        recent (tuple[int, ...]): ID заказов, закончившихся сейчас.
+    """
+    async with session_factory() as session:
+        session.add(UserModel(id=1))
+        session.add_all(
+            ServiceModel(
+                id=id_, service_name=str(id_), service_cost=10, service_time=1
+            )
+            for id_ in (1, 2)
+        )
+        session.add_all(
+            OrderModel(
+                id=id_,
+                user_id=1,
+                ends_at=datetime.now() if id_ in recent else OLD,
+                is_active=id_ in active,
+                idempotency_key=f'key-{id_}',
+            )
+            for id_ in range(1, orders + 1)
+        )
+        await session.flush()
+        await session.execute(
+            order_services.insert(),
+            [
+                {'order_id': id_, 'service_id': service_id}
+                for id_ in range(1, orders + 1)
+                for service_id in (1, 2)
+            ],
+        )
+        await session.commit()
+
+
+async def order_ids(
+    session: AsyncSession,
+    model: Union[Type[OrderModel], Type[OrderArchiveModel]],
+) -> list[int]:
+    """ID заказов в рабочей или архивной таблице."""
+    result = await session.execute(select(model.id).order_by(model.id))
+    return list(result.scalars())
+
+
+@pytest.fixture
+def run(database: DatabaseFactory) -> Callable[[Check], None]:
+    """Выполнить проверку поверх новой базы и закрыть ее движок."""
+
+    def runner(check: Check) -> None:
+        async def main() -> None:
+            engine, session_factory = await database()
+            try:
+                await check(session_factory)
+            finally:
+                await engine.dispose()
+
+        asyncio.run(main())
+
+    return runner
+
+
+def test_archive_batch_moves_orders_in_batches(
+    run: Callable[[Check], None],
+) -> None:
+    """Пачка не больше `batch_size`, заказ с максимальным ID остается."""
+
+    async def check(session_factory: async_sessionmaker[AsyncSession]) -> None:
+        await seed(session_factory, 6)
+        moved = []
+        async with session_factory() as session:
+            for _ in range(3):
+                moved.append(
+                    await OrderArchiveDAL.archive_batch(CUTOFF, 4, session)
+                )
+            assert moved == [(4, 8), (1, 2), (0, 0)]
+            assert await order_ids(session, OrderModel) == [6]
+            archived = await order_ids(session, OrderArchiveModel)
+            assert archived == [1, 2, 3, 4, 5]
+
+    run(check)
+
+
+def test_archive_batch_skips_active_and_recent_orders(
+    run: Callable[[Check], None],
+) -> None:
+    """Активные и недавно закончившиеся заказы остаются на месте."""
+
+    async def check(session_factory: async_sessionmaker[AsyncSession]) -> None:
+        await seed(session_factory, 5, active=(2,), recent=(3,))
+        async with session_factory() as session:
+            moved = await OrderArchiveDAL.archive_batch(CUTOFF, 10, session)
+            assert moved == (2, 4)
+            assert await order_ids(session, OrderModel) == [2, 3, 5]
+            assert await order_ids(session, OrderArchiveModel) == [1, 4]
+
+    run(check)
+
+
+def test_archive_batch_moves_order_services(
+    run: Callable[[Check], None],
+) -> None:
+    """Связи с услугами переносятся вместе с заказом."""
+
+    async def check(session_factory: async_sessionmaker[AsyncSession]) -> None:
+        await seed(session_factory, 3)
+        async with session_factory() as session:
+            await OrderArchiveDAL.archive_batch(CUTOFF, 10, session)
+            working = await session.execute(
+                select(order_services.c.order_id).distinct()
+            )
+            assert list(working.scalars()) == [3]
+            archived = await session.execute(
+                select(
+                    order_services_archive.c.order_id,
+                    order_services_archive.c.service_id,
+                ).order_by(*order_services_archive.c)
+            )
+            assert list(archived.tuples()) == [(1, 1), (1, 2), (2, 1), (2, 2)]
+            for order_id in (1, 3):
+                service_ids = await OrderArchiveDAL.get_service_ids(
+                    order_id, session
+                )
+                assert sorted(service_ids) == [1, 2]
+
+    run(check)
+
+
+def test_get_user_orders_reads_both_tables(
+    run: Callable[[Check], None],
+) -> None:
+    """История объединяет таблицы и листается по `before_id`."""
+
+    async def check(session_factory: async_sessionmaker[AsyncSession]) -> None:
+        await seed(session_factory, 5)
+        async with session_factory() as session:
+            await OrderArchiveDAL.archive_batch(CUTOFF, 2, session)
+            first = await OrderArchiveDAL.get_user_orders(1, 3, session)
+            assert [(row['id'], row['archived']) for row in first] == [
+                (5, False),
+                (4, False),
+                (3, False),
+            ]
+            assert all(row['service_ids'] == [1, 2] for row in first)
+            assert all('idempotency_key' not in row for row in first)
+
+            second = await OrderArchiveDAL.get_user_orders(
+                1, 3, session, before_id=first[-1]['id']
+            )
+            assert [(row['id'], row['archived']) for row in second] == [
+                (2, True),
+                (1, True),
+            ]
+            assert all(row['service_ids'] == [1, 2] for row in second)
+            last = await OrderArchiveDAL.get_user_orders(
+                1, 3, session, before_id=1
+            )
+            assert last == []
+            assert await OrderArchiveDAL.get_user_orders(2, 3, session) == []
+
+    run(check)
+
+
+def test_archiver_stats(run: Callable[[Check], None]) -> None:
+    """Запуск переносит все пачки и попадает в метрики."""
+
+    async def check(session_factory: async_sessionmaker[AsyncSession]) -> None:
+        await seed(session_factory, 6)
+        archiver = OrderArchiver(
+            session_factory, after_days=30, batch_size=2, pause=0
+        )
+        first = await archiver.run_once()
+        assert (first.batches, first.orders_moved) == (3, 5)
+        assert first.services_moved == 10
+        second = await archiver.run_once()
+        assert (second.batches, second.orders_moved) == (0, 0)
+
+        stats = archiver.stats
+        assert (stats['orders_moved'], stats['services_moved']) == (5, 10)
+        assert [run['orders_moved'] for run in stats['runs']] == [0, 5]
+        async with session_factory() as session:
+            count = await session.scalar(select(func.count(OrderModel.id)))
+            assert count == 1
+
+    run(check)
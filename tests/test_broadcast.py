@@ -0,0 +1,109 @@
+"""Тесты рассылки с подмененным ботом."""
+
+# STDLIB
+import asyncio
+from pathlib import Path
+import time
+from typing import cast
+
+# THIRDPARTY
+from aiogram import Bot
+from aiogram.exceptions import TelegramForbiddenError, TelegramRetryAfter
+from aiogram.methods import SendMessage
+
+# FIRSTPARTY
+from app.models.models import UserModel
+from tests.conftest import DatabaseFactory
+from tg_bot.broadcast import BroadcastCheckpoint, Broadcaster, BroadcastStats
+
+
+class StubBot(object):
+    """Бот, который записывает отправки и выбрасывает заданные ошибки."""
+
+    def __init__(self, errors: dict[int, list[Exception]]) -> None:
+        """Запомнить ошибки, которые выбросит отправка по ID чата."""
+        self.errors = errors
+        self.sent: list[int] = []
+
+    async def send_message(self, chat_id: int, text: str) -> None:
+        """Выбросить очередную ошибку чата или записать отправку."""
+        if self.errors.get(chat_id):
+            raise self.errors[chat_id].pop(0)
+        self.sent.append(chat_id)
+
+
+def method(chat_id: int) -> SendMessage:
+    """Метод отправки для конструкторов исключений aiogram."""
+    return SendMessage(chat_id=chat_id, text='x')
+
+
+async def broadcast(
+    database: DatabaseFactory,
+    tmp_path: Path,
+    bot: StubBot,
+    users: int,
+    last_id: int = 0,
+    **kwargs: int,
+) -> BroadcastStats:
+    """Разослать сообщение `users` юзерам через подмененного бота."""
+    engine, session_factory = await database()
+    async with session_factory() as session:
+        session.add_all(UserModel(id=id_) for id_ in range(1, users + 1))
+        await session.commit()
+    checkpoint = BroadcastCheckpoint.load(str(tmp_path / 'state.json'))
+    checkpoint.last_id = last_id
+    broadcaster = Broadcaster(
+        cast(Bot, bot),
+        session_factory,
+        'text',
+        checkpoint,
+        rate=1000,
+        **kwargs,
+    )
+    try:
+        return await broadcaster.run()
+    finally:
+        await engine.dispose()
+
+
+def test_retry_after_pauses_and_resends(
+    database: DatabaseFactory, tmp_path: Path
+) -> None:
+    """После RetryAfter рассылка ждет и повторяет отправку."""
+    bot = StubBot({2: [TelegramRetryAfter(method(2), 'flood', retry_after=1)]})
+    started_at = time.monotonic()
+    stats = asyncio.run(broadcast(database, tmp_path, bot, 5))
+    assert time.monotonic() - started_at >= 1
+    assert sorted(bot.sent) == [1, 2, 3, 4, 5]
+    assert (stats.sent, stats.retried, stats.failed) == (5, 1, 0)
+
+
+def test_forbidden_and_unexpected_errors_are_counted(
+    database: DatabaseFactory, tmp_path: Path
+) -> None:
+    """Блокировка и неожиданные ошибки не останавливают воркеров."""
+    bot = StubBot(
+        {
+            2: [TelegramForbiddenError(method(2), 'blocked')],
+            3: [RuntimeError('network')],
+        }
+    )
+    stats = asyncio.run(
+        broadcast(database, tmp_path, bot, 6, workers=1, batch_size=2)
+    )
+    assert sorted(bot.sent) == [1, 4, 5, 6]
+    assert (stats.sent, stats.blocked, stats.failed) == (4, 1, 1)
+
+
+def test_resumes_from_checkpoint(
+    database: DatabaseFactory, tmp_path: Path
+) -> None:
+    """Рассылка продолжается с контрольной точки и сохраняет прогресс."""
+    bot = StubBot({})
+    asyncio.run(
+        broadcast(database, tmp_path, bot, 10, last_id=4, checkpoint_every=3)
+    )
+    assert sorted(bot.sent) == [5, 6, 7, 8, 9, 10]
+    saved = BroadcastCheckpoint.load(str(tmp_path / 'state.json'))
+    assert saved.last_id == 10
+    assert saved.stats.sent == 6
@@ -0,0 +1,112 @@
+"""Тесты сжатия ответов и раздачи хешированной статики."""
+
+# STDLIB
+from pathlib import Path
+
+# THIRDPARTY
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import pytest
+from starlette.responses import JSONResponse, PlainTextResponse
+
+# FIRSTPARTY
+from app.middlewares.compression import (
+    CompressionMiddleware,
+    negotiate_encoding,
+)
+from app.static_assets import IMMUTABLE_CACHE, HashedStaticFiles, StaticAssets
+
+BIG = {'items': ['строка'] * 200}
+
+
+@pytest.fixture
+def client() -> TestClient:
+    """Приложение с большим и маленьким JSON и текстовым ответом."""
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+
+    @app.get('/big')
+    async def big() -> JSONResponse:
+        return JSONResponse(BIG)
+
+    @app.get('/small')
+    async def small() -> JSONResponse:
+        return JSONResponse({'ok': True})
+
+    @app.get('/text')
+    async def text() -> PlainTextResponse:
+        return PlainTextResponse('x' * 1000)
+
+    return TestClient(app)
+
+
+@pytest.mark.parametrize(
+    ('header', 'expected'),
+    [
+        ('gzip, deflate, br', 'br'),
+        ('gzip;q=1.0, br;q=0', 'gzip'),
+        ('*', 'gzip'),
+        ('deflate', None),
+        ('', None),
+    ],
+)
+def test_negotiate_encoding(header: str, expected: str | None) -> None:
+    """Brotli предпочитается gzip, `q=0` исключает алгоритм."""
+    assert negotiate_encoding(header) == expected
+
+
+@pytest.mark.parametrize('encoding', ['gzip', 'br'])
+def test_large_json_is_compressed(client: TestClient, encoding: str) -> None:
+    """Большой JSON сжимается выбранным клиентом алгоритмом."""
+    response = client.get('/big', headers={'Accept-Encoding': encoding})
+    assert response.headers['content-encoding'] == encoding
+    assert 'accept-encoding' in response.headers['vary'].lower()
+    # httpx распаковывает тело по Content-Encoding
+    assert response.json() == BIG
+
+
+def test_small_and_other_responses_are_not_compressed(
+    client: TestClient,
+) -> None:
+    """Ответы меньше `minimum_size` и других типов не сжимаются."""
+    headers = {'Accept-Encoding': 'gzip'}
+    small = client.get('/small', headers=headers)
+    assert 'content-encoding' not in small.headers
+    assert small.json() == {'ok': True}
+    text = client.get('/text', headers=headers)
+    assert 'content-encoding' not in text.headers
+    assert text.text == 'x' * 1000
+
+
+def test_hashed_static_is_cached_and_precompressed(tmp_path: Path) -> None:
+    """Хешированный адрес отдается с ETag, долгим кешем и сжатием."""
+    (tmp_path / 'css').mkdir()
+    (tmp_path / 'css' / 'styles.css').write_text('body { color: red; }\n' * 50)
+    assets = StaticAssets(directory=str(tmp_path))
+    assets.build()
+    url = assets.url('css/styles.css')
+    assert url.startswith('/static/css/styles.')
+    assert url != '/static/css/styles.css'
+    assert assets.url('missing.css') == '/static/missing.css'
+
+    app = FastAPI()
+    app.mount(
+        '/static',
+        HashedStaticFiles(assets, directory=str(tmp_path)),
+        name='static',
+    )
+    client = TestClient(app)
+
+    response = client.get(url, headers={'Accept-Encoding': 'gzip'})
+    assert response.status_code == 200
+    assert response.headers['cache-control'] == IMMUTABLE_CACHE
+    assert response.headers['content-encoding'] == 'gzip'
+    assert response.text == 'body { color: red; }\n' * 50
+    etag = response.headers['etag']
+
+    cached = client.get(url, headers={'If-None-Match': etag})
+    assert cached.status_code == 304
+
+    plain = client.get('/static/css/styles.css')
+    assert plain.status_code == 200
+    assert plain.headers.get('cache-control') != IMMUTABLE_CACHE
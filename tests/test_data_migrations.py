@@ -0,0 +1,172 @@
+"""Тесты миграций данных пачками."""
+
+# STDLIB
+import asyncio
+from typing import Any, Optional
+
+# THIRDPARTY
+import pytest
+from sqlalchemy import Row, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+# FIRSTPARTY
+from app import cli
+from app.data_migrations.migrations import MIGRATIONS, StripUserNames
+from app.data_migrations.runner import (
+    DataMigration,
+    DataMigrationRunner,
+    get_statuses,
+)
+from app.events import OP_UPDATE, broker
+from app.models.models import DataMigrationModel, UserModel
+from tests.conftest import DatabaseFactory
+
+
+async def seed(session_factory: async_sessionmaker[AsyncSession]) -> None:
+    """Добавить юзеров 1..5, у нечетных ник с пробелами по краям."""
+    async with session_factory() as session:
+        session.add_all(
+            UserModel(id=id_, username=f' user_{id_} ' if id_ % 2 else 'ok')
+            for id_ in range(1, 6)
+        )
+        await session.commit()
+
+
+async def usernames(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> list[Optional[str]]:
+    """Ники юзеров по порядку ID."""
+    async with session_factory() as session:
+        result = await session.execute(
+            select(UserModel.username).order_by(UserModel.id)
+        )
+        return list(result.scalars())
+
+
+async def checkpoint(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> Optional[DataMigrationModel]:
+    """Контрольная точка миграции `strip-user-names`."""
+    async with session_factory() as session:
+        return await session.get(DataMigrationModel, StripUserNames.name)
+
+
+def test_changed_rows_are_published_and_resumable(
+    database: DatabaseFactory,
+) -> None:
+    """Измененные строки публикуются, прерванный запуск продолжается."""
+
+    async def check() -> None:
+        engine, session_factory = await database()
+        await seed(session_factory)
+        queue = broker.subscribe()
+        runner = DataMigrationRunner(
+            session_factory, StripUserNames(), batch_size=2, pause=0
+        )
+
+        progress = await runner.run(max_batches=1)
+        assert (progress.processed, progress.finished) == (2, False)
+        saved = await checkpoint(session_factory)
+        assert saved is not None
+        assert (saved.last_id, saved.processed, saved.changed) == (2, 2, 1)
+        assert saved.finished_at is None
+
+        progress = await runner.run()
+        assert (progress.processed, progress.changed) == (5, 3)
+        assert (progress.run_processed, progress.total) == (3, 5)
+        assert progress.finished
+
+        events = []
+        while not queue.empty():
+            events.append(queue.get_nowait())
+        broker.unsubscribe(queue)
+        assert [(e.op, e.row_id) for e in events] == [
+            (OP_UPDATE, 1),
+            (OP_UPDATE, 3),
+            (OP_UPDATE, 5),
+        ]
+        assert events[0].row['username'] == 'user_1'
+
+        finished = await runner.run()
+        assert (finished.processed, finished.finished) == (0, True)
+        await engine.dispose()
+
+    asyncio.run(check())
+
+
+def test_dry_run_writes_nothing(database: DatabaseFactory) -> None:
+    """Dry-run считает изменения, но ничего не записывает."""
+
+    async def check() -> None:
+        engine, session_factory = await database()
+        await seed(session_factory)
+        before = await usernames(session_factory)
+        queue = broker.subscribe()
+        runner = DataMigrationRunner(
+            session_factory,
+            StripUserNames(),
+            batch_size=2,
+            pause=0,
+            dry_run=True,
+        )
+        progress = await runner.run()
+        broker.unsubscribe(queue)
+        assert (progress.processed, progress.changed) == (5, 3)
+        assert progress.finished
+        assert queue.empty()
+        assert await usernames(session_factory) == before
+        assert await checkpoint(session_factory) is None
+        await engine.dispose()
+
+    asyncio.run(check())
+
+
+def test_statuses_and_restart(
+    database: DatabaseFactory, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Состояние миграций и `--restart` с новым проходом по таблице."""
+    engine, session_factory = asyncio.run(database())
+    asyncio.run(seed(session_factory))
+    monkeypatch.setattr(cli, 'new_session', session_factory)
+
+    def status() -> dict[str, Any]:
+        statuses = asyncio.run(get_statuses(session_factory, MIGRATIONS))
+        return next(
+            item for item in statuses if item['name'] == StripUserNames.name
+        )
+
+    assert status()['status'] == 'не запускалась'
+    migrate = ['data-migrate', StripUserNames.name, '--pause', '0']
+    cli.main([*migrate, '--batch-size', '2', '--max-batches', '1'])
+    assert status()['status'] == 'прервана на ID 2'
+    assert (status()['processed'], status()['changed']) == (2, 1)
+
+    cli.main(migrate)
+    assert status()['status'].startswith('выполнена')
+    assert (status()['processed'], status()['changed']) == (5, 3)
+    stripped = asyncio.run(usernames(session_factory))
+    assert stripped == ['user_1', 'ok', 'user_3', 'ok', 'user_5']
+
+    cli.main([*migrate, '--restart'])
+    assert status()['status'].startswith('выполнена')
+    assert (status()['processed'], status()['changed']) == (5, 0)
+    asyncio.run(engine.dispose())
+
+
+def test_migration_requires_transform_and_model() -> None:
+    """Нужны реализация `transform` и модель у DAL миграции."""
+
+    class Incomplete(DataMigration):
+        name = 'incomplete'
+
+    class WithoutModel(DataMigration):
+        name = 'without-model'
+
+        def transform(self, row: Row) -> Optional[dict[str, Any]]:
+            """Ничего не менять."""
+            return None
+
+    with pytest.raises(TypeError):
+        Incomplete()  # type: ignore[abstract]
+    with pytest.raises(TypeError, match='не задана модель'):
+        WithoutModel().model
@@ -0,0 +1,84 @@
+"""Тесты брокера событий изменений."""
+
+# STDLIB
+import asyncio
+from typing import Optional
+
+# THIRDPARTY
+import pytest
+
+# FIRSTPARTY
+from app.events import OP_INSERT, ChangeBroker, ChangeEvent
+
+
+def drain(queue: asyncio.Queue) -> list[Optional[ChangeEvent]]:
+    """Забрать все события, уже лежащие в очереди."""
+    return [queue.get_nowait() for _ in range(queue.qsize())]
+
+
+def publish(broker: ChangeBroker, count: int) -> None:
+    """Опубликовать `count` вставок строк с ID от 1."""
+    for row_id in range(1, count + 1):
+        broker.publish('users', OP_INSERT, row_id, {'id': row_id})
+
+
+def test_subscriber_replays_missed_events() -> None:
+    """С `Last-Event-ID` приходят пропущенные события, затем новые."""
+    broker = ChangeBroker()
+    publish(broker, 3)
+    queue = broker.subscribe(f'{broker.epoch}-1')
+    assert [event.id for event in drain(queue) if event] == [2, 3]
+    broker.publish('users', OP_INSERT, 4)
+    (event,) = drain(queue)
+    assert event is not None
+    assert event.to_sse().startswith(f'id: {broker.epoch}-4\n')
+
+
+def test_subscriber_without_last_event_id_gets_only_new_events() -> None:
+    """Без `Last-Event-ID` история не пересылается."""
+    broker = ChangeBroker()
+    publish(broker, 3)
+    queue = broker.subscribe()
+    assert drain(queue) == []
+    assert queue in broker.subscribers
+
+
+@pytest.mark.parametrize(
+    ('history_size', 'queue_size', 'last_event_id'),
+    [
+        # Событие выпущено другим запуском процесса
+        (10, 10, 'other-1'),
+        # Пропущенные события уже вытеснены из буфера
+        (2, 10, '{epoch}-1'),
+        # Пропущено больше, чем помещается в очередь подписчика
+        (10, 2, '{epoch}-1'),
+        # Неразборчивый ID
+        (10, 10, 'garbage'),
+    ],
+)
+def test_subscriber_that_cannot_catch_up_gets_reset(
+    history_size: int, queue_size: int, last_event_id: str
+) -> None:
+    """Если пропуски не восстановить, подписчик получает только сброс."""
+    broker = ChangeBroker(history_size=history_size, queue_size=queue_size)
+    publish(broker, 5)
+    queue = broker.subscribe(last_event_id.format(epoch=broker.epoch))
+    assert drain(queue) == [None]
+    assert queue not in broker.subscribers
+
+
+def test_slow_subscriber_is_reset_and_dropped() -> None:
+    """Переполненная очередь подписчика получает сброс и отписывается."""
+    broker = ChangeBroker(queue_size=2)
+    slow = broker.subscribe()
+    fast = broker.subscribe()
+    publish(broker, 2)
+    drain(fast)
+    broker.publish('users', OP_INSERT, 3)
+    assert [event.id if event else None for event in drain(slow)] == [
+        1,
+        2,
+        None,
+    ]
+    assert [event.id for event in drain(fast) if event] == [3]
+    assert broker.subscribers == {fast}
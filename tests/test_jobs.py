@@ -0,0 +1,194 @@
+"""Тесты очередей фоновых задач и воркера."""
+
+# STDLIB
+import asyncio
+
+# THIRDPARTY
+from fastapi.testclient import TestClient
+import pytest
+
+# FIRSTPARTY
+from app.jobs import runtime
+from app.jobs.queue import DatabaseJobQueue, Job, MemoryJobQueue
+from app.jobs.worker import JobWorker
+from app.models.models import UserModel
+from app.routes.user_route import router as user_router
+from tests.conftest import DatabaseFactory, api_app
+
+
+class RecordingQueue(MemoryJobQueue):
+    """Очередь в памяти, запоминающая паузы перед повторами."""
+
+    def __init__(self) -> None:
+        """Создать пустую очередь без повторов."""
+        super().__init__()
+        self.delays: list[float] = []
+        self.acked: list[Job] = []
+
+    async def retry(self, job: Job, delay: float, error: str) -> None:
+        """Запомнить паузу и сразу вернуть задачу в очередь."""
+        self.delays.append(delay)
+        self.queue.put_nowait(job)
+
+    async def ack(self, job: Job) -> None:
+        """Запомнить выполненную задачу."""
+        self.acked.append(job)
+
+
+def test_database_queue_puts_job_with_caller_transaction(
+    database: DatabaseFactory,
+) -> None:
+    """Задача в БД появляется только вместе с коммитом вызывающего кода."""
+
+    async def check() -> None:
+        engine, session_factory = await database()
+        queue = DatabaseJobQueue(session_factory)
+
+        async with session_factory() as session:
+            session.add(UserModel(id=1))
+            await queue.put(Job(name='rolled_back'), session)
+            await session.rollback()
+        assert await queue._claim() is None
+        assert not queue.wakeup.is_set()
+
+        async with session_factory() as session:
+            session.add(UserModel(id=1))
+            await queue.put(Job(name='committed', payload={'x': 1}), session)
+            assert await queue._claim() is None
+            await session.commit()
+        assert queue.wakeup.is_set()
+        job = await queue._claim()
+        assert job is not None
+        assert (job.name, job.payload) == ('committed', {'x': 1})
+        # Задача в работе не забирается повторно до таймаута видимости
+        assert await queue._claim() is None
+        await engine.dispose()
+
+    asyncio.run(check())
+
+
+def test_memory_queue_waits_for_commit(database: DatabaseFactory) -> None:
+    """Задача в памяти ставится после коммита сессии."""
+
+    async def check() -> None:
+        engine, session_factory = await database()
+        queue = MemoryJobQueue()
+        async with session_factory() as session:
+            await queue.put(Job(name='welcome'), session)
+            assert queue.queue.empty()
+            await session.commit()
+        assert (await queue.get()).name == 'welcome'
+        await engine.dispose()
+
+    asyncio.run(check())
+
+
+def test_memory_queue_drops_job_of_rolled_back_transaction(
+    database: DatabaseFactory,
+) -> None:
+    """После отката задача не ставится и следующим коммитом сессии."""
+
+    async def check() -> None:
+        engine, session_factory = await database()
+        queue = MemoryJobQueue()
+        async with session_factory() as session:
+            session.add(UserModel(id=1))
+            await queue.put(Job(name='rolled_back'), session)
+            await session.rollback()
+            session.add(UserModel(id=2))
+            await queue.put(Job(name='committed'), session)
+            await session.commit()
+        async with session_factory() as session:
+            await queue.put(Job(name='closed'), session)
+        async with session:
+            session.add(UserModel(id=3))
+            await session.commit()
+        assert [queue.queue.get_nowait().name] == ['committed']
+        assert queue.queue.empty()
+        await engine.dispose()
+
+    asyncio.run(check())
+
+
+@pytest.mark.parametrize(
+    ('failures', 'delays', 'failed'),
+    [
+        (2, [1.0, 2.0], False),
+        (10, [1.0, 2.0, 3.0], True),
+    ],
+)
+def test_worker_retries_with_backoff(
+    failures: int, delays: list[float], failed: bool
+) -> None:
+    """Пауза перед повтором растет вдвое до предела `max_retry_delay`."""
+    calls: list[int] = []
+
+    async def flaky(n: int) -> None:
+        calls.append(n)
+        if len(calls) <= failures:
+            raise RuntimeError('boom')
+
+    async def check() -> None:
+        queue = RecordingQueue()
+        worker = JobWorker(
+            queue, {'flaky': flaky}, retry_delay=1.0, max_retry_delay=3.0
+        )
+        await queue.put(Job(name='flaky', payload={'n': 1}, max_attempts=4))
+        while not queue.queue.empty():
+            await worker.execute(await queue.get())
+        assert queue.delays == delays
+        assert bool(queue.failed) == failed
+        assert len(queue.acked) == (0 if failed else 1)
+        if failed:
+            job, error = queue.failed[0]
+            assert (job.attempts, error) == (4, 'RuntimeError: boom')
+
+    asyncio.run(check())
+
+
+def test_worker_runs_retried_job_from_queue() -> None:
+    """Запущенный воркер выполняет задачу после повтора по таймеру."""
+    done = asyncio.Event()
+    attempts: list[int] = []
+
+    async def flaky() -> None:
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise RuntimeError('boom')
+        done.set()
+
+    async def check() -> None:
+        queue = MemoryJobQueue()
+        worker = JobWorker(queue, {'flaky': flaky}, retry_delay=0.01)
+        await worker.start()
+        await queue.put(Job(name='flaky'))
+        await asyncio.wait_for(done.wait(), timeout=5)
+        await worker.stop()
+        assert len(attempts) == 3
+        assert not queue.failed
+
+    asyncio.run(check())
+
+
+def test_add_user_enqueues_follow_ups_after_commit(
+    database: DatabaseFactory, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Регистрация ставит приветствие и уведомление админам."""
+    queue = MemoryJobQueue()
+    monkeypatch.setattr(runtime, 'get_job_queue', lambda: queue)
+    engine, session_factory = asyncio.run(database())
+    app = api_app(session_factory, user_router)
+    user = {'id': 7, 'username': 'ivan', 'first_name': 'Иван'}
+    user['last_name'] = 'Петров'
+    with TestClient(app) as client:
+        assert client.post('/api/v1/users', json=user).json()['status'] == 200
+        assert client.post('/api/v1/users', json=user).json()['status'] == 400
+
+    jobs = [queue.queue.get_nowait() for _ in range(queue.queue.qsize())]
+    welcome = 'Привет! Петров Иван Добро пожаловать на мой бот.'
+    assert [(job.name, job.payload) for job in jobs] == [
+        ('send_message', {'chat_id': 7, 'text': welcome}),
+        ('notify_admins', {'text': 'Новый пользователь: ivan'}),
+        ('send_message', {'chat_id': 7, 'text': welcome}),
+    ]
+    asyncio.run(engine.dispose())
@@ -0,0 +1,173 @@
+"""Тесты заказов с ключами идемпотентности и их архивации."""
+
+# STDLIB
+import asyncio
+from datetime import datetime
+from typing import Iterator, Optional
+
+# THIRDPARTY
+from fastapi.testclient import TestClient
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+# FIRSTPARTY
+from app.DAL.OrderArchiveDAL import OrderArchiveDAL
+from app.DAL.OrderDAL import OrderDAL
+from app.models.models import (
+    OrderModel,
+    ServiceModel,
+    UserModel,
+    UserOrderStatsModel,
+)
+from app.routes.order_route import router as order_router
+from app.schemas.schemas import OrderCreateSchema
+from tests.conftest import DatabaseFactory, api_app
+
+ORDER = {'user_id': 1, 'service_ids': [1, 2]}
+
+
+async def seed(session_factory: async_sessionmaker[AsyncSession]) -> None:
+    """Добавить пользователя 1 и услуги 1 и 2 по 10."""
+    async with session_factory() as session:
+        session.add(UserModel(id=1))
+        session.add_all(
+            ServiceModel(
+                id=id_, service_name=str(id_), service_cost=10, service_time=1
+            )
+            for id_ in (1, 2)
+        )
+        await session.commit()
+
+
+async def count_orders(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> tuple[int, Optional[int]]:
+    """Число заказов и число заказов пользователя 1 в сводке."""
+    async with session_factory() as session:
+        orders = await session.scalar(select(func.count(OrderModel.id)))
+        stats = await session.get(UserOrderStatsModel, 1)
+    return orders or 0, stats.orders_count if stats else None
+
+
+@pytest.fixture
+def orders_api(
+    database: DatabaseFactory,
+) -> Iterator[tuple[TestClient, async_sessionmaker[AsyncSession]]]:
+    """Клиент маршрутов заказов поверх базы с пользователем и услугами."""
+    engine, session_factory = asyncio.run(database())
+    asyncio.run(seed(session_factory))
+    yield TestClient(api_app(session_factory, order_router)), session_factory
+    asyncio.run(engine.dispose())
+
+
+def test_archived_order_keeps_idempotency_key(
+    database: DatabaseFactory,
+) -> None:
+    """Ключ заказа, перенесенного в архив, по-прежнему находит заказ."""
+
+    async def check() -> None:
+        engine, session_factory = await database()
+        await seed(session_factory)
+        async with session_factory() as session:
+            data = OrderCreateSchema(
+                user_id=1, service_ids=[1, 2], ends_at=datetime(2024, 1, 1)
+            )
+            order, _ = await OrderDAL.add_one_order(
+                data, {1: 10, 2: 10}, session, 'key-1'
+            )
+            # Заказ с максимальным ID в архив не переносится
+            await OrderDAL.add_one_order(data, {1: 10}, session)
+            await OrderDAL.set_active(order.id, False, session)
+            archived, _ = await OrderArchiveDAL.archive_batch(
+                datetime(2025, 1, 1), 10, session
+            )
+            assert archived == 1
+            assert (
+                await OrderDAL.get_by_idempotency_key('key-1', session) is None
+            )
+
+            existing = await OrderArchiveDAL.get_by_idempotency_key(
+                'key-1', session
+            )
+            assert existing is not None
+            assert existing.id == order.id
+            service_ids = await OrderArchiveDAL.get_service_ids(
+                order.id, session
+            )
+            assert sorted(service_ids) == [1, 2]
+        await engine.dispose()
+
+    asyncio.run(check())
+
+
+def test_order_replay_returns_same_order(
+    orders_api: tuple[TestClient, async_sessionmaker[AsyncSession]],
+) -> None:
+    """Повтор запроса с тем же ключом возвращает созданный заказ."""
+    client, session_factory = orders_api
+    headers = {'Idempotency-Key': 'key-1'}
+    created = client.post('/api/v1/orders', json=ORDER, headers=headers)
+    replayed = client.post('/api/v1/orders', json=ORDER, headers=headers)
+    assert (created.status_code, replayed.status_code) == (201, 200)
+    assert replayed.json() == created.json()
+    assert created.json()['service_ids'] == [1, 2]
+    assert asyncio.run(count_orders(session_factory)) == (1, 1)
+
+
+def test_order_key_reused_with_other_body_conflicts(
+    orders_api: tuple[TestClient, async_sessionmaker[AsyncSession]],
+) -> None:
+    """Ключ, использованный для другого заказа, дает 409."""
+    client, session_factory = orders_api
+    headers = {'Idempotency-Key': 'key-1'}
+    client.post('/api/v1/orders', json=ORDER, headers=headers)
+    other = {'user_id': 1, 'service_ids': [1]}
+    response = client.post('/api/v1/orders', json=other, headers=headers)
+    assert response.status_code == 409
+    assert asyncio.run(count_orders(session_factory)) == (1, 1)
+
+
+def test_order_with_duplicate_services_is_rejected(
+    orders_api: tuple[TestClient, async_sessionmaker[AsyncSession]],
+) -> None:
+    """Повторяющиеся услуги отклоняются с 422 до записи в БД."""
+    client, session_factory = orders_api
+    order = {'user_id': 1, 'service_ids': [2, 1, 2, 1]}
+    response = client.post('/api/v1/orders', json=order)
+    assert response.status_code == 422
+    assert response.json()['service_ids'] == [1, 2]
+    assert asyncio.run(count_orders(session_factory)) == (0, None)
+
+
+def test_concurrent_order_with_same_key_returns_winner(
+    orders_api: tuple[TestClient, async_sessionmaker[AsyncSession]],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Проигравший гонку запрос откатывается и отдает чужой заказ.
+
+    Параллельный запрос с тем же ключом имитируется так: проверка
+    ключа в маршруте ничего не находит, а заказ с этим ключом уже
+    записан, поэтому вставка падает на уникальном индексе.
+    """
+    client, session_factory = orders_api
+    headers = {'Idempotency-Key': 'key-1'}
+    winner = client.post('/api/v1/orders', json=ORDER, headers=headers)
+    get_by_key = OrderDAL.get_by_idempotency_key
+    calls: list[str] = []
+
+    async def miss_first(
+        key: str, session: AsyncSession
+    ) -> Optional[OrderModel]:
+        calls.append(key)
+        if len(calls) == 1:
+            return None
+        return await get_by_key(key, session)
+
+    monkeypatch.setattr(OrderDAL, 'get_by_idempotency_key', miss_first)
+    response = client.post('/api/v1/orders', json=ORDER, headers=headers)
+    assert response.status_code == 200
+    assert response.json() == winner.json()
+    assert calls == ['key-1', 'key-1']
+    # Откат проигравшего не оставил ни заказа, ни строк в сводках
+    assert asyncio.run(count_orders(session_factory)) == (1, 1)
@@ -0,0 +1,94 @@
+"""Тесты легких моделей строк и страниц списков на них."""
+
+# STDLIB
+import asyncio
+from pathlib import Path
+from typing import Iterator
+
+# THIRDPARTY
+from fastapi.testclient import TestClient
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+# FIRSTPARTY
+import app
+from app.DAL.BaseDAL import UserDAL
+from app.DAL.OrderDAL import OrderDAL
+from app.DAL.ServiceDAL import ServiceDAL
+from app.models.models import ServiceModel, UserModel
+from app.models.read_models import ServiceRow, UserRow
+from app.routes.service_route import router as service_router
+from app.routes.user_route import router as user_router
+from tests.conftest import DatabaseFactory, api_app
+
+
+async def seed(session_factory: async_sessionmaker[AsyncSession]) -> None:
+    """Добавить администратора 1, юзера 2 и услугу на 30 минут."""
+    async with session_factory() as session:
+        session.add_all(
+            [
+                UserModel(id=1, username='admin', is_admin=True),
+                UserModel(id=2, username='user_2', first_name='Иван'),
+                ServiceModel(
+                    id=1,
+                    service_name='Стрижка',
+                    service_cost=500,
+                    service_time=1800,
+                ),
+            ]
+        )
+        await session.commit()
+
+
+@pytest.fixture
+def session_factory(
+    database: DatabaseFactory,
+) -> Iterator[async_sessionmaker[AsyncSession]]:
+    """Фабрика сессий базы с администратором, юзером и услугой."""
+    engine, session_factory = asyncio.run(database())
+    asyncio.run(seed(session_factory))
+    yield session_factory
+    asyncio.run(engine.dispose())
+
+
+def test_get_all_rows(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    """Строки читаются в модели `row_model` в порядке их полей."""
+
+    async def check() -> None:
+        async with session_factory() as session:
+            users = await UserDAL.get_all_rows(session)
+            services = await ServiceDAL.get_all_rows(session)
+            assert users == [
+                UserRow(1, 'admin', None, None, True),
+                UserRow(2, 'user_2', 'Иван', None, False),
+            ]
+            assert services == [ServiceRow(1, 'Стрижка', 500, 1800)]
+            with pytest.raises(TypeError, match='не задана row_model'):
+                await OrderDAL.get_all_rows(session)
+
+    asyncio.run(check())
+
+
+def test_list_pages_render_rows(
+    session_factory: async_sessionmaker[AsyncSession],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Страницы списков выводят поля строк."""
+    # Шаблоны ищутся относительно каталога приложения, как при запуске
+    monkeypatch.chdir(Path(app.__file__).parent)
+    client = TestClient(api_app(session_factory, user_router, service_router))
+
+    users = client.get('/api/v1/users', params={'cur_user_id': 1})
+    assert users.status_code == 200
+    assert 'user_2' in users.text
+    assert 'Иван' in users.text
+
+    services = client.get('/api/v1/services', params={'cur_user_id': 1})
+    assert services.status_code == 200
+    assert 'Стрижка' in services.text
+    assert '30 минут' in services.text
+
+    denied = client.get('/api/v1/users', params={'cur_user_id': 3})
+    assert denied.status_code == 401
@@ -0,0 +1,113 @@
+"""Тесты хранилищ бота и отсечения повторных апдейтов."""
+
+# STDLIB
+import asyncio
+
+# THIRDPARTY
+from aiogram import Bot, Dispatcher, Router
+from aiogram.fsm.storage.redis import RedisStorage
+from aiogram.types import Message, Update
+import fakeredis
+import pytest
+
+# FIRSTPARTY
+from tg_bot.middlewares.dedup import UpdateDedupMiddleware
+from tg_bot.settings.settings import BotSettings
+from tg_bot.storage import (
+    MemoryUpdateDeduplicator,
+    RedisUpdateDeduplicator,
+    UpdateDeduplicator,
+    build_storage,
+)
+
+
+def make_update(update_id: int, bot: Bot) -> Update:
+    """Апдейт с текстовым сообщением."""
+    return Update.model_validate(
+        {
+            'update_id': update_id,
+            'message': {
+                'message_id': 1,
+                'date': 0,
+                'chat': {'id': 7, 'type': 'private'},
+                'text': 'hi',
+            },
+        },
+        context={'bot': bot},
+    )
+
+
+def redis_settings() -> BotSettings:
+    """Настройки с хранилищем в Redis."""
+    return BotSettings(FSM_STORAGE='redis', UPDATE_DEDUP_TTL=60)
+
+
+@pytest.mark.parametrize('backend', ['memory', 'redis'])
+def test_deduplicator_claims_once_and_releases(backend: str) -> None:
+    """Апдейт занимается один раз, снятая отметка позволяет повтор."""
+
+    async def check() -> None:
+        deduplicator: UpdateDeduplicator
+        if backend == 'memory':
+            deduplicator = MemoryUpdateDeduplicator(ttl=60)
+        else:
+            deduplicator = RedisUpdateDeduplicator(
+                fakeredis.FakeAsyncRedis(), ttl=60
+            )
+        assert await deduplicator.claim(1)
+        assert not await deduplicator.claim(1)
+        await deduplicator.release(1)
+        assert await deduplicator.claim(1)
+
+    asyncio.run(check())
+
+
+def test_redis_storage_shares_client_and_keeps_it_open() -> None:
+    """Хранилища Redis делят один клиент, и close его не закрывает."""
+
+    async def check() -> None:
+        redis = fakeredis.FakeAsyncRedis()
+        storage = build_storage(redis_settings(), redis=redis)
+        assert isinstance(storage.fsm, RedisStorage)
+        assert storage.fsm.redis is redis
+        assert storage.deduplicator.redis is redis
+        await storage.close()
+        # Клиент закрывает Dispatcher вместе с RedisStorage
+        assert await redis.ping()
+
+    asyncio.run(check())
+
+
+def test_dispatcher_skips_duplicates_and_retries_failures() -> None:
+    """Dispatcher пропускает дубликаты, но повторяет упавший апдейт."""
+    calls: list[int] = []
+    router = Router()
+
+    @router.message()
+    async def handle(message: Message) -> None:
+        calls.append(message.message_id)
+        if len(calls) == 1:
+            raise RuntimeError('handler failed')
+
+    async def check() -> None:
+        storage = build_storage(
+            redis_settings(), redis=fakeredis.FakeAsyncRedis()
+        )
+        dp = Dispatcher(
+            storage=storage.fsm, events_isolation=storage.events_isolation
+        )
+        middleware = UpdateDedupMiddleware(storage.deduplicator)
+        dp.update.outer_middleware(middleware)
+        dp.include_router(router)
+        bot = Bot(token='42:test')
+
+        with pytest.raises(RuntimeError):
+            await dp.feed_update(bot, make_update(1, bot))
+        # Повторная доставка упавшего апдейта обрабатывается заново
+        await dp.feed_update(bot, make_update(1, bot))
+        await dp.feed_update(bot, make_update(1, bot))
+        assert len(calls) == 2
+        assert middleware.duplicates == 1
+        await bot.session.close()
+
+    asyncio.run(check())
@@ -0,0 +1,103 @@
+"""Тесты ограничения частоты сообщений бота."""
+
+# STDLIB
+import asyncio
+from typing import Any
+
+# THIRDPARTY
+from aiogram.types import Message, TelegramObject, User
+import pytest
+
+# FIRSTPARTY
+from tg_bot.middlewares.throttling import ThrottlingMiddleware
+
+
+def make_message(user_id: int) -> Message:
+    """Сообщение юзера в личном чате."""
+    return Message.model_validate(
+        {
+            'message_id': 1,
+            'date': 0,
+            'chat': {'id': user_id, 'type': 'private'},
+            'from': {'id': user_id, 'is_bot': False, 'first_name': 'u'},
+            'text': 'hi',
+        }
+    )
+
+
+def feed(middleware: ThrottlingMiddleware, user_ids: list[int]) -> list[int]:
+    """Пропустить сообщения через middleware, вернуть обработанных юзеров."""
+    handled: list[int] = []
+
+    async def handler(event: TelegramObject, data: dict[str, Any]) -> None:
+        handled.append(data['event_from_user'].id)
+
+    async def run() -> None:
+        for user_id in user_ids:
+            user = User(id=user_id, is_bot=False, first_name='u')
+            await middleware(
+                handler, make_message(user_id), {'event_from_user': user}
+            )
+
+    asyncio.run(run())
+    return handled
+
+
+@pytest.fixture
+def answers(monkeypatch: pytest.MonkeyPatch) -> list[tuple[int, str]]:
+    """Ответы бота, перехваченные вместо отправки в Telegram."""
+    sent: list[tuple[int, str]] = []
+
+    async def answer(self: Message, text: str, **kwargs: object) -> None:
+        sent.append((self.chat.id, text))
+
+    monkeypatch.setattr(Message, 'answer', answer)
+    return sent
+
+
+def test_user_bucket_limits_each_user_separately(
+    answers: list[tuple[int, str]],
+) -> None:
+    """Флуд одного юзера не мешает другим, лишнее отбрасывается молча."""
+    middleware = ThrottlingMiddleware(0.001, 2, 100, 100)
+    assert feed(middleware, [1, 1, 1, 2, 1]) == [1, 1, 2]
+    assert middleware.counters['user_limited'] == 2
+    assert middleware.stats['tracked_users'] == 2
+    assert answers == []
+
+
+def test_global_bucket_limits_all_users(
+    answers: list[tuple[int, str]],
+) -> None:
+    """Общий лимит отбрасывает сообщения, не расходуя токены юзера."""
+    middleware = ThrottlingMiddleware(0.001, 1, 0.001, 2)
+    assert feed(middleware, [1, 2, 3]) == [1, 2]
+    assert middleware.counters['global_limited'] == 1
+    assert middleware.user_buckets[3].tokens == pytest.approx(1)
+
+
+def test_reply_is_sent_once_per_flood(
+    answers: list[tuple[int, str]],
+) -> None:
+    """Ответ о лимите уходит один раз, пока юзер не пройдет лимит снова."""
+    middleware = ThrottlingMiddleware(0.001, 1, 100, 100, 'Подождите')
+    assert feed(middleware, [1, 1, 1, 2, 2]) == [1, 2]
+    assert answers == [(1, 'Подождите'), (2, 'Подождите')]
+    assert middleware.counters['notified'] == 2
+
+
+def test_events_without_user_are_not_limited() -> None:
+    """События без пользователя проходят без корзин."""
+    middleware = ThrottlingMiddleware(0.001, 1, 0.001, 1)
+    handled: list[TelegramObject] = []
+
+    async def handler(event: TelegramObject, data: dict[str, Any]) -> None:
+        handled.append(event)
+
+    async def run() -> None:
+        for _ in range(3):
+            await middleware(handler, make_message(1), {})
+
+    asyncio.run(run())
+    assert len(handled) == 3
+    assert not middleware.user_buckets
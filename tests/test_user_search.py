@@ -0,0 +1,82 @@
+"""Тесты поиска пользователей на индексе FTS5."""
+
+# STDLIB
+import asyncio
+
+# THIRDPARTY
+from sqlalchemy import text
+
+# FIRSTPARTY
+from app.DAL.UserSearchDAL import UserSearchDAL, load_search_ddl
+from app.models.models import UserModel
+from tests.conftest import DatabaseFactory
+
+
+async def search_pages(
+    database: DatabaseFactory,
+    users: list[UserModel],
+    query: str,
+    per_page: int,
+) -> list[list[int]]:
+    """Наполнить базу с индексом поиска и пройти все страницы выдачи.
+
+    Параметры:
+        database (DatabaseFactory): Фабрика тестовой базы.
+        users (list[UserModel]): Пользователи для поиска.
+        query (str): Строка поиска.
+        per_page (int): Количество записей на странице.
+
+    Возвращаемое значение:
+        list[list[int]]: ID найденных пользователей по страницам.
+    """
+    engine, session_factory = await database()
+    async with engine.begin() as connection:
+        for statement in load_search_ddl():
+            await connection.execute(text(statement))
+    async with session_factory() as session:
+        session.add_all(users)
+        await session.commit()
+    pages: list[list[int]] = []
+    async with session_factory() as session:
+        has_next = True
+        while has_next:
+            found, has_next = await UserSearchDAL.search(
+                query, len(pages) + 1, per_page, session
+            )
+            pages.append([user.id for user in found])
+    await engine.dispose()
+    return pages
+
+
+def test_exact_search_pages_by_id(database: DatabaseFactory) -> None:
+    """Точные совпадения разбиваются на страницы по порядку ID."""
+    users = [
+        UserModel(id=id_, username=f'user_{id_}', first_name='Иван')
+        for id_ in range(1, 6)
+    ]
+    users.append(UserModel(id=6, username='other', first_name='Петр'))
+    pages = asyncio.run(search_pages(database, users, 'иван', 2))
+    assert pages == [[1, 2], [3, 4], [5]]
+
+
+def test_fuzzy_search_paginates(database: DatabaseFactory) -> None:
+    """Нечеткий поиск используется на всех страницах выдачи."""
+    users = [
+        UserModel(id=id_, username=f'user_{id_}', first_name='Karitonov')
+        for id_ in range(1, 6)
+    ]
+    users.append(UserModel(id=6, username='other', first_name='Petrov'))
+    # Опечатка: точных совпадений нет, все страницы - нечеткий поиск
+    pages = asyncio.run(search_pages(database, users, 'karitonq', 2))
+    assert pages == [[1, 2], [3, 4], [5]]
+
+
+def test_short_terms_match_substrings(database: DatabaseFactory) -> None:
+    """Слова короче триграммы ищутся подстрокой."""
+    users = [
+        UserModel(id=1, username='ivan', first_name='Mark'),
+        UserModel(id=2, username='ivan', first_name='Amir'),
+        UserModel(id=3, username='ivan', first_name='Oleg'),
+    ]
+    pages = asyncio.run(search_pages(database, users, 'ivan mi', 10))
+    assert pages == [[2]]
@@ -0,0 +1,46 @@
+"""Тесты проверки секрета webhook."""
+
+# THIRDPARTY
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import pytest
+
+# FIRSTPARTY
+from app.routes import webhook_route
+from tg_bot.settings.settings import get_settings
+
+
+def post_update(secret: str | None) -> int:
+    """Отправить пустой апдейт в webhook и вернуть код ответа."""
+    app = FastAPI()
+    app.include_router(webhook_route.router)
+    headers = {}
+    if secret is not None:
+        headers['X-Telegram-Bot-Api-Secret-Token'] = secret
+    with TestClient(app) as client:
+        response = client.post(
+            get_settings().WEBHOOK_PATH,
+            json={'update_id': 1},
+            headers=headers,
+        )
+    return response.status_code
+
+
+@pytest.mark.parametrize('secret', [None, '', 'guess'])
+def test_webhook_rejects_updates_without_configured_secret(
+    monkeypatch: pytest.MonkeyPatch, secret: str | None
+) -> None:
+    """Без WEBHOOK_SECRET в настройках любой апдейт отклоняется."""
+    monkeypatch.setattr(get_settings(), 'WEBHOOK_SECRET', None)
+    assert post_update(secret) == 401
+
+
+def test_webhook_checks_secret_header(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Апдейт принимается только с совпадающим секретом."""
+    monkeypatch.setattr(get_settings(), 'WEBHOOK_SECRET', 'expected')
+    monkeypatch.setattr(webhook_route, 'process_update', lambda update: None)
+    assert post_update(None) == 401
+    assert post_update('wrong') == 401
+    assert post_update('expected') == 200
@@ -2,41 +2,84 @@
 
 # STDLIB
 import asyncio
+from functools import lru_cache
 import logging
 
 # THIRDPARTY
-from aiogram import Bot, Dispatcher
+from aiogram import Bot, Dispatcher, Router
 from aiogram.filters import Command
 from aiogram.types import KeyboardButton, Message, ReplyKeyboardMarkup
 from aiogram.types.web_app_info import WebAppInfo
 import httpx
 
 # FIRSTPARTY
-from tg_bot.settings.settings import BotSettings
+from tg_bot.middlewares.dedup import UpdateDedupMiddleware
+from tg_bot.middlewares.throttling import ThrottlingMiddleware
+from tg_bot.settings.settings import get_settings
+from tg_bot.storage import BotStorage, build_storage
 
-bot_settings = BotSettings()
-API_TOKEN = bot_settings.TG_BOT_TOKEN
-FASTAPI_URL = bot_settings.FASTAPI_URL
-BASE_NGROK_URL = bot_settings.BASE_NGROK_URL
+logger = logging.getLogger(__name__)
 
+router = Router()
 
-bot = Bot(token=API_TOKEN)
-dp = Dispatcher()
 
-logging.basicConfig(
-    level=logging.DEBUG,  # Уровень логирования (можно изменить на DEBUG для отладки)
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-)
-logger = logging.getLogger(__name__)
+@lru_cache
+def get_bot() -> Bot:
+    """Бот, создается при первом обращении."""
+    return Bot(token=get_settings().TG_BOT_TOKEN)
+
+
+@lru_cache
+def get_storage() -> BotStorage:
+    """Хранилища FSM, блокировок и отметок об апдейтах."""
+    return build_storage(get_settings())
+
+
+@lru_cache
+def get_http_client() -> httpx.AsyncClient:
+    """Общий клиент держит соединения с FastAPI открытыми."""
+    return httpx.AsyncClient(base_url=get_settings().FASTAPI_URL, timeout=10)
+
 
-@dp.message(Command('start'))
+@lru_cache
+def get_throttling() -> ThrottlingMiddleware:
+    """Ограничитель частоты сообщений."""
+    settings = get_settings()
+    return ThrottlingMiddleware(
+        user_rate=settings.THROTTLE_USER_RATE,
+        user_burst=settings.THROTTLE_USER_BURST,
+        global_rate=settings.THROTTLE_GLOBAL_RATE,
+        global_burst=settings.THROTTLE_GLOBAL_BURST,
+        limited_text=settings.THROTTLE_REPLY or None,
+    )
+
+
+@lru_cache
+def get_dispatcher() -> Dispatcher:
+    """Диспетчер с хранилищами, middleware и хендлерами бота.
+
+    Собирается при первом обращении, а не при импорте модуля, поэтому
+    импорт не открывает соединений и не тратит время на настройку.
+    """
+    storage = get_storage()
+    dp = Dispatcher(
+        storage=storage.fsm, events_isolation=storage.events_isolation
+    )
+    dp.update.outer_middleware(UpdateDedupMiddleware(storage.deduplicator))
+    dp.message.outer_middleware(get_throttling())
+    dp.include_router(router)
+    return dp
+
+
+@router.message(Command('start'))
 async def send_welcome(message: Message) -> None:
     """Обрабатывает команду /start.
 
     Эта функция вызывается, когда пользователь отправляет команду '/start'.
     Она отправляет информацию о пользователе на сервер FastAPI, чтобы
-    зарегистрировать пользователя в системе, и в случае успеха отправляет
-    приветственное сообщение.
+    зарегистрировать пользователя в системе. Приветствие отправляет
+    фоновая задача сервера, поэтому хендлер не ждет отправки сообщения
+    и отвечает сам только при ошибке.
 
     Аргументы:
         message (Message): Объект сообщения от пользователя, содержащий
@@ -47,43 +90,38 @@ async def send_welcome(message: Message) -> None:
         - Данные отправляются на сервер FastAPI для регистрации пользователя.
         - В случае ошибки при отправке запроса или получения ответа,
         пользователю будет отправлено сообщение с ошибкой.
-        - После успешной регистрации пользователя, бот отправляет
-        приветственное сообщение с именем и фамилией пользователя.
+        - После регистрации сервер ставит в очередь приветственное
+        сообщение с именем и фамилией пользователя.
 
     Исключения:
         - httpx.RequestError: Ошибка при отправке HTTP-запроса.
         - httpx.HTTPStatusError: Ошибка при получении HTTP-ответа
         с неправильным статусом.
     """
-    async with httpx.AsyncClient() as client:
-        payload = {
-            'id': message.from_user.id,
-            'username': message.from_user.username,
-            'first_name': message.from_user.first_name,
-            'last_name': message.from_user.last_name,
-        }
-        logger.debug(f"Отправка данных пользователя на FastAPI: {payload}")
-        try:
-            response = await client.post(f'{FASTAPI_URL}/api/v1/users', json=payload)
-            response.raise_for_status()  # Проверяем статус ответа
-            logger.info(f"Пользователь {message.from_user.id} успешно зарегистрирован")
-        except httpx.RequestError as e:
-            logger.error(f"Ошибка запроса: {e}")
-            await message.answer(f'Ошибка запроса: {e}')
-            return
-        except httpx.HTTPStatusError as e:
-            logger.error(f"Ошибка ответа от сервера: {e.response.status_code}")
-            await message.answer(f'Ошибка ответа: {e.response.status_code}')
-            return
-
-    await message.answer(
-        f'Привет! {message.from_user.last_name} '
-        f'{message.from_user.first_name} '
-        'Добро пожаловать на мой бот.'
-    )
-
-
-@dp.message(Command('admin'))
+    user = message.from_user
+    if user is None:
+        return
+    payload = {
+        'id': user.id,
+        'username': user.username,
+        'first_name': user.first_name,
+        'last_name': user.last_name,
+    }
+    logger.debug(f'Отправка данных пользователя на FastAPI: {payload}')
+    try:
+        response = await get_http_client().post('/api/v1/users', json=payload)
+        response.raise_for_status()  # Проверяем статус ответа
+        logger.info(f'Пользователь {user.id} успешно зарегистрирован')
+    except httpx.RequestError as e:
+        logger.error(f'Ошибка запроса: {e}')
+        await message.answer(f'Ошибка запроса: {e}')
+        return
+    except httpx.HTTPStatusError as e:
+        logger.error(f'Ошибка ответа от сервера: {e.response.status_code}')
+        await message.answer(f'Ошибка ответа: {e.response.status_code}')
+
+
+@router.message(Command('admin'))
 async def send_admin(message: Message) -> None:
     """Отправляет пользователю клавиатуру.
 
@@ -97,14 +135,17 @@ async def send_admin(message: Message) -> None:
         message (Message): Объект сообщения от пользователя, содержащий
         информацию о пользователе и его запросах.
     """
-    logger.info(f"Получена команда /admin от пользователя {message.from_user.id}")
-    users_webapp_url = (
-        f'{BASE_NGROK_URL}/api/v1/users?cur_user_id={message.from_user.id}'
-    )
-    services_webapp_url = (
-        f'{BASE_NGROK_URL}/api/v1/services?cur_user_id={message.from_user.id}'
+    user = message.from_user
+    if user is None:
+        return
+    logger.info(f'Получена команда /admin от пользователя {user.id}')
+    base_url = get_settings().BASE_NGROK_URL
+    users_webapp_url = f'{base_url}/api/v1/users?cur_user_id={user.id}'
+    services_webapp_url = f'{base_url}/api/v1/services?cur_user_id={user.id}'
+    logger.debug(
+        f'Сформированы URL: users - {users_webapp_url}, '
+        f'services - {services_webapp_url}'
     )
-    logger.debug(f"Сформированы URL: users - {users_webapp_url}, services - {services_webapp_url}")
     kb = [
         [
             KeyboardButton(
@@ -127,19 +168,38 @@ async def send_admin(message: Message) -> None:
 
 
 async def main() -> None:
-    """Запускает основной цикл опроса для бота."""
-    logger.info("Запуск бота")
+    """Запускает основной цикл опроса для бота.
+
+    В режиме `webhook` апдейты принимает приложение FastAPI,
+    и отдельный процесс polling не нужен.
+    """
+    if get_settings().BOT_MODE == 'webhook':
+        logger.info('Бот работает через webhook в приложении FastAPI')
+        return
+    logger.info('Запуск бота')
+    bot = get_bot()
     try:
-        await dp.start_polling(bot)
+        # Polling не работает, пока у бота зарегистрирован webhook
+        await bot.delete_webhook()
+        await get_dispatcher().start_polling(bot)
     except Exception as e:
-        logger.critical(f"Критическая ошибка: {e}", exc_info=True)
+        logger.critical(f'Критическая ошибка: {e}', exc_info=True)
     finally:
         await bot.session.close()
-        logger.info("Бот остановлен")
+        await get_http_client().aclose()
+        await get_storage().close()
+        logger.info(
+            f'Статистика ограничения запросов: {get_throttling().stats}'
+        )
+        logger.info('Бот остановлен')
 
 
 if __name__ == '__main__':
+    logging.basicConfig(
+        level=logging.DEBUG,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    )
     try:
         asyncio.run(main())
     except (KeyboardInterrupt, SystemExit):
-        logger.info("Бот остановлен пользователем")
+        logger.info('Бот остановлен пользователем')
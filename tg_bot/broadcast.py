@@ -0,0 +1,295 @@
+"""Рассылка сообщений всем зарегистрированным пользователям.
+
+Получатели читаются из таблицы `users` пачками по первичному ключу,
+сообщения отправляются пулом воркеров через общий ограничитель
+скорости. Каждые `checkpoint_every` получателей прогресс сохраняется
+на диск, поэтому прерванная рассылка продолжается с места остановки;
+после аварийного завершения повторно могут уйти не больше
+`checkpoint_every` последних сообщений.
+
+Запуск:
+    python -m tg_bot.broadcast --name news-2025-01 "Текст рассылки"
+"""
+
+# STDLIB
+import argparse
+import asyncio
+from dataclasses import asdict, dataclass, field
+import json
+import logging
+import os
+import time
+from typing import Any, Callable, Optional, Type
+
+# THIRDPARTY
+from aiogram import Bot
+from aiogram.exceptions import (
+    TelegramAPIError,
+    TelegramForbiddenError,
+    TelegramRetryAfter,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# FIRSTPARTY
+from app.DAL.BaseDAL import UserDAL
+from tg_bot.middlewares.throttling import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RATE = 30.0
+DEFAULT_WORKERS = 8
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_CHECKPOINT_EVERY = 50
+DEFAULT_STATE_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', '.broadcasts'
+)
+
+
+@dataclass
+class BroadcastStats(object):
+    """Счетчики рассылки.
+
+    Атрибуты:
+        sent (int): Успешно отправлено.
+        blocked (int): Пользователь заблокировал бота.
+        failed (int): Прочие ошибки Telegram API и сбои отправки.
+        retried (int): Повторы после RetryAfter.
+        elapsed (float): Время работы в секундах (сумма по запускам).
+    """
+
+    sent: int = 0
+    blocked: int = 0
+    failed: int = 0
+    retried: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def processed(self) -> int:
+        """Сколько получателей обработано."""
+        return self.sent + self.blocked + self.failed
+
+    @property
+    def rate(self) -> float:
+        """Средняя пропускная способность, сообщений в секунду."""
+        return self.processed / self.elapsed if self.elapsed else 0.0
+
+
+@dataclass
+class BroadcastCheckpoint(object):
+    """Сохраненный прогресс рассылки.
+
+    Атрибуты:
+        path (str): Путь к JSON-файлу с прогрессом.
+        last_id (int): ID последнего обработанного пользователя.
+        stats (BroadcastStats): Накопленные счетчики.
+    """
+
+    path: str
+    last_id: int = 0
+    stats: BroadcastStats = field(default_factory=BroadcastStats)
+
+    @classmethod
+    def load(
+        cls: Type['BroadcastCheckpoint'], path: str
+    ) -> 'BroadcastCheckpoint':
+        """Загрузить прогресс или начать с нуля, если файла нет."""
+        if not os.path.exists(path):
+            return cls(path=path)
+        with open(path, encoding='utf-8') as file:
+            raw = json.load(file)
+        return cls(
+            path=path,
+            last_id=raw['last_id'],
+            stats=BroadcastStats(**raw['stats']),
+        )
+
+    def save(self) -> None:
+        """Атомарно записать прогресс на диск."""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(
+                {'last_id': self.last_id, 'stats': asdict(self.stats)}, file
+            )
+        os.replace(tmp_path, self.path)
+
+
+class Broadcaster(object):
+    """Рассылка одного сообщения всем пользователям из БД.
+
+    Атрибуты:
+        bot (Bot): Бот, через которого идет отправка. Для тестов
+            достаточно бота с подмененной сессией.
+        session_factory (Callable): Фабрика асинхронных сессий БД.
+        text (str): Текст сообщения.
+        checkpoint (BroadcastCheckpoint): Прогресс рассылки.
+        rate (float): Общий лимит, сообщений в секунду.
+        workers (int): Количество параллельных воркеров.
+        batch_size (int): Размер пачки получателей из БД.
+        max_retries (int): Сколько раз повторять отправку после RetryAfter.
+        checkpoint_every (int): Через сколько получателей сохранять
+            прогресс.
+    """
+
+    def __init__(
+        self,
+        bot: Bot,
+        session_factory: Callable[[], AsyncSession],
+        text: str,
+        checkpoint: BroadcastCheckpoint,
+        rate: float = DEFAULT_RATE,
+        workers: int = DEFAULT_WORKERS,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY,
+    ) -> None:
+        """Подготовить рассылку, продолжающую `checkpoint`."""
+        self.bot = bot
+        self.session_factory = session_factory
+        self.text = text
+        self.checkpoint = checkpoint
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.checkpoint_every = checkpoint_every
+        self.limiter = TokenBucket(rate, 1)
+        self.paused_until = 0.0
+
+    @property
+    def stats(self) -> BroadcastStats:
+        """Счетчики текущей рассылки."""
+        return self.checkpoint.stats
+
+    async def _acquire(self) -> None:
+        while True:
+            pause = self.paused_until - time.monotonic()
+            if pause > 0:
+                await asyncio.sleep(pause)
+                continue
+            if self.limiter.consume():
+                return
+            await asyncio.sleep(self.limiter.time_until_available())
+
+    async def _send(self, chat_id: int) -> None:
+        for attempt in range(self.max_retries + 1):
+            await self._acquire()
+            try:
+                await self.bot.send_message(chat_id, self.text)
+                self.stats.sent += 1
+                return
+            except TelegramRetryAfter as e:
+                # Флуд-контроль касается всего бота: ставим на паузу всех
+                self.paused_until = max(
+                    self.paused_until, time.monotonic() + e.retry_after
+                )
+                if attempt < self.max_retries:
+                    self.stats.retried += 1
+                logger.warning(
+                    f'RetryAfter {e.retry_after}с для чата {chat_id}'
+                )
+            except TelegramForbiddenError:
+                self.stats.blocked += 1
+                return
+            except TelegramAPIError as e:
+                logger.error(f'Не удалось отправить в чат {chat_id}: {e}')
+                self.stats.failed += 1
+                return
+        self.stats.failed += 1
+
+    async def _worker(self, queue: asyncio.Queue) -> None:
+        while True:
+            chat_id = await queue.get()
+            try:
+                await self._send(chat_id)
+            except Exception as e:
+                # Воркер не должен умирать: иначе queue.join() зависнет
+                logger.error(
+                    f'Сбой отправки в чат {chat_id}: {e}', exc_info=True
+                )
+                self.stats.failed += 1
+            finally:
+                queue.task_done()
+
+    async def _fetch_batch(self) -> list[int]:
+        async with self.session_factory() as session:
+            ids = await UserDAL.get_ids_after(
+                self.checkpoint.last_id, self.batch_size, session
+            )
+        return list(ids)
+
+    async def run(self) -> BroadcastStats:
+        """Выполнить рассылку до конца таблицы пользователей."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.workers * 2)
+        tasks = [
+            asyncio.create_task(self._worker(queue))
+            for _ in range(self.workers)
+        ]
+        try:
+            while ids := await self._fetch_batch():
+                for start in range(0, len(ids), self.checkpoint_every):
+                    end = start + self.checkpoint_every
+                    chunk = ids[start:end]
+                    started_at = time.monotonic()
+                    for chat_id in chunk:
+                        await queue.put(chat_id)
+                    await queue.join()
+                    self.checkpoint.last_id = chunk[-1]
+                    self.stats.elapsed += time.monotonic() - started_at
+                    self.checkpoint.save()
+                logger.info(
+                    f'Рассылка: обработано {self.stats.processed}, '
+                    f'последний ID {ids[-1]}, '
+                    f'{self.stats.rate:.1f} сообщений/с'
+                )
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        return self.stats
+
+
+async def main(args: Optional[Any] = None) -> None:
+    """Запустить рассылку из командной строки."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('text', help='Текст сообщения')
+    parser.add_argument('--name', required=True, help='Имя рассылки')
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE)
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS)
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument('--state-dir', default=DEFAULT_STATE_DIR)
+    options = parser.parse_args(args)
+
+    # FIRSTPARTY
+    from app.database import new_read_session
+    from tg_bot.settings.settings import get_settings
+
+    bot = Bot(token=get_settings().TG_BOT_TOKEN)
+    checkpoint = BroadcastCheckpoint.load(
+        os.path.join(options.state_dir, f'{options.name}.json')
+    )
+    broadcaster = Broadcaster(
+        bot,
+        new_read_session,
+        options.text,
+        checkpoint,
+        rate=options.rate,
+        workers=options.workers,
+        batch_size=options.batch_size,
+    )
+    try:
+        stats = await broadcaster.run()
+    finally:
+        await bot.session.close()
+    logger.info(
+        f'Рассылка {options.name} завершена: {asdict(stats)}, '
+        f'{stats.rate:.1f} сообщений/с'
+    )
+
+
+if __name__ == '__main__':
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    )
+    asyncio.run(main())
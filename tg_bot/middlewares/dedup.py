@@ -0,0 +1,52 @@
+"""Отсечение повторно доставленных апдейтов."""
+
+# STDLIB
+import logging
+from typing import Any, Awaitable, Callable, Dict
+
+# THIRDPARTY
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject, Update
+
+# FIRSTPARTY
+from tg_bot.storage import UpdateDeduplicator
+
+logger = logging.getLogger(__name__)
+
+
+class UpdateDedupMiddleware(BaseMiddleware):
+    """Пропускает каждый `update_id` в обработку только один раз.
+
+    Telegram повторяет доставку webhook при таймауте, а при смене
+    воркеров polling один апдейт может прийти дважды. Первый воркер,
+    занявший `update_id`, обрабатывает его, остальные молча пропускают.
+    Если обработка упала, отметка снимается, и повторная доставка
+    апдейта будет обработана заново.
+
+    Атрибуты:
+        deduplicator (UpdateDeduplicator): Общие отметки апдейтов.
+    """
+
+    def __init__(self, deduplicator: UpdateDeduplicator) -> None:
+        """Создать middleware с общими отметками апдейтов."""
+        self.deduplicator = deduplicator
+        self.duplicates = 0
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> object:
+        """Пропустить апдейт в обработку или отбросить дубликат."""
+        if not isinstance(event, Update):
+            return await handler(event, data)
+        if not await self.deduplicator.claim(event.update_id):
+            self.duplicates += 1
+            logger.debug(f'Апдейт {event.update_id} уже обработан')
+            return None
+        try:
+            return await handler(event, data)
+        except Exception:
+            await self.deduplicator.release(event.update_id)
+            raise
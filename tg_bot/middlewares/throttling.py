@@ -0,0 +1,152 @@
+"""Ограничение частоты входящих сообщений бота."""
+
+# STDLIB
+from collections import OrderedDict
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+# THIRDPARTY
+from aiogram import BaseMiddleware
+from aiogram.types import Message, TelegramObject
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket(object):
+    """Корзина токенов с непрерывным пополнением.
+
+    Атрибуты:
+        rate (float): Скорость пополнения, токенов в секунду.
+        capacity (float): Максимальный размер всплеска.
+    """
+
+    __slots__ = ('rate', 'capacity', 'tokens', 'updated_at')
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        """Создать полную корзину."""
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self.updated_at
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated_at = now
+
+    def consume(self, amount: float = 1.0) -> bool:
+        """Забрать токены, если их достаточно."""
+        self._refill(time.monotonic())
+        if self.tokens >= amount:
+            self.tokens -= amount
+            return True
+        return False
+
+    def refund(self, amount: float = 1.0) -> None:
+        """Вернуть ранее забранные токены."""
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+    def time_until_available(self, amount: float = 1.0) -> float:
+        """Сколько секунд ждать, пока накопится `amount` токенов."""
+        self._refill(time.monotonic())
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+
+class ThrottlingMiddleware(BaseMiddleware):
+    """Middleware с корзинами токенов на пользователя и на весь бот.
+
+    Регистрируется как outer-middleware, поэтому отбрасывает лишние
+    сообщения до фильтров и хендлеров: флуд `/start` не превращается
+    в поток запросов к FastAPI и БД.
+
+    Атрибуты:
+        user_rate (float): Пополнение корзины пользователя, токенов/сек.
+        user_burst (float): Размер корзины пользователя.
+        global_rate (float): Пополнение общей корзины, токенов/сек.
+        global_burst (float): Размер общей корзины.
+        limited_text (Optional[str]): Ответ при превышении лимита.
+            Отправляется один раз за эпизод флуда; `None` - молча.
+        max_users (int): Сколько корзин пользователей держать в памяти.
+    """
+
+    def __init__(
+        self,
+        user_rate: float,
+        user_burst: float,
+        global_rate: float,
+        global_burst: float,
+        limited_text: Optional[str] = None,
+        max_users: int = 10000,
+    ) -> None:
+        """Создать общую корзину; корзины юзеров создаются по запросу."""
+        self.user_rate = user_rate
+        self.user_burst = user_burst
+        self.limited_text = limited_text
+        self.max_users = max_users
+        self.global_bucket = TokenBucket(global_rate, global_burst)
+        self.user_buckets: OrderedDict[int, TokenBucket] = OrderedDict()
+        self.notified_users: set[int] = set()
+        self.counters: Dict[str, int] = {
+            'passed': 0,
+            'user_limited': 0,
+            'global_limited': 0,
+            'notified': 0,
+        }
+
+    def _get_user_bucket(self, user_id: int) -> TokenBucket:
+        bucket = self.user_buckets.get(user_id)
+        if bucket is None:
+            bucket = TokenBucket(self.user_rate, self.user_burst)
+            self.user_buckets[user_id] = bucket
+            if len(self.user_buckets) > self.max_users:
+                evicted_id, _ = self.user_buckets.popitem(last=False)
+                self.notified_users.discard(evicted_id)
+        else:
+            self.user_buckets.move_to_end(user_id)
+        return bucket
+
+    async def _reject(self, event: TelegramObject, user_id: int) -> None:
+        if self.limited_text is None or user_id in self.notified_users:
+            return
+        self.notified_users.add(user_id)
+        self.counters['notified'] += 1
+        if isinstance(event, Message):
+            await event.answer(self.limited_text)
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> object:
+        """Пропустить событие в хендлер или отбросить его."""
+        user = data.get('event_from_user')
+        if user is None:
+            return await handler(event, data)
+
+        user_bucket = self._get_user_bucket(user.id)
+        if not user_bucket.consume():
+            self.counters['user_limited'] += 1
+            logger.debug(f'Пользователь {user.id} превысил лимит сообщений')
+            await self._reject(event, user.id)
+            return None
+
+        if not self.global_bucket.consume():
+            user_bucket.refund()
+            self.counters['global_limited'] += 1
+            logger.warning('Превышен общий лимит входящих сообщений')
+            await self._reject(event, user.id)
+            return None
+
+        self.notified_users.discard(user.id)
+        self.counters['passed'] += 1
+        return await handler(event, data)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Снимок счетчиков middleware."""
+        return {**self.counters, 'tracked_users': len(self.user_buckets)}
@@ -1,16 +1,44 @@
 """Модуль для настройки конфигурации бота и FastAPI."""
 
 # STDLIB
+from functools import lru_cache
 import os
 
 # THIRDPARTY
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+ENV_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', '..', '.env'
+)
 
-class Settings(BaseSettings):
+
+class DatabaseSettings(BaseSettings):
+    """Настройки обслуживания БД.
+
+    Не требуют токена бота и адресов сервисов, поэтому служебные
+    команды, работающие только с БД, читают их отдельно от `Settings`.
+
+    Атрибуты:
+        ARCHIVE_AFTER_DAYS (int): Через сколько дней неактивный заказ
+            переносится в архив.
+        ARCHIVE_BATCH_SIZE (int): Заказов в одной транзакции переноса.
+        ARCHIVE_PAUSE (float): Пауза между пачками в секундах.
+        ARCHIVE_INTERVAL (int): Период запуска архивации в приложении
+            в секундах, 0 - не запускать.
+    """
+
+    model_config = SettingsConfigDict(env_file=ENV_FILE, extra='ignore')
+
+    ARCHIVE_AFTER_DAYS: int = 90
+    ARCHIVE_BATCH_SIZE: int = 500
+    ARCHIVE_PAUSE: float = 0.5
+    ARCHIVE_INTERVAL: int = 3600
+
+
+class Settings(DatabaseSettings):
     """Настройки для бота и FastAPI.
 
-    Этот класс наследуется от `pydantic.BaseSettings` и
+    Этот класс наследуется от `DatabaseSettings` и
     содержит конфигурационные параметры для бота,
     а также для FastAPI и внешних сервисов.
 
@@ -18,6 +46,22 @@ class Settings(BaseSettings):
         TG_BOT_TOKEN (str): Токен для Telegram-бота.
         FASTAPI_URL (str): URL для подключения к FastAPI.
         BASE_NGROK_URL (str): Основной URL для ngrok.
+        THROTTLE_USER_RATE (float): Сообщений в секунду от одного юзера.
+        THROTTLE_USER_BURST (int): Допустимый всплеск сообщений от юзера.
+        THROTTLE_GLOBAL_RATE (float): Сообщений в секунду на весь бот.
+        THROTTLE_GLOBAL_BURST (int): Допустимый всплеск на весь бот.
+        THROTTLE_REPLY (str | None): Ответ при превышении лимита,
+            пустое значение - отбрасывать молча.
+        FSM_STORAGE (str): Хранилище состояний: `memory` или `redis`.
+        REDIS_URL (str): Адрес Redis для режима `redis`.
+        UPDATE_DEDUP_TTL (int): Сколько секунд помнить обработанный апдейт.
+        BOT_MODE (str): Способ получения апдейтов: `polling` или `webhook`.
+        WEBHOOK_PATH (str): Путь webhook внутри приложения FastAPI.
+        WEBHOOK_SECRET (str | None): Секрет, который Telegram передает
+            в заголовке `X-Telegram-Bot-Api-Secret-Token`.
+        JOB_QUEUE (str): Очередь фоновых задач: `memory` или `database`.
+        JOB_CONCURRENCY (int): Сколько фоновых задач выполнять параллельно.
+        JOB_MAX_ATTEMPTS (int): Сколько раз пробовать выполнить задачу.
 
     Описание:
         - Параметры настраиваются через переменные окружения или файл `.env`.
@@ -26,6 +70,20 @@ class Settings(BaseSettings):
     TG_BOT_TOKEN: str
     FASTAPI_URL: str
     BASE_NGROK_URL: str
+    THROTTLE_USER_RATE: float = 0.5
+    THROTTLE_USER_BURST: int = 3
+    THROTTLE_GLOBAL_RATE: float = 30.0
+    THROTTLE_GLOBAL_BURST: int = 60
+    THROTTLE_REPLY: str | None = 'Слишком много запросов, подождите немного.'
+    FSM_STORAGE: str = 'memory'
+    REDIS_URL: str = 'redis://localhost:6379/0'
+    UPDATE_DEDUP_TTL: int = 600
+    BOT_MODE: str = 'polling'
+    WEBHOOK_PATH: str = '/api/v1/telegram/webhook'
+    WEBHOOK_SECRET: str | None = None
+    JOB_QUEUE: str = 'memory'
+    JOB_CONCURRENCY: int = 4
+    JOB_MAX_ATTEMPTS: int = 5
 
 
 class BotSettings(Settings):
@@ -46,12 +104,27 @@ class BotSettings(Settings):
         флагом `extra='allow'`.
     """
 
-    model_config = SettingsConfigDict(
-        env_file=os.path.join(
-            os.path.dirname(os.path.abspath(__file__)),
-            '..',
-            '..',
-            '.env',
-        ),
-        extra='allow',
-    )
+    model_config = SettingsConfigDict(env_file=ENV_FILE, extra='allow')
+
+
+@lru_cache
+def get_settings() -> BotSettings:
+    """Общий экземпляр настроек.
+
+    Файл `.env` и переменные окружения читаются один раз при первом
+    обращении, все модули получают один и тот же объект.
+
+    Возвращаемое значение:
+        BotSettings: Настройки бота и приложения.
+    """
+    return BotSettings()
+
+
+@lru_cache
+def get_database_settings() -> DatabaseSettings:
+    """Общий экземпляр настроек обслуживания БД.
+
+    Возвращаемое значение:
+        DatabaseSettings: Настройки архивации без настроек бота.
+    """
+    return DatabaseSettings()
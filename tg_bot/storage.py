@@ -0,0 +1,187 @@
+"""Хранилище состояний FSM и общие блокировки для нескольких процессов.
+
+В режиме `memory` состояние живет внутри одного процесса бота. В режиме
+`redis` состояния FSM, блокировки по чатам и отметки об обработанных
+апдейтах лежат в Redis, поэтому несколько воркеров (polling или
+реплики webhook) могут делить нагрузку без двойной обработки.
+"""
+
+# STDLIB
+from collections import OrderedDict
+import time
+from typing import TYPE_CHECKING, Optional, Protocol
+
+# THIRDPARTY
+from aiogram.fsm.storage.base import BaseEventIsolation, BaseStorage
+from aiogram.fsm.storage.memory import (
+    DisabledEventIsolation,
+    MemoryStorage,
+)
+
+# FIRSTPARTY
+from tg_bot.settings.settings import Settings
+
+if TYPE_CHECKING:
+    # THIRDPARTY
+    from redis.asyncio import Redis
+
+STORAGE_MEMORY = 'memory'
+STORAGE_REDIS = 'redis'
+
+
+class UpdateDeduplicator(Protocol):
+    """Отметка апдейтов, которые уже взял в работу какой-то воркер."""
+
+    async def claim(self, update_id: int) -> bool:
+        """Вернуть True, если апдейт еще никто не обрабатывал."""
+
+    async def release(self, update_id: int) -> None:
+        """Снять отметку, чтобы апдейт можно было обработать повторно."""
+
+    async def close(self) -> None:
+        """Освободить ресурсы."""
+
+
+class MemoryUpdateDeduplicator(object):
+    """Дедупликация апдейтов внутри одного процесса.
+
+    Атрибуты:
+        ttl (float): Сколько секунд помнить обработанный апдейт.
+        max_size (int): Максимальное количество запоминаемых апдейтов.
+    """
+
+    def __init__(self, ttl: float, max_size: int = 100000) -> None:
+        """Создать пустой набор отметок."""
+        self.ttl = ttl
+        self.max_size = max_size
+        self.seen: OrderedDict[int, float] = OrderedDict()
+
+    async def claim(self, update_id: int) -> bool:
+        """Вернуть True, если апдейт еще никто не обрабатывал."""
+        now = time.monotonic()
+        while self.seen:
+            oldest_id, expires_at = next(iter(self.seen.items()))
+            if expires_at > now and len(self.seen) < self.max_size:
+                break
+            del self.seen[oldest_id]
+        if update_id in self.seen:
+            return False
+        self.seen[update_id] = now + self.ttl
+        return True
+
+    async def release(self, update_id: int) -> None:
+        """Снять отметку, чтобы апдейт можно было обработать повторно."""
+        self.seen.pop(update_id, None)
+
+    async def close(self) -> None:
+        """Освободить ресурсы."""
+        self.seen.clear()
+
+
+class RedisUpdateDeduplicator(object):
+    """Дедупликация апдейтов между процессами через `SET NX EX`.
+
+    Клиент Redis общий с `RedisStorage` и закрывается вместе с ним
+    при остановке `Dispatcher`, поэтому дедупликатор его не закрывает.
+
+    Атрибуты:
+        redis (Redis): Клиент Redis.
+        ttl (int): Сколько секунд помнить обработанный апдейт.
+        prefix (str): Префикс ключей.
+    """
+
+    def __init__(
+        self, redis: 'Redis', ttl: int, prefix: str = 'fsm:update'
+    ) -> None:
+        """Использовать общий клиент Redis без передачи владения."""
+        self.redis = redis
+        self.ttl = ttl
+        self.prefix = prefix
+
+    async def claim(self, update_id: int) -> bool:
+        """Вернуть True, если апдейт еще никто не обрабатывал."""
+        return bool(
+            await self.redis.set(self._key(update_id), 1, nx=True, ex=self.ttl)
+        )
+
+    async def release(self, update_id: int) -> None:
+        """Снять отметку, чтобы апдейт можно было обработать повторно."""
+        await self.redis.delete(self._key(update_id))
+
+    async def close(self) -> None:
+        """Клиентом Redis владеет `RedisStorage`, закрывать нечего."""
+
+    def _key(self, update_id: int) -> str:
+        return f'{self.prefix}:{update_id}'
+
+
+class BotStorage(object):
+    """Набор хранилищ, которые передаются в `Dispatcher`.
+
+    Атрибуты:
+        fsm (BaseStorage): Хранилище состояний FSM.
+        events_isolation (BaseEventIsolation): Блокировки по ключу чата,
+            чтобы апдейты одного чата не обрабатывались параллельно.
+        deduplicator (UpdateDeduplicator): Отметки обработанных апдейтов.
+    """
+
+    def __init__(
+        self,
+        fsm: BaseStorage,
+        events_isolation: BaseEventIsolation,
+        deduplicator: UpdateDeduplicator,
+    ) -> None:
+        """Собрать хранилища, созданные `build_storage`."""
+        self.fsm = fsm
+        self.events_isolation = events_isolation
+        self.deduplicator = deduplicator
+
+    async def close(self) -> None:
+        """Закрыть дедупликатор.
+
+        Хранилище FSM и блокировки закрывает сам `Dispatcher`
+        при остановке.
+        """
+        await self.deduplicator.close()
+
+
+def build_storage(
+    settings: Settings, redis: Optional['Redis'] = None
+) -> BotStorage:
+    """Собрать хранилища согласно настройке `FSM_STORAGE`.
+
+    Параметры:
+        settings (Settings): Настройки бота.
+        redis (Optional[Redis]): Готовый клиент Redis, например
+            локальная заглушка в тестах. По умолчанию создается
+            из `REDIS_URL`.
+
+    Возвращаемое значение:
+        BotStorage: Хранилища для `Dispatcher`.
+    """
+    if settings.FSM_STORAGE == STORAGE_MEMORY:
+        return BotStorage(
+            MemoryStorage(),
+            DisabledEventIsolation(),
+            MemoryUpdateDeduplicator(settings.UPDATE_DEDUP_TTL),
+        )
+    if settings.FSM_STORAGE != STORAGE_REDIS:
+        raise ValueError(f'Неизвестное хранилище: {settings.FSM_STORAGE}')
+
+    # Клиент Redis импортируется, только если он нужен
+    # THIRDPARTY
+    from aiogram.fsm.storage.redis import (
+        DefaultKeyBuilder,
+        RedisEventIsolation,
+        RedisStorage,
+    )
+    from redis.asyncio import Redis
+
+    if redis is None:
+        redis = Redis.from_url(settings.REDIS_URL)
+    key_builder = DefaultKeyBuilder(with_bot_id=True)
+    return BotStorage(
+        RedisStorage(redis, key_builder=key_builder),
+        RedisEventIsolation(redis, key_builder=key_builder),
+        RedisUpdateDeduplicator(redis, settings.UPDATE_DEDUP_TTL),
+    )